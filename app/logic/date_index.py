@@ -0,0 +1,124 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime
+
+from app.logic.record_index import RecordIndex
+
+
+def parse_ordinal(date_str):
+    """Ordinal day number for a 'YYYY-MM-DD' string, or None if missing/invalid."""
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d").toordinal()
+    except Exception:
+        return None
+
+
+class DateIndex(RecordIndex):
+    """
+    Sorted index over one date field of a list of records.
+    Each date is parsed once into an ordinal int; range queries are two bisects and a slice.
+    """
+
+    def __init__(self, items, date_key="date"):
+        self.date_key = date_key
+        super().__init__(items)
+
+    @property
+    def items(self):
+        return self.records
+
+    def _reset(self):
+        self._ordinals = array("l")     # sorted ordinals
+        self._positions = array("l")    # item slot for each ordinal above
+        self._by_month_day = {}         # (month, day) -> sorted list of slots
+        self._ordinal_of = {}           # slot -> ordinal (or None)
+
+    def _index(self, slot, item):
+        ordinal = self._ordinal_of[slot] = parse_ordinal(item.get(self.date_key, ""))
+        if ordinal is None:
+            return
+        # Equal dates stay in slot (list) order
+        i = bisect_left(self._ordinals, ordinal)
+        hi = bisect_right(self._ordinals, ordinal, i)
+        while i < hi and self._positions[i] < slot:
+            i += 1
+        self._ordinals.insert(i, ordinal)
+        self._positions.insert(i, slot)
+        d = date.fromordinal(ordinal)
+        month_day = self._by_month_day.setdefault((d.month, d.day), [])
+        month_day.insert(bisect_left(month_day, slot), slot)
+
+    def _unindex(self, slot):
+        ordinal = self._ordinal_of.pop(slot)
+        if ordinal is None:
+            return
+        i = bisect_left(self._ordinals, ordinal)
+        while self._positions[i] != slot:
+            i += 1
+        del self._ordinals[i]
+        del self._positions[i]
+        d = date.fromordinal(ordinal)
+        self._by_month_day[(d.month, d.day)].remove(slot)
+
+    def _add_all(self, items):
+        if len(items) <= len(self._ordinals) // 2 + 64:
+            super()._add_all(items)
+            return
+        # Large batch: appending then sorting once beats repeated inserts
+        pairs = list(zip(self._ordinals, self._positions))
+        for item in items:
+            slot = len(self._by_slot)
+            self._by_slot.append(item)
+            self._slots[id(item)] = slot
+            ordinal = self._ordinal_of[slot] = parse_ordinal(item.get(self.date_key, ""))
+            if ordinal is None:
+                continue
+            pairs.append((ordinal, slot))
+            d = date.fromordinal(ordinal)
+            self._by_month_day.setdefault((d.month, d.day), []).append(slot)
+        pairs.sort()
+        self._ordinals = array("l", (o for o, _ in pairs))
+        self._positions = array("l", (p for _, p in pairs))
+
+    def update_record(self, item):
+        """Move an item whose date was edited in place to its new place in the order."""
+        self._sync()
+        slot = self._slots.get(id(item))
+        if slot is not None and self._ordinal_of[slot] != parse_ordinal(item.get(self.date_key, "")):
+            self._unindex(slot)
+            self._index(slot, item)
+
+    def range(self, start_ordinal, end_ordinal, date_order=False):
+        """Items dated within [start, end]. List order unless date_order=True."""
+        self._sync()
+        lo = bisect_left(self._ordinals, start_ordinal)
+        hi = bisect_right(self._ordinals, end_ordinal)
+        slots = self._positions[lo:hi]
+        if not date_order:
+            slots = sorted(slots)
+        return self._records_at(slots)
+
+    def on_this_day(self, month, day):
+        """Items from any year dated on the given month and day, in list order."""
+        self._sync()
+        return self._records_at(self._by_month_day.get((month, day), ()))
+
+    def decade(self, decade, date_order=True):
+        """Items dated within the decade starting at year `decade` (e.g. 1990)."""
+        start = date(decade, 1, 1).toordinal()
+        end = date(decade + 9, 12, 31).toordinal()
+        return self.range(start, end, date_order=date_order)
+
+    def decade_counts(self):
+        """{decade start year: number of dated items}, oldest first."""
+        self._sync()
+        counts = {}
+        i = 0
+        n = len(self._ordinals)
+        while i < n:
+            decade = date.fromordinal(self._ordinals[i]).year // 10 * 10
+            next_start = date(decade + 10, 1, 1).toordinal() if decade + 10 <= 9999 else float("inf")
+            j = bisect_left(self._ordinals, next_start, i)
+            counts[decade] = j - i
+            i = j
+        return counts
@@ -0,0 +1,255 @@
+import re
+import unicodedata
+
+from bisect import insort
+
+from app.logic.record_index import RecordIndex
+from app.logic.trigram_index import TrigramIndex
+
+RESOLVE_FIELDS = ("name", "nickname", "aliases", "prev_names")
+KIND_RANK = {"exact": 0, "substring": 1, "fuzzy": 2}
+
+
+def normalize_name(name):
+    """Lowercase, strip accents and punctuation, collapse whitespace."""
+    name = unicodedata.normalize("NFKD", str(name or ""))
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    name = re.sub(r"[^\w\s]", " ", name.lower())
+    return " ".join(name.split())
+
+
+def person_names(person):
+    """Normalized names, nicknames, aliases and previous names of a person."""
+    names = []
+    for field in RESOLVE_FIELDS:
+        value = person.get(field)
+        if not value:
+            continue
+        if isinstance(value, str):
+            # Form fields hold comma separated lists ("Previous Names (comma separated)")
+            value = value.split(",") if field in ("aliases", "prev_names") else [value]
+        for v in value:
+            n = normalize_name(v)
+            if n:
+                names.append(n)
+    # "Bill Smith" for a William Smith nicknamed Bill
+    full = normalize_name(person.get("name")).split()
+    nickname = normalize_name(person.get("nickname"))
+    if len(full) > 1 and nickname and " " not in nickname:
+        names.append(f"{nickname} {full[-1]}")
+    return names
+
+
+def bounded_levenshtein(a, b, limit):
+    """
+    Edit distance between a and b counting adjacent transpositions as one edit
+    ("jonh" -> "john"), or limit + 1 once it's known to exceed `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if len(a) > len(b):
+        a, b = b, a
+    before = None
+    previous = list(range(len(a) + 1))
+    for i, cb in enumerate(b, 1):
+        current = [i]
+        best = i
+        for j, ca in enumerate(a, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if before is not None and j > 1 and ca == b[i - 2] and a[j - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+            if cost < best:
+                best = cost
+        if best > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+def damerau_levenshtein(a, b):
+    """
+    Edit distance with unrestricted adjacent transpositions. Unlike bounded_levenshtein
+    (which may not edit a transposed pair again) it obeys the triangle inequality,
+    so it can organize a BKTree.
+    """
+    far = len(a) + len(b)
+    # Row/column 0 are a border of `far`; the string prefixes start at index 1
+    d = [[far] * (len(b) + 2)] + [[far] + [0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(len(a) + 1):
+        d[i + 1][1] = i
+    for j in range(len(b) + 1):
+        d[1][j + 1] = j
+    last_row = {}  # character -> last row of `a` it appeared in
+    for i in range(1, len(a) + 1):
+        last_col = 0
+        for j in range(1, len(b) + 1):
+            k = last_row.get(b[j - 1], 0)
+            l = last_col
+            if a[i - 1] == b[j - 1]:
+                cost = 0
+                last_col = j
+            else:
+                cost = 1
+            d[i + 1][j + 1] = min(d[i][j] + cost, d[i + 1][j] + 1, d[i][j + 1] + 1,
+                                  d[k][l] + (i - k - 1) + 1 + (j - l - 1))
+        last_row[a[i - 1]] = i
+    return d[len(a) + 1][len(b) + 1]
+
+
+class BKTree:
+    """Burkhard-Keller tree over strings, by Damerau-Levenshtein distance."""
+
+    def __init__(self):
+        self.root = None  # [word, {distance: child node}]
+
+    def add(self, word):
+        if self.root is None:
+            self.root = [word, {}]
+            return
+        node = self.root
+        while True:
+            d = damerau_levenshtein(word, node[0])
+            if d == 0:
+                return
+            child = node[1].get(d)
+            if child is None:
+                node[1][d] = [word, {}]
+                return
+            node = child
+
+    def search(self, word, max_distance):
+        """[(distance, word)] for every stored word within `max_distance`."""
+        if self.root is None:
+            return []
+        found = []
+        stack = [self.root]
+        while stack:
+            node_word, children = stack.pop()
+            d = damerau_levenshtein(word, node_word)
+            if d <= max_distance:
+                found.append((d, node_word))
+            for dist, child in children.items():
+                if d - max_distance <= dist <= d + max_distance:
+                    stack.append(child)
+        return found
+
+
+class NameResolver(RecordIndex):
+    """
+    Resolves typed names to people in one batched pass, using precomputed indexes of
+    normalized names, nicknames, aliases and previous names: exact lookups, trigram
+    substring matches and a BK-tree for typos.
+    """
+
+    def __init__(self, people, max_distance=2):
+        self.max_distance = max_distance
+        super().__init__(people)
+
+    @property
+    def people(self):
+        return self.records
+
+    def _reset(self):
+        self._exact = {}        # normalized name -> sorted slots of the people with it
+        self._by_token = {}     # name token -> {normalized names containing it}
+        self._tokens = BKTree() # over distinct tokens, which stay few even for huge families
+        self._entries = []      # slot -> {"names": [...], "person": ...} for the trigram index
+        self._substring = TrigramIndex(self._entries, fields=("names",))
+
+    def _index(self, slot, person):
+        names = person_names(person)
+        for n in names:
+            bucket = self._exact.setdefault(n, [])
+            if not bucket:
+                for token in n.split():
+                    if token not in self._by_token:
+                        self._by_token[token] = set()
+                        self._tokens.add(token)  # no-op if it was used before
+                    self._by_token[token].add(n)
+            insort(bucket, slot)
+        if slot == len(self._entries):
+            self._entries.append({"names": names, "person": person})
+        else:
+            entry = self._entries[slot]
+            entry["names"] = names
+            entry["person"] = person
+            self._substring.update_record(entry)
+
+    def _unindex(self, slot):
+        entry = self._entries[slot]
+        for n in entry["names"]:
+            bucket = self._exact[n]
+            bucket.remove(slot)
+            if not bucket:
+                del self._exact[n]
+                for token in n.split():
+                    names = self._by_token.get(token)
+                    if names is not None:
+                        names.discard(n)
+                        if not names:
+                            # The token stays in the BK-tree (it has no delete) but matches nothing
+                            del self._by_token[token]
+        # Left in place, matching nothing, until the slot is re-indexed or the resolver rebuilt
+        entry["names"] = []
+        entry["person"] = None
+        self._substring.update_record(entry)
+
+    def _distance_limit(self, token):
+        # Short tokens tolerate fewer typos ("Ann" vs "Dan" shouldn't match)
+        return min(self.max_distance, len(token) // 4)
+
+    def _fuzzy_names(self, query):
+        """Names where every query token is within a few edits of one of the name's tokens."""
+        names = None
+        for token in query.split():
+            limit = self._distance_limit(token)
+            matched = set()
+            for _, word in self._tokens.search(token, limit):
+                # The tree's distance can be lower than ours (transposed letters edited again)
+                if word in self._by_token and bounded_levenshtein(token, word, limit) <= limit:
+                    matched |= self._by_token[word]
+            names = matched if names is None else names & matched
+            if not names:
+                return set()
+        return names or set()
+
+    def resolve(self, name, limit=5):
+        return self.resolve_many([name], limit=limit)[name]
+
+    def resolve_many(self, names, limit=5):
+        """
+        {name: [candidate, ...]} for every name, best first. Each candidate is a dict:
+        {"person", "matched" (normalized name), "kind" ("exact"/"substring"/"fuzzy"), "distance"}.
+        """
+        self._sync()
+        by_query = {}
+        for name in names:
+            query = normalize_name(name)
+            if query not in by_query:
+                by_query[query] = self._candidates(query, limit)
+        return {name: by_query[normalize_name(name)] for name in names}
+
+    def _candidates(self, query, limit):
+        if not query:
+            return []
+        best = {}  # id(person) -> candidate
+
+        def offer(person, matched, kind, distance):
+            key = id(person)
+            cand = best.get(key)
+            rank = (KIND_RANK[kind], distance)
+            if cand is None or rank < (KIND_RANK[cand["kind"]], cand["distance"]):
+                best[key] = {"person": person, "matched": matched, "kind": kind, "distance": distance}
+
+        for slot in self._exact.get(query, ()):
+            offer(self._by_slot[slot], query, "exact", 0)
+        for entry in self._substring.search(query):
+            matched = next(n for n in entry["names"] if query in n)
+            offer(entry["person"], matched, "substring", len(matched) - len(query))
+        for word in self._fuzzy_names(query):
+            distance = bounded_levenshtein(query, word, max(len(query), len(word)))
+            for slot in self._exact[word]:
+                offer(self._by_slot[slot], word, "fuzzy", distance)
+        ranked = sorted(best.values(), key=lambda c: (KIND_RANK[c["kind"]], c["distance"], c["matched"]))
+        return ranked[:limit]
@@ -0,0 +1,222 @@
+import random
+import time
+from collections import deque
+
+# Question makers and how often each is picked
+KINDS = (("quiz", 3), ("birth_year", 2), ("relation", 2), ("pet_owner", 1))
+
+# Relation block key -> (question wording, single value?)
+RELATION_QUESTIONS = {
+    "spouse": ("Who is {name}'s spouse?", True),
+    "parents": ("Who is one of {name}'s parents?", False),
+    "children": ("Who is one of {name}'s children?", False),
+    "stepParents": ("Who is {name}'s step-parent?", False),
+}
+
+CHOICES = 4
+PREPARE_CHUNK = 1000  # people indexed between budget checks while preparing
+
+
+def _first_name(person):
+    return (person.get("name") or "").split(" ")[0]
+
+
+def _birth_year(person):
+    year = person.get("birthYear")
+    if isinstance(year, int):
+        return year
+    date = str(person.get("birth_date") or "")
+    return int(date[:4]) if date[:4].isdigit() else None
+
+
+class QuizEngine:
+    """
+    Screensaver trivia: stored quizzes plus questions generated from the archive
+    (birth years, relationships, pet owners), each with plausible wrong choices.
+
+    All work happens in fill(), meant to run in idle time; it tops up a bounded
+    queue of ready, shuffled questions. next_question() only pops from that queue,
+    so the screensaver never computes while it animates. A question is not queued
+    again until `no_repeat` other questions have been queued after it (the window
+    shrinks if the archive can't supply that many distinct questions).
+    - tags: only use stored quizzes with any of these tags (None = all)
+    - generated: also make questions from people/pets
+    """
+
+    def __init__(self, search_manager, queue_size=50, no_repeat=200, tags=None, generated=True, seed=None):
+        self.search_manager = search_manager
+        self.queue_size = queue_size
+        self.no_repeat = no_repeat
+        self.tags = tags
+        self.generated = generated
+        self.rng = random.Random(seed)
+        self.queue = deque()
+        self._recent = deque()      # keys of the last `no_repeat` queued questions
+        self._recent_keys = set()
+        self._prepared = False
+        self._preparing = None      # _prepare() generator while it's part way through
+
+    # --- Preparation (idle time) ---
+    def _prepare(self):
+        """Index people and quizzes, yielding every PREPARE_CHUNK people so fill() can keep to its budget."""
+        sm = self.search_manager
+        quizzes = sm.find_quizzes_by_tag(self.tags, mode="any") if self.tags else list(sm.quizzes)
+        by_id = {}
+        by_decade = {}              # birth decade -> people, for same-generation distractors
+        years = []
+        for i, person in enumerate(sm.people, 1):
+            by_id[person.get("id")] = person
+            year = _birth_year(person)
+            if year is not None and person.get("name"):
+                by_decade.setdefault(year // 10 * 10, []).append(person)
+                years.append(person)
+            if i % PREPARE_CHUNK == 0:
+                yield
+        self._quizzes = quizzes
+        self._by_id = by_id
+        self._by_decade = by_decade
+        self._years = years
+        self._answers = [a for a in (self._quiz_answer(q) for q in quizzes) if a]
+        self._prepared = True
+
+    def invalidate(self):
+        """Drop queued questions after the data changed; fill() rebuilds from the new data."""
+        self.queue.clear()
+        self._prepared = False
+        self._preparing = None
+
+    def fill(self, budget=0.01, attempts=200):
+        """
+        Add questions to the queue for up to `budget` seconds.
+        Returns True while the queue still has room (call again on the next idle).
+        """
+        deadline = time.perf_counter() + budget
+        if not self._prepared:
+            if self._preparing is None:
+                self._preparing = self._prepare()
+            for _ in self._preparing:
+                if time.perf_counter() >= deadline:
+                    return True
+            self._preparing = None
+        misses = 0
+        while len(self.queue) < self.queue_size and time.perf_counter() < deadline:
+            question = self._make()
+            if question is None or question["key"] in self._recent_keys:
+                misses += 1
+                if misses >= attempts:
+                    if not self._recent:
+                        break
+                    # Not enough distinct questions for the window; let the oldest back in
+                    self._recent_keys.discard(self._recent.popleft())
+                    misses = 0
+                continue
+            misses = 0
+            self._remember(question["key"])
+            self.queue.append(question)
+        return len(self.queue) < self.queue_size
+
+    def _remember(self, key):
+        self._recent.append(key)
+        self._recent_keys.add(key)
+        while len(self._recent) > self.no_repeat:
+            self._recent_keys.discard(self._recent.popleft())
+
+    def next_question(self):
+        """The next ready question dict, or None if the queue ran dry."""
+        return self.queue.popleft() if self.queue else None
+
+    # --- Question makers ---
+    def _make(self):
+        kinds = [(k, w) for k, w in KINDS if k == "quiz" or self.generated]
+        kind = self.rng.choices([k for k, _ in kinds], weights=[w for _, w in kinds])[0]
+        return getattr(self, f"_make_{kind}")()
+
+    def _question(self, kind, key, text, answer, wrong, source_id=None):
+        wrong = [w for w in dict.fromkeys(wrong) if w and w != answer][:CHOICES - 1]
+        if not wrong:
+            return None
+        choices = wrong + [answer]
+        self.rng.shuffle(choices)
+        return {"key": key, "kind": kind, "question": text, "choices": choices, "answer": answer,
+                "source_id": source_id}
+
+    @staticmethod
+    def _quiz_answer(quiz):
+        return quiz.get("correct") or quiz.get("answer")
+
+    def _make_quiz(self):
+        if not self._quizzes:
+            return None
+        quiz = self.rng.choice(self._quizzes)
+        answer = self._quiz_answer(quiz)
+        if not quiz.get("question") or not answer:
+            return None
+        wrong = [c for c in quiz.get("choices") or [] if c != answer]
+        if quiz.get("alt_answer"):
+            wrong.append(quiz["alt_answer"])
+        # Admin-entered quizzes only have an answer; borrow other quizzes' answers
+        # (or first names, for "who" questions)
+        if len(wrong) < CHOICES - 1:
+            pool = self._answers if len(self._answers) >= CHOICES else [_first_name(p) for p in self._sample_people()]
+            wrong += self.rng.sample(pool, min(len(pool), CHOICES))
+        return self._question("quiz", f"quiz:{quiz.get('id') or quiz['question']}", quiz["question"], answer,
+                              wrong, quiz.get("id"))
+
+    def _make_birth_year(self):
+        if not self._years:
+            return None
+        person = self.rng.choice(self._years)
+        year = _birth_year(person)
+        offsets = self.rng.sample([d for d in range(-12, 13) if d], CHOICES * 2)
+        wrong = [str(year + d) for d in offsets if year + d <= time.localtime().tm_year]
+        return self._question("birth_year", f"birth_year:{person.get('id')}",
+                              f"In what year was {person['name']} born?", str(year), wrong, person.get("id"))
+
+    def _make_relation(self):
+        if not self._years:
+            return None
+        person = self.rng.choice(self._years)
+        relations = person.get("relations") or {}
+        options = [k for k in RELATION_QUESTIONS if relations.get(k)]
+        if not options:
+            return None
+        key = self.rng.choice(options)
+        wording, single = RELATION_QUESTIONS[key]
+        ids = [relations[key]] if single else relations[key]
+        related = [self._by_id[i] for i in (ids if isinstance(ids, list) else [ids]) if i in self._by_id]
+        if not related:
+            return None
+        answer = self.rng.choice(related)
+        excluded = {person.get("id")} | {p.get("id") for p in related}
+        wrong = [p["name"] for p in self._similar_people(answer) if p.get("id") not in excluded]
+        return self._question("relation", f"relation:{person.get('id')}:{key}",
+                              wording.format(name=person["name"]), answer["name"], wrong, person.get("id"))
+
+    def _make_pet_owner(self):
+        pets = self.search_manager.pets
+        if not pets:
+            return None
+        pet = self.rng.choice(pets)
+        owner = self._by_id.get(pet.get("ownerId"))
+        if owner is None or not pet.get("name"):
+            return None
+        wrong = [p["name"] for p in self._similar_people(owner) if p.get("id") != owner.get("id")]
+        species = f" the {pet['species'].lower()}" if pet.get("species") else ""
+        return self._question("pet_owner", f"pet_owner:{pet.get('id')}", f"Whose pet was {pet['name']}{species}?",
+                              owner["name"], wrong, pet.get("id"))
+
+    # --- Distractors ---
+    def _similar_people(self, person, count=CHOICES * 2):
+        """People born around the same time as `person` (then anyone), as wrong choices."""
+        year = _birth_year(person)
+        buckets = []
+        if year is not None:
+            decade = year // 10 * 10
+            buckets = [b for b in (self._by_decade.get(d) for d in (decade, decade - 10, decade + 10)) if b]
+        if sum(len(b) for b in buckets) < count:
+            return self._sample_people(count)
+        weights = [len(b) for b in buckets]
+        return [self.rng.choice(b) for b in self.rng.choices(buckets, weights=weights, k=count)]
+
+    def _sample_people(self, count=CHOICES * 2):
+        return self.rng.sample(self._years, min(count, len(self._years)))
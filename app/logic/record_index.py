@@ -0,0 +1,88 @@
+class RecordIndex:
+    """
+    Base for the indexes over a record list that the stores append to, edit in place
+    and delete from.
+    Each indexed record gets a slot number, in list order; subclasses key their
+    postings by slot and implement _reset(), _index(slot, record) and _unindex(slot).
+    Appended records are picked up on the next query, update_record()/remove_record()
+    touch only the one record, and results sorted by slot come out in list order.
+    """
+
+    _stale = False
+
+    def __init__(self, records):
+        self.records = records
+        self.rebuild()
+
+    def rebuild(self):
+        self._stale = False
+        self._slots = {}     # id(record) -> slot
+        self._by_slot = []   # slot -> record (None once removed)
+        self._seen = 0       # records[:_seen] are indexed
+        self._removed = 0
+        self._reset()
+        self._sync()
+
+    def _reset(self):
+        raise NotImplementedError
+
+    def _index(self, slot, record):
+        """Add `record`'s entries under `slot` (a new slot, or one just _unindex'ed)."""
+        raise NotImplementedError
+
+    def _unindex(self, slot):
+        raise NotImplementedError
+
+    def _add_all(self, records):
+        for record in records:
+            self._add(record)
+
+    def _add(self, record):
+        slot = len(self._by_slot)
+        self._by_slot.append(record)
+        self._slots[id(record)] = slot
+        self._index(slot, record)
+
+    def _sync(self):
+        if self._stale or len(self.records) < self._seen or self._removed > len(self._by_slot) // 2 + 64:
+            # Replaced list, or mostly removed slots: start over
+            self.rebuild()
+            return
+        if len(self.records) > self._seen:
+            self._add_all(self.records[self._seen:])
+            self._seen = len(self.records)
+
+    def update_record(self, record):
+        """Re-index a record that was edited in place."""
+        self._sync()
+        slot = self._slots.get(id(record))
+        if slot is not None:
+            self._unindex(slot)
+            self._index(slot, record)
+
+    def remove_record(self, record):
+        """Drop a record that was just deleted from the list."""
+        slot = self._slots.pop(id(record), None)
+        if slot is None:
+            return  # appended and deleted before the next query: never indexed
+        self._unindex(slot)
+        self._by_slot[slot] = None
+        self._seen -= 1
+        self._removed += 1
+
+    def invalidate(self):
+        """Rebuild on the next query (after the list was replaced or reordered)."""
+        self._stale = True
+
+    def _records_at(self, slots):
+        return [self._by_slot[slot] for slot in slots]
+
+    # id()s don't survive pickling (snapshot cache); rebuild the slot map on load
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_slots", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._slots = {id(record): slot for slot, record in enumerate(self._by_slot) if record is not None}
@@ -0,0 +1,241 @@
+"""
+Compact record model for large archives on low-RAM kiosks.
+
+Person / Pet / Photo / Story / Quiz use __slots__ instead of per-record dicts,
+ids are interned to small ints through a shared IdTable, and id lists
+(relations, photo tags, pets, stories) are stored as array('i').
+Records convert losslessly to and from the JSON dict shapes, and expose the
+read-only dict API (get / [] / in / keys / items) that SearchManager and the
+indexes use, so they can be passed in place of the dicts.
+No store loads these yet; the stores still hold plain dicts.
+"""
+import sys
+from array import array
+
+# Field kinds
+SCALAR = "scalar"   # kept as-is (short strings are interned)
+REF = "ref"         # id or list of ids -> int or array('i') via the IdTable
+STRS = "strs"       # list of plain strings -> tuple
+
+
+class IdTable:
+    """Maps id values (usually strings) to small ints and back."""
+
+    def __init__(self):
+        self._index = {}
+        self._values = []
+
+    def intern(self, value):
+        idx = self._index.get(value)
+        if idx is None:
+            idx = self._index[value] = len(self._values)
+            self._values.append(value)
+        return idx
+
+    def lookup(self, idx):
+        return self._values[idx]
+
+    def get_index(self, value):
+        """Int for `value`, or None if it was never interned."""
+        return self._index.get(value)
+
+    def __len__(self):
+        return len(self._values)
+
+
+class _List(array):
+    """array('i') that remembers it came from a JSON list (vs. a single id)."""
+    __slots__ = ()
+
+
+class Record:
+    """
+    Base class. Subclasses list FIELDS as (key, kind) pairs; each key is a slot.
+    An unset slot means the key was absent in the JSON; unknown keys go to `_extra`.
+    """
+
+    __slots__ = ("_ids", "_extra")
+    FIELDS = ()
+    NESTED = {}  # key -> Record subclass for nested objects (e.g. person relations)
+
+    def __init__(self, ids):
+        self._ids = ids
+
+    # --- Conversion ---
+    @classmethod
+    def from_dict(cls, data, ids):
+        record = cls(ids)
+        kinds = cls._kinds()
+        extra = None
+        for key, value in data.items():
+            kind = kinds.get(key)
+            if kind is None:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+            elif key in cls.NESTED and isinstance(value, dict):
+                setattr(record, key, cls.NESTED[key].from_dict(value, ids))
+            else:
+                setattr(record, key, record._encode(kind, value))
+        record._extra = extra
+        return record
+
+    def to_dict(self):
+        out = {}
+        for key, kind in self.FIELDS:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                out[key] = value.to_dict() if isinstance(value, Record) else self._decode(kind, value)
+        if self._extra:
+            out.update(self._extra)
+        return out
+
+    @classmethod
+    def _kinds(cls):
+        kinds = cls.__dict__.get("_kind_map")
+        if kinds is None:
+            kinds = dict(cls.FIELDS)
+            cls._kind_map = kinds
+        return kinds
+
+    def _encode(self, kind, value):
+        if kind == REF:
+            if isinstance(value, list) and all(isinstance(v, (str, int)) for v in value):
+                return _List("i", [self._ids.intern(v) for v in value])
+            if isinstance(value, str):
+                return self._ids.intern(value)
+            # None / odd values: boxed so they aren't mistaken for an interned int
+            return _BOXED_NONE if value is None else (value,)
+        if kind == STRS and isinstance(value, list):
+            return tuple(sys.intern(v) if isinstance(v, str) else v for v in value)
+        if isinstance(value, str) and len(value) <= 32:
+            return sys.intern(value)
+        return value
+
+    def _decode(self, kind, value):
+        if kind == REF:
+            if isinstance(value, _List):
+                return [self._ids.lookup(i) for i in value]
+            if isinstance(value, int):
+                return self._ids.lookup(value)
+            return value[0]
+        if kind == STRS and isinstance(value, tuple):
+            return list(value)
+        return value
+
+    # --- Read-only dict API ---
+    def get(self, key, default=None):
+        kind = self._kinds().get(key)
+        if kind is None:
+            return self._extra.get(key, default) if self._extra else default
+        value = getattr(self, key, _MISSING)
+        if value is _MISSING:
+            return default
+        return value if isinstance(value, Record) else self._decode(kind, value)
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def items(self):
+        return self.to_dict().items()
+
+    def update(self, updates):
+        kinds = self._kinds()
+        for key, value in updates.items():
+            kind = kinds.get(key)
+            if kind is None:
+                if self._extra is None:
+                    self._extra = {}
+                self._extra[key] = value
+            elif key in self.NESTED and isinstance(value, dict):
+                setattr(self, key, self.NESTED[key].from_dict(value, self._ids))
+            else:
+                setattr(self, key, self._encode(kind, value))
+
+    # --- Int-level access for indexes that want to skip decoding ---
+    def ref_ints(self, key):
+        """Interned ints of an id / id-list field (empty tuple if absent)."""
+        value = getattr(self, key, _MISSING)
+        if isinstance(value, _List):
+            return value
+        if isinstance(value, int):
+            return (value,)
+        return ()
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    # Mutable and compared by value, like the dicts they stand in for
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+_MISSING = object()
+_BOXED_NONE = (None,)
+
+
+class Relations(Record):
+    FIELDS = (("parents", REF), ("stepParents", REF), ("children", REF), ("adoptedChildren", REF),
+              ("spouse", REF), ("exSpouses", REF))
+    __slots__ = tuple(k for k, _ in FIELDS)
+
+
+class Person(Record):
+    FIELDS = (("id", REF), ("name", SCALAR), ("nickname", SCALAR), ("aliases", STRS), ("prev_names", STRS),
+              ("gender", SCALAR), ("birthYear", SCALAR), ("deathYear", SCALAR), ("birth_date", SCALAR),
+              ("death_date", SCALAR), ("deceased", SCALAR), ("photo", SCALAR), ("relations", SCALAR),
+              ("pets", REF), ("stories", REF), ("tags", STRS))
+    NESTED = {"relations": Relations}
+    __slots__ = tuple(k for k, _ in FIELDS)
+
+
+class Pet(Record):
+    FIELDS = (("id", REF), ("name", SCALAR), ("species", SCALAR), ("breed", SCALAR), ("birthYear", SCALAR),
+              ("birth_date", SCALAR), ("photo", SCALAR), ("ownerId", REF), ("notes", SCALAR))
+    __slots__ = tuple(k for k, _ in FIELDS)
+
+
+class Photo(Record):
+    FIELDS = (("id", REF), ("filename", SCALAR), ("file", SCALAR), ("date", SCALAR), ("location", SCALAR),
+              ("tags", REF), ("description", SCALAR), ("desc", SCALAR))
+    __slots__ = tuple(k for k, _ in FIELDS)
+
+
+class Story(Record):
+    FIELDS = (("id", REF), ("title", SCALAR), ("text", SCALAR), ("personId", REF), ("date", SCALAR),
+              ("source", SCALAR))
+    __slots__ = tuple(k for k, _ in FIELDS)
+
+
+class Quiz(Record):
+    FIELDS = (("id", REF), ("question", SCALAR), ("choices", STRS), ("correct", SCALAR), ("tags", STRS))
+    __slots__ = tuple(k for k, _ in FIELDS)
+
+
+RECORD_TYPES = {"people": Person, "pets": Pet, "photos": Photo, "stories": Story, "quizzes": Quiz}
+
+
+def to_records(collection, dicts, ids=None):
+    """Convert a list of JSON dicts for `collection` ("people", "photos", ...) into records."""
+    ids = ids if ids is not None else IdTable()
+    cls = RECORD_TYPES[collection]
+    return [cls.from_dict(d, ids) for d in dicts]
+
+
+def to_dicts(records):
+    return [r.to_dict() for r in records]
@@ -0,0 +1,385 @@
+from collections import OrderedDict, deque
+
+from app.logic.record_index import RecordIndex
+
+# Edge kinds on a parent -> child link
+BIO, ADOPTED, STEP = 0, 1, 2
+
+ORDINALS = ["first", "second", "third", "fourth", "fifth", "sixth", "seventh", "eighth", "ninth"]
+REMOVED = {1: "once removed", 2: "twice removed"}
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _greats(n, word):
+    """n=0 -> word, 1 -> great-word, 2 -> great-great-word, then 'Nx great-word'."""
+    if n <= 0:
+        return word
+    if n <= 2:
+        return "great-" * n + word
+    return f"{n}x great-{word}"
+
+
+def kinship_label(up, down):
+    """
+    Label for a blood relation `up` generations above the reference person to the
+    lowest common ancestor and `down` generations from there to the other person.
+    """
+    if up == 0 and down == 0:
+        return "self"
+    if down == 0:
+        return "parent" if up == 1 else _greats(up - 2, "grandparent")
+    if up == 0:
+        return "child" if down == 1 else _greats(down - 2, "grandchild")
+    if up == 1 and down == 1:
+        return "sibling"
+    if down == 1:
+        return _greats(up - 2, "aunt/uncle")
+    if up == 1:
+        return _greats(down - 2, "niece/nephew")
+    degree = min(up, down) - 1
+    removed = abs(up - down)
+    name = (ORDINALS[degree - 1] if degree <= len(ORDINALS) else f"{degree}th") + " cousin"
+    if removed:
+        name += " " + REMOVED.get(removed, f"{removed} times removed")
+    return name
+
+
+class RelationshipGraph(RecordIndex):
+    """
+    Kinship engine over the `relations` block of people.json.
+    Person ids are mapped to ints and the graph is kept as int adjacency lists. Each
+    link counts the people whose records claim it (a parent's "children" and the
+    child's "parents" both do), so editing or deleting a person only withdraws and
+    re-adds that person's claims. A link claimed with several kinds takes the most
+    specific one (step over adopted over biological).
+    relations_of(ref) is memoized per reference person until the next change.
+    """
+
+    def __init__(self, people, cache_size=32):
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        super().__init__(people)
+
+    @property
+    def people(self):
+        return self.records
+
+    # --- Building ---
+    def _reset(self):
+        self._node_of = {}    # person id -> node
+        self._ids = []        # node -> person id
+        self._parents = []    # node -> [(parent node, kind)]
+        self._children = []   # node -> [(child node, kind)]
+        self._spouses = []    # node -> {node}
+        self._exes = []       # node -> {node}
+        self._known = {}      # node -> number of person records with that id
+        self._links = {}      # (parent, child) -> claims per kind [bio, adopted, step]
+        self._marriages = {}  # (spouse/ex set list, node, node) -> claims
+        self._claims = {}     # slot -> (node, links, marriages) that record claims
+        self._cache.clear()
+
+    def _node(self, person_id):
+        idx = self._node_of.get(person_id)
+        if idx is None:
+            idx = self._node_of[person_id] = len(self._ids)
+            self._ids.append(person_id)
+            self._parents.append([])
+            self._children.append([])
+            self._spouses.append(set())
+            self._exes.append(set())
+        return idx
+
+    def _claims_of(self, slot, person):
+        """Record the links and marriages `person` claims under `slot`; None if it has no id."""
+        pid = person.get("id")
+        if pid is None:
+            return None
+        node = self._node
+        me = node(pid)
+        links = []
+        marriages = []
+        rel = person.get("relations")
+        if rel:
+            links += [(node(p), me, BIO) for p in _as_list(rel.get("parents"))]
+            links += [(node(p), me, STEP) for p in _as_list(rel.get("stepParents"))]
+            links += [(me, node(c), BIO) for c in _as_list(rel.get("children"))]
+            links += [(me, node(c), ADOPTED) for c in _as_list(rel.get("adoptedChildren"))]
+            marriages += [("spouses", me, node(s)) for s in _as_list(rel.get("spouse"))]
+            marriages += [("exes", me, node(x)) for x in _as_list(rel.get("exSpouses"))]
+        claims = self._claims[slot] = (me, links, marriages)
+        self._known[me] = self._known.get(me, 0) + 1
+        for marriage in marriages:
+            self._claim_marriage(marriage, 1)
+        return claims
+
+    def _index(self, slot, person):
+        self._cache.clear()
+        claims = self._claims_of(slot, person)
+        if claims is not None:
+            for parent, child, kind in claims[1]:
+                self._claim_link(parent, child, kind, 1)
+
+    def _add_all(self, people):
+        if self._by_slot:
+            super()._add_all(people)
+            return
+        # Building from scratch: count every claim first, then lay out each adjacency list once
+        links = self._links
+        for person in people:
+            slot = len(self._by_slot)
+            self._by_slot.append(person)
+            self._slots[id(person)] = slot
+            claims = self._claims_of(slot, person)
+            if claims is None:
+                continue
+            for parent, child, kind in claims[1]:
+                counts = links.get((parent, child))
+                if counts is None:
+                    counts = links[(parent, child)] = [0, 0, 0]
+                counts[kind] += 1
+        for (parent, child), counts in self._links.items():
+            kind = STEP if counts[STEP] else ADOPTED if counts[ADOPTED] else BIO
+            self._parents[child].append((parent, kind))
+            self._children[parent].append((child, kind))
+        ids = self._ids
+        for edges in self._parents + self._children:
+            if len(edges) > 1:
+                edges.sort(key=lambda edge: ids[edge[0]])
+        self._cache.clear()
+
+    def _unindex(self, slot):
+        self._cache.clear()
+        claims = self._claims.pop(slot, None)
+        if claims is None:
+            return
+        me, links, marriages = claims
+        self._known[me] -= 1
+        if not self._known[me]:
+            del self._known[me]
+        for parent, child, kind in links:
+            self._claim_link(parent, child, kind, -1)
+        for marriage in marriages:
+            self._claim_marriage(marriage, -1)
+
+    def _claim_link(self, parent, child, kind, delta):
+        key = (parent, child)
+        counts = self._links.get(key)
+        if counts is None:
+            counts = self._links[key] = [0, 0, 0]
+            was = None
+        else:
+            was = STEP if counts[STEP] else ADOPTED if counts[ADOPTED] else BIO
+        counts[kind] += delta
+        kind = STEP if counts[STEP] else ADOPTED if counts[ADOPTED] else BIO if counts[BIO] else None
+        if kind == was:
+            return  # e.g. the child's "parents" confirming the parent's "children"
+        if kind is None:
+            del self._links[key]
+        for edges, other in ((self._parents[child], parent), (self._children[parent], child)):
+            # Edges stay sorted by person id, so the walks (and any ties they break) don't
+            # depend on the order the claims arrived in
+            if was is not None:
+                i = 0
+                while edges[i][0] != other:
+                    i += 1
+                if kind is None:
+                    del edges[i]
+                else:
+                    edges[i] = (other, kind)
+                continue
+            other_id = self._ids[other]
+            i = len(edges)
+            while i and self._ids[edges[i - 1][0]] > other_id:
+                i -= 1
+            edges.insert(i, (other, kind))
+
+    def _claim_marriage(self, marriage, delta):
+        which, a, b = marriage
+        key = (which, min(a, b), max(a, b))
+        count = self._marriages.get(key, 0) + delta
+        sets = getattr(self, "_" + which)
+        if count:
+            self._marriages[key] = count
+            sets[a].add(b)
+            sets[b].add(a)
+        else:
+            del self._marriages[key]
+            sets[a].discard(b)
+            sets[b].discard(a)
+
+    def _neighbors(self, node):
+        for p, _ in self._parents[node]:
+            yield p
+        for c, _ in self._children[node]:
+            yield c
+        yield from self._spouses[node]
+        yield from self._exes[node]
+
+    # --- Queries ---
+    def relations_of(self, person_id):
+        """{other person id: relation label} for everyone related to `person_id`."""
+        self._sync()
+        me = self._node_of.get(person_id)
+        if me is None:
+            return {}
+        cached = self._cache.get(me)
+        if cached is not None:
+            self._cache.move_to_end(me)
+            return cached
+
+        labels = self._compute(me)
+        result = {self._ids[n]: label for n, label in labels.items() if n in self._known and n != me}
+        self._cache[me] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def _compute(self, me):
+        labels = {}
+        blood = {}  # node -> (up, down, adopted)
+
+        # Ancestors through bio/adoptive parent links, nearest first
+        ancestors = [(me, 0, False)]
+        seen = {me}
+        queue = deque(ancestors)
+        while queue:
+            node, up, adopted = queue.popleft()
+            for parent, kind in self._parents[node]:
+                if kind == STEP or parent in seen:
+                    continue
+                seen.add(parent)
+                entry = (parent, up + 1, adopted or kind == ADOPTED)
+                ancestors.append(entry)
+                queue.append(entry)
+
+        # Walk down from each ancestor; a node first reached from the nearest ancestor
+        # keeps that lowest-common-ancestor relation, so each node is expanded once.
+        for anc, up, adopted in ancestors:
+            if anc in blood:
+                continue
+            blood[anc] = (up, 0, adopted)
+            queue = deque([(anc, 0, adopted)])
+            while queue:
+                node, down, adopted_path = queue.popleft()
+                for child, kind in self._children[node]:
+                    if kind == STEP or child in blood:
+                        continue
+                    entry = (child, down + 1, adopted_path or kind == ADOPTED)
+                    blood[child] = (up,) + entry[1:]
+                    queue.append(entry)
+
+        my_parents = {p for p, kind in self._parents[me] if kind != STEP}
+        for node, (up, down, adopted) in blood.items():
+            label = kinship_label(up, down)
+            if up == 1 and down == 1:
+                theirs = {p for p, kind in self._parents[node] if kind != STEP}
+                if theirs != my_parents:
+                    label = "half-sibling"
+            if adopted:
+                label = ("adopted " if up == 0 else "adoptive ") + label
+            labels[node] = label
+
+        def mark(node, label):
+            if node not in labels:
+                labels[node] = label
+
+        # Marriage
+        for s in self._spouses[me]:
+            mark(s, "spouse")
+        for x in self._exes[me]:
+            mark(x, "ex-spouse")
+
+        # Step family
+        step_parents = {p for p, kind in self._parents[me] if kind == STEP}
+        for p in my_parents:
+            step_parents.update(s for s in self._spouses[p] if s not in my_parents)
+        for p in step_parents:
+            mark(p, "step-parent")
+            for c, kind in self._children[p]:
+                if kind != STEP:
+                    mark(c, "step-sibling")
+        for c, kind in self._children[me]:
+            if kind == STEP:
+                mark(c, "step-child")
+        for s in self._spouses[me]:
+            for c, kind in self._children[s]:
+                mark(c, "step-child")
+
+        # In-laws and relatives by marriage
+        for s in self._spouses[me]:
+            for p, kind in self._parents[s]:
+                if kind != STEP:
+                    mark(p, "parent-in-law")
+                    for sib, k in self._children[p]:
+                        if k != STEP and sib != s:
+                            mark(sib, "sibling-in-law")
+        for node, (up, down, _) in list(blood.items()):
+            if node == me:
+                continue
+            for s in self._spouses[node]:
+                if up == 0 and down == 1:
+                    mark(s, "child-in-law")
+                elif up == 1 and down == 1:
+                    mark(s, "sibling-in-law")
+                elif down > 0:
+                    mark(s, kinship_label(up, down) + " (by marriage)")
+        return labels
+
+    def relation(self, person_a, person_b):
+        """(label of b relative to a, [ids on the shortest connecting path]) or (None, []) if unrelated."""
+        path = self.path(person_a, person_b)
+        if not path:
+            return None, []
+        if person_a == person_b:
+            return "self", path
+        return self.relations_of(person_a).get(person_b, "relative"), path
+
+    def path(self, person_a, person_b):
+        """Shortest chain of ids linking two people over any relation, via bidirectional BFS."""
+        self._sync()
+        a = self._node_of.get(person_a)
+        b = self._node_of.get(person_b)
+        if a is None or b is None:
+            return []
+        if a == b:
+            return [person_a]
+        prev_a = {a: None}
+        prev_b = {b: None}
+        frontier_a, frontier_b = [a], [b]
+        meet = None
+        while frontier_a and frontier_b and meet is None:
+            # Expand the smaller side
+            if len(frontier_a) <= len(frontier_b):
+                frontier_a, meet = self._expand(frontier_a, prev_a, prev_b)
+            else:
+                frontier_b, meet = self._expand(frontier_b, prev_b, prev_a)
+        if meet is None:
+            return []
+        left = []
+        node = meet
+        while node is not None:
+            left.append(node)
+            node = prev_a[node]
+        left.reverse()
+        node = prev_b[meet]
+        while node is not None:
+            left.append(node)
+            node = prev_b[node]
+        return [self._ids[n] for n in left]
+
+    def _expand(self, frontier, prev, other_prev):
+        next_frontier = []
+        for node in frontier:
+            for nb in self._neighbors(node):
+                if nb in prev:
+                    continue
+                prev[nb] = node
+                if nb in other_prev:
+                    return next_frontier, nb
+                next_frontier.append(nb)
+        return next_frontier, None
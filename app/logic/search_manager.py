@@ -1,38 +1,213 @@
 from datetime import datetime
 
+from app.utils import perf
+
+from app.logic.date_index import DateIndex
+from app.logic.name_resolver import NameResolver
+from app.logic.relationship_graph import RelationshipGraph
+from app.logic.tag_index import TagIndex
+from app.logic.text_index import TextIndex
+from app.logic.trigram_index import TrigramIndex, record_names
+
+# Free-text fields (and their BM25 weights) for the full-text search
+TEXT_FIELDS = {
+    "stories": {"title": 2.0, "text": 1.0, "source": 1.0},
+    "photos": {"description": 1.0, "desc": 1.0},  # the admin form saves "desc"
+}
+
+COLLECTIONS = ("people", "pets", "stories", "photos", "quizzes")
+
+# What find_quizzes_by_name matches; the admin form saves the answer as "answer"
+QUIZ_NAME_FIELDS = ("name", "question", "correct", "answer")
+
+
+def _collection(name):
+    """List attribute for a collection, loaded from its store on first access."""
+    def get(self):
+        records = self._lists.get(name)
+        if records is None:
+            store = self.stores.get(name)
+            records = self._lists[name] = store.get_all() if store is not None else []
+        return records
+
+    def set(self, records):
+        self._lists[name] = records
+
+    return property(get, set)
+
+
 class SearchManager:
     """
     Read-only search utility for people, pets, stories, etc.
     Can be pointed at in-memory lists or loaded data structures.
     """
 
-    def __init__(self, people=None, pets=None, stories=None, photos=None, quizzes=None):
+    people = _collection("people")
+    pets = _collection("pets")
+    stories = _collection("stories")
+    photos = _collection("photos")
+    quizzes = _collection("quizzes")
+
+    def __init__(self, people=None, pets=None, stories=None, photos=None, quizzes=None, name_index=False,
+                 stores=None):
         """
         people, pets, stories, photos: List of dicts (from JSON or elsewhere)
+        name_index: build trigram indexes for the people/pet name searches
+        stores: {collection: store}; lists not passed are loaded from these on first use.
+                Name, date range, owner and person lookups go to a store's find_by_name /
+                find_by_date_range / find_by where it has them, so on the SQLite backend
+                they run as queries without loading the collection
         """
-        self.people = people if people is not None else []
-        self.pets = pets if pets is not None else []
-        self.stories = stories if stories is not None else []
-        self.photos = photos if photos is not None else []
-        self.quizzes = quizzes if quizzes is not None else []
+        self.stores = dict(stores or {})
+        self._lists = {}
+        for name, records in zip(COLLECTIONS, (people, pets, stories, photos, quizzes)):
+            if records is not None or name not in self.stores:
+                self._lists[name] = records if records is not None else []
+
+        self.people_name_index = TrigramIndex(self.people) if name_index else None
+        self.pets_name_index = TrigramIndex(self.pets) if name_index else None
+
+        # (id(items), date_key) -> DateIndex, built on first date query
+        self._date_indexes = {}
+        self._tag_index = None
+        self._relationship_graph = None
+        self._name_resolver = None
+        self._text_indexes = {}  # collection -> TextIndex, built on first text search
+        self._quiz_name_index = None
+        self._quiz_tag_index = None
+
+    # --- Prebuilt indexes (for the snapshot cache) ---
+    def enable_name_index(self):
+        """Build the people/pet trigram indexes if they aren't there yet."""
+        if self.people_name_index is None and self._querying_store("people", "find_by_name") is None:
+            self.people_name_index = TrigramIndex(self.people)
+        if self.pets_name_index is None and self._querying_store("pets", "find_by_name") is None:
+            self.pets_name_index = TrigramIndex(self.pets)
+
+    def _querying_store(self, collection, method):
+        """The store behind `collection` if it answers `method` itself (e.g. SQLiteStore.find_by_name), else None."""
+        store = self.stores.get(collection)
+        if not hasattr(store, method):
+            return None
+        records = self._lists.get(collection)
+        return store if records is None or records is store.get_all() else None
+
+    def _collection_of(self, items):
+        return next((name for name, records in self._lists.items() if records is items), None)
+
+    def export_indexes(self):
+        """{name: (collection, index)} for every index built so far."""
+        indexes = {}
+        if self.people_name_index is not None:
+            indexes["people_names"] = ("people", self.people_name_index)
+        if self.pets_name_index is not None:
+            indexes["pets_names"] = ("pets", self.pets_name_index)
+        if self._name_resolver is not None:
+            indexes["people_resolver"] = ("people", self._name_resolver)
+        if self._tag_index is not None:
+            indexes["photos_tags"] = ("photos", self._tag_index)
+        for collection in ("photos", "stories"):
+            index = self._date_indexes.get((id(self._lists.get(collection)), "date"))
+            if index is not None:
+                indexes[f"{collection}_dates"] = (collection, index)
+        for collection, index in self._text_indexes.items():
+            indexes[f"{collection}_text"] = (collection, index)
+        return indexes
+
+    def import_index(self, name, index):
+        """Install an index produced by export_indexes (already attached to this manager's lists)."""
+        if name == "people_names":
+            self.people_name_index = index
+        elif name == "pets_names":
+            self.pets_name_index = index
+        elif name == "people_resolver":
+            self._name_resolver = index
+        elif name == "photos_tags":
+            self._tag_index = index
+        elif name in ("photos_dates", "stories_dates"):
+            collection = name.split("_")[0]
+            self._date_indexes[(id(getattr(self, collection)), "date")] = index
+        elif name in ("stories_text", "photos_text"):
+            self._text_indexes[name.split("_")[0]] = index
+
+    # --- Change notifications ---
+    def record_changed(self, collection, op, item):
+        """
+        Keep indexes in step with a store mutation (wired to DataRepository events).
+        - collection: "people", "pets", "photos", "stories" or "quizzes"
+        - op: "add", "update", "delete", or "reload" (item None) after a batch of
+          external edits
+        Appended records are picked up by the indexes themselves on the next query;
+        in-place edits and deletes re-index just that record here. After a reload the
+        list may be anything, so the indexes over it rebuild on their next query.
+        """
+        if op == "reload":
+            for index in self._indexes_over(collection):
+                index.invalidate()
+            return
+        if op == "delete":
+            for index in self._indexes_over(collection):
+                index.remove_record(item)
+        elif op == "update":
+            for index in self._indexes_over(collection):
+                index.update_record(item)
+
+    def _indexes_over(self, collection):
+        """The built indexes whose record positions refer to `collection`'s list."""
+        items = self._lists.get(collection)
+        indexes = [index for index in self._date_indexes.values() if index.items is items]
+        indexes.append(self._text_indexes.get(collection))
+        if collection == "people":
+            indexes += [self.people_name_index, self._name_resolver, self._relationship_graph]
+        elif collection == "pets":
+            indexes.append(self.pets_name_index)
+        elif collection == "photos":
+            indexes.append(self._tag_index)
+        elif collection == "quizzes":
+            indexes += [self._quiz_name_index, self._quiz_tag_index]
+        return [index for index in indexes if index is not None]
 
     # --- Person search ---
+    @perf.timed("search.find_people_by_name")
     def find_people_by_name(self, name, exact=False):
-        """Return all people whose name or nick matches. Partial unless exact=True."""
+        """Return all people whose name, nick or alias matches. Partial unless exact=True."""
+        store = self._querying_store("people", "find_by_name")
+        if store is not None:
+            return store.find_by_name(name, exact=exact)
+        if self.people_name_index is not None:
+            return self.people_name_index.search(name, exact=exact)
+        return self._scan_names(self.people, name, exact)
+
+    @staticmethod
+    def _scan_names(records, name, exact):
         result = []
         name_lc = name.lower().strip()
-        for p in self.people:
-            names = [p.get("name", ""), p.get("nickname", "")]
+        for r in records:
+            names = record_names(r)
             if not exact:
                 # Partial/substring match
-                if any(name_lc in (n or "").lower() for n in names):
-                    result.append(p)
+                if any(name_lc in n for n in names):
+                    result.append(r)
             else:
                 # Exact match (case-insensitive)
-                if any((n or "").lower() == name_lc for n in names):
-                    result.append(p)
+                if any(n == name_lc for n in names):
+                    result.append(r)
         return result
 
+    def get_name_resolver(self):
+        """Fuzzy name resolver over people, built on first use."""
+        if self._name_resolver is None or self._name_resolver.people is not self.people:
+            self._name_resolver = NameResolver(self.people)
+        return self._name_resolver
+
+    @perf.timed("search.resolve_names")
+    def resolve_names(self, names, limit=5):
+        """
+        Resolve many typed names at once (names, nicknames, aliases, previous names; typo tolerant).
+        Returns {name: ranked candidate dicts}; see NameResolver.resolve_many.
+        """
+        return self.get_name_resolver().resolve_many(names, limit=limit)
+
     def person_exists(self, name):
         """Return True if any person matches this name or nickname (partial match)."""
         return len(self.find_people_by_name(name)) > 0
@@ -49,16 +224,76 @@ class SearchManager:
         """If your data uses unique IDs, fetch by list of ids."""
         return [p for p in self.people if p.get("id") in ids]
 
+    def get_person(self, person_id):
+        """The person with this id, or None."""
+        store = self._querying_store("people", "get_by_id")
+        if store is not None:
+            return store.get_by_id(person_id)
+        return next((p for p in self.people if p.get("id") == person_id), None)
+
+    def get_pets_by_owner(self, person_id):
+        """Pets whose ownerId is `person_id`."""
+        return self._find_by("pets", "ownerId", person_id)
+
+    def get_stories_by_person(self, person_id):
+        """Stories whose personId is `person_id`."""
+        return self._find_by("stories", "personId", person_id)
+
+    def _find_by(self, collection, field, value):
+        store = self._querying_store(collection, "find_by")
+        if store is not None:
+            try:
+                return store.find_by(field, value)
+            except KeyError:
+                pass  # field not indexed by this store
+        return [r for r in getattr(self, collection) if r.get(field) == value]
+
+    # --- Relationships ---
+    def get_relationship_graph(self):
+        """Kinship graph over people's `relations`, built on first use."""
+        if self._relationship_graph is None or self._relationship_graph.people is not self.people:
+            self._relationship_graph = RelationshipGraph(self.people)
+        return self._relationship_graph
+
+    @perf.timed("search.get_relations")
+    def get_relations(self, person_id):
+        """{person id: relation label} for everyone related to `person_id` (memoized)."""
+        return self.get_relationship_graph().relations_of(person_id)
+
+    @perf.timed("search.get_relationship")
+    def get_relationship(self, person_a, person_b):
+        """(label of b relative to a, connecting path of ids)."""
+        return self.get_relationship_graph().relation(person_a, person_b)
+
+    def person_edited(self, person_id=None):
+        """
+        Call after changing a person's relations in place without a repository event
+        (those reach the graph through record_changed). None: anyone may have changed.
+        """
+        graph = self._relationship_graph
+        if graph is None:
+            return
+        person = self.get_person(person_id) if person_id is not None else None
+        if person is not None:
+            graph.update_record(person)
+        else:
+            graph.invalidate()
+
     # --- Pet search (expand as needed) ---
+    @perf.timed("search.find_pets_by_name")
     def find_pets_by_name(self, name, exact=False):
-        name_lc = name.lower().strip()
-        return [pet for pet in self.pets if (name_lc == (pet.get("name", "") or "").lower())] if exact else \
-               [pet for pet in self.pets if name_lc in (pet.get("name", "") or "").lower()]
+        store = self._querying_store("pets", "find_by_name")
+        if store is not None:
+            return store.find_by_name(name, exact=exact)
+        if self.pets_name_index is not None:
+            return self.pets_name_index.search(name, exact=exact)
+        return self._scan_names(self.pets, name, exact)
 
     def pet_exists(self, name):
         return len(self.find_pets_by_name(name)) > 0
 
     # --- Generic photo filter ---
+    @perf.timed("search.get_photo_by")
     def get_photo_by(self, key_name, search_value, exact=False):
         """
         Find all photos where field `key_name` matches `search_value`.
@@ -90,8 +325,25 @@ class SearchManager:
         return self.get_photo_by("file", filename, exact=exact)
 
     def get_photo_by_tag(self, tag, exact=False):
+        if exact:
+            return self.get_tag_index().find([tag])
         return self.get_photo_by("tags", tag, exact=exact)
 
+    # --- Multi-person photo search ---
+    def get_tag_index(self):
+        """Tag -> photo postings, built on first use and extended as photos are appended."""
+        if self._tag_index is None or self._tag_index.photos is not self.photos:
+            self._tag_index = TagIndex(self.photos)
+        return self._tag_index
+
+    @perf.timed("search.find_photos_with_people")
+    def find_photos_with_people(self, ids, mode="all", start_date=None, end_date=None, location=None):
+        """
+        Photos tagged with all (mode="all") or any (mode="any") of the given person ids.
+        Optional date range ('YYYY-MM-DD') and location filters are applied in the same pass.
+        """
+        return self.get_tag_index().find(ids, mode=mode, start_date=start_date, end_date=end_date, location=location)
+
     def get_photo_by_date(self, date_str, exact=True):
         return self.get_photo_by("date", date_str, exact=exact)
 
@@ -104,6 +356,7 @@ class SearchManager:
         return self.get_photo_by(key_name, search_value, exact=exact)
     
     
+    @perf.timed("search.get_items_by_date_range")
     def get_items_by_date_range(self, items, start_date, end_date, date_key="date"):
         """
         Generalized date range search for any collection of dicts.
@@ -111,33 +364,118 @@ class SearchManager:
         - start_date, end_date: strings 'YYYY-MM-DD'
         - date_key: key to look up date string in each dict
         """
+        return self._date_range(self._collection_of(items), items, start_date, end_date, date_key)
+
+    def _date_range(self, collection, items, start_date, end_date, date_key):
+        """get_items_by_date_range; `items` may be None when `collection` names the list."""
         try:
             dt_start = datetime.strptime(start_date, "%Y-%m-%d")
             dt_end = datetime.strptime(end_date, "%Y-%m-%d")
         except Exception as e:
             raise ValueError("Invalid date format. Use YYYY-MM-DD") from e
 
-        results = []
-        for item in items:
-            date_str = item.get(date_key, "")
+        store = self._querying_store(collection, "find_by_date_range")
+        if store is not None:
             try:
-                item_date = datetime.strptime(date_str, "%Y-%m-%d")
-            except Exception:
-                continue  # skip if missing or invalid
-            if dt_start <= item_date <= dt_end:
-                results.append(item)
-        return results
+                return store.find_by_date_range(dt_start.date().isoformat(), dt_end.date().isoformat(), date_key)
+            except KeyError:
+                pass  # not a SQL column; use the in-memory index
+        if items is None:
+            items = getattr(self, collection)
+        # Items with a missing or invalid date are left out of the index
+        return self.get_date_index(items, date_key).range(dt_start.toordinal(), dt_end.toordinal())
+
+    def get_date_index(self, items, date_key="date"):
+        """Sorted date index for `items`, parsed once and extended as items are appended."""
+        key = (id(items), date_key)
+        index = self._date_indexes.get(key)
+        if index is None or index.items is not items:
+            index = self._date_indexes[key] = DateIndex(items, date_key)
+        return index
+
+    def get_items_on_this_day(self, items, month, day, date_key="date"):
+        """Items from any year dated on the given month/day (timeline "on this day")."""
+        return self.get_date_index(items, date_key).on_this_day(month, day)
+
+    def get_items_by_decade(self, items, decade, date_key="date"):
+        """Items dated within a decade (e.g. 1990), oldest first."""
+        return self.get_date_index(items, date_key).decade(decade)
+
+    def get_decade_counts(self, items, date_key="date"):
+        """{decade: count} buckets for the timeline view."""
+        return self.get_date_index(items, date_key).decade_counts()
 
     # --- Convenience wrappers ---
     def get_photos_by_date_range(self, start_date, end_date):
-        return self.get_items_by_date_range(self.photos, start_date, end_date, date_key="date")
+        return self._date_range("photos", None, start_date, end_date, "date")
 
     def get_stories_by_date_range(self, start_date, end_date):
-        return self.get_items_by_date_range(self.stories, start_date, end_date, date_key="date")
+        return self._date_range("stories", None, start_date, end_date, "date")
+
+    def get_photos_on_this_day(self, month, day):
+        return self.get_items_on_this_day(self.photos, month, day, date_key="date")
+
+    def get_stories_on_this_day(self, month, day):
+        return self.get_items_on_this_day(self.stories, month, day, date_key="date")
     
-    # TODO: Add quizzes
+    # --- Full-text search (stories and photo descriptions) ---
+    def get_text_index(self, collection):
+        """BM25 word index over a collection's TEXT_FIELDS, built on first use."""
+        items = getattr(self, collection)
+        index = self._text_indexes.get(collection)
+        if index is None or index.records is not items or index.fields != TEXT_FIELDS[collection]:
+            index = self._text_indexes[collection] = TextIndex(items, TEXT_FIELDS[collection])
+        return index
+
+    @perf.timed("search.search_text")
+    def search_text(self, query, collections=("stories", "photos"), mode="all", limit=20, snippet_width=160):
+        """
+        Ranked full-text search, e.g. 'fishing "old farm house"' (quoted = phrase).
+        - mode: every plain word must appear ("all") or any of them ("any")
+        Returns up to `limit` dicts {collection, record, score, field, snippet}, best
+        first; matched words in the snippet are wrapped in [brackets].
+        """
+        hits = []
+        for collection in collections:
+            index = self.get_text_index(collection)
+            for score, record in index.search(query, mode=mode, limit=limit):
+                hits.append((score, collection, record))
+        hits.sort(key=lambda h: -h[0])
+        results = []
+        for score, collection, record in hits[:limit]:
+            field, snippet = self.get_text_index(collection).snippet(record, query, width=snippet_width)
+            results.append({"collection": collection, "record": record, "score": score,
+                            "field": field, "snippet": snippet})
+        return results
+
+    def search_stories(self, query, mode="all", limit=20):
+        return self.search_text(query, collections=("stories",), mode=mode, limit=limit)
+
+    def search_photo_descriptions(self, query, mode="all", limit=20):
+        return self.search_text(query, collections=("photos",), mode=mode, limit=limit)
 
     # --- Quiz Search ---
-    # Quizzes are only searchable by tag or name. 
-    # Quizzes should not be searchable by people names
+    # Quizzes are only searchable by tag or by their own text (question/answer);
+    # they never show up in the people name searches
+    def get_quiz_name_index(self):
+        """Trigram index over quiz names, questions and answers (quizzes have no "name" field yet)."""
+        if self._quiz_name_index is None or self._quiz_name_index.records is not self.quizzes:
+            self._quiz_name_index = TrigramIndex(self.quizzes, fields=QUIZ_NAME_FIELDS)
+        return self._quiz_name_index
+
+    def get_quiz_tag_index(self):
+        if self._quiz_tag_index is None or self._quiz_tag_index.photos is not self.quizzes:
+            self._quiz_tag_index = TagIndex(self.quizzes)
+        return self._quiz_tag_index
+
+    @perf.timed("search.find_quizzes_by_name")
+    def find_quizzes_by_name(self, name, exact=False):
+        return self.get_quiz_name_index().search(name, exact=exact)
+
+    @perf.timed("search.find_quizzes_by_tag")
+    def find_quizzes_by_tag(self, tags, mode="any"):
+        """Quizzes tagged with any (or all) of `tags`, e.g. ["pets", "holidays"]."""
+        if isinstance(tags, str):
+            tags = [tags]
+        return self.get_quiz_tag_index().find(tags, mode=mode)
     
\ No newline at end of file
@@ -0,0 +1,85 @@
+from datetime import datetime
+
+from app.logic.date_index import parse_ordinal
+from app.logic.record_index import RecordIndex
+
+
+class TagIndex(RecordIndex):
+    """
+    Inverted index from photo tag (person id) to the photos carrying it.
+    Tags are matched case-insensitively, like the exact tag search.
+    Multi-person queries intersect/union the postings, smallest first, and apply
+    the optional date/location filters while walking the candidates.
+    """
+
+    def __init__(self, photos, tag_key="tags", date_key="date", location_key="location"):
+        self.tag_key = tag_key
+        self.date_key = date_key
+        self.location_key = location_key
+        super().__init__(photos)
+
+    @property
+    def photos(self):
+        return self.records
+
+    def _reset(self):
+        self._postings = {}   # lowercased tag -> set of slots
+        self._ordinals = {}   # slot -> date ordinal (or None)
+        self._tags = {}       # slot -> lowercased tags
+
+    def _index(self, slot, photo):
+        tags = self._tags_of(photo)
+        for tag in tags:
+            self._postings.setdefault(tag, set()).add(slot)
+        self._tags[slot] = tags
+        self._ordinals[slot] = parse_ordinal(photo.get(self.date_key, ""))
+
+    def _unindex(self, slot):
+        for tag in self._tags.pop(slot):
+            self._postings.get(tag, set()).discard(slot)
+        del self._ordinals[slot]
+
+    def _tags_of(self, photo):
+        tags = photo.get(self.tag_key) or []
+        if not isinstance(tags, list):
+            tags = [tags]
+        return [str(tag).lower() for tag in tags]
+
+    def positions(self, tags, mode="all"):
+        """Sorted slots (list order) of photos tagged with all (or any) of `tags`."""
+        self._sync()
+        postings = [self._postings.get(str(t).lower().strip(), set()) for t in tags]
+        if not postings:
+            return []
+        if mode == "all":
+            postings.sort(key=len)
+            smallest, rest = postings[0], postings[1:]
+            return sorted(p for p in smallest if all(p in s for s in rest))
+        if mode == "any":
+            return sorted(set().union(*postings))
+        raise ValueError("mode must be 'all' or 'any'")
+
+    def find(self, tags, mode="all", start_date=None, end_date=None, location=None):
+        """
+        Photos tagged with all/any of `tags`, in list order.
+        - start_date, end_date: optional 'YYYY-MM-DD' bounds (photos without a valid date are dropped)
+        - location: optional case-insensitive exact location match
+        """
+        try:
+            start = datetime.strptime(start_date, "%Y-%m-%d").toordinal() if start_date else None
+            end = datetime.strptime(end_date, "%Y-%m-%d").toordinal() if end_date else None
+        except Exception as e:
+            raise ValueError("Invalid date format. Use YYYY-MM-DD") from e
+        location_lc = location.lower().strip() if location else None
+
+        results = []
+        for slot in self.positions(tags, mode):
+            if start is not None or end is not None:
+                ordinal = self._ordinals[slot]
+                if ordinal is None or (start is not None and ordinal < start) or (end is not None and ordinal > end):
+                    continue
+            photo = self._by_slot[slot]
+            if location_lc is not None and str(photo.get(self.location_key) or "").lower() != location_lc:
+                continue
+            results.append(photo)
+        return results
@@ -0,0 +1,224 @@
+import heapq
+import math
+import re
+from array import array
+
+from app.logic.record_index import RecordIndex
+
+TOKEN_RE = re.compile(r"\w+")
+QUERY_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def tokenize(text):
+    """Lowercased word tokens of `text`."""
+    return TOKEN_RE.findall(str(text or "").lower())
+
+
+def parse_query(query):
+    """
+    Split a query into (terms, phrases).
+    Quoted parts are phrases (token lists); everything else is single terms.
+    """
+    terms, phrases = [], []
+    for phrase, word in QUERY_RE.findall(query or ""):
+        if phrase:
+            tokens = tokenize(phrase)
+            if len(tokens) > 1:
+                phrases.append(tokens)
+            else:
+                terms.extend(tokens)
+        else:
+            terms.extend(tokenize(word))
+    return terms, phrases
+
+
+def _find_aligned(haystack, needle, width=array("I").itemsize):
+    """True if `needle` occurs in `haystack` at a whole-term offset."""
+    i = haystack.find(needle)
+    while i != -1:
+        if i % width == 0:
+            return True
+        i = haystack.find(needle, i + 1)
+    return False
+
+
+class TextIndex(RecordIndex):
+    """
+    Inverted word index over free-text fields of a list of records, ranked with BM25.
+    - fields: {field: weight}; a term's frequency in a record is the weighted sum
+      over fields (so a title hit counts more than a body hit).
+    - Plain terms must all match (mode="all") or any may (mode="any"); quoted
+      phrases always must match. Each record keeps its token sequence as packed
+      term ids, so a phrase check is a single bytes.find().
+    """
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, records, fields):
+        self.fields = dict(fields)
+        super().__init__(records)
+
+    def _reset(self):
+        self._postings = {}    # term -> {slot: weighted term frequency}
+        self._terms = {}       # slot -> terms of that record
+        self._lengths = {}     # slot -> weighted token count
+        self._total_length = 0.0
+        self._norms = None     # slot -> BM25 length norm, for the current average length
+        self._term_ids = {}    # term -> id (0 separates fields in a sequence)
+        self._sequences = {}   # slot -> packed term ids of the record's text
+
+    def _index(self, slot, record):
+        counts = {}
+        length = 0.0
+        term_ids = self._term_ids
+        sequence = array("I")
+        for field, weight in self.fields.items():
+            tokens = tokenize(record.get(field))
+            length += weight * len(tokens)
+            for token in tokens:
+                counts[token] = counts.get(token, 0.0) + weight
+                term_id = term_ids.get(token)
+                if term_id is None:
+                    term_id = term_ids[token] = len(term_ids) + 1
+                sequence.append(term_id)
+            sequence.append(0)
+        self._sequences[slot] = sequence.tobytes()
+        for term, tf in counts.items():
+            self._postings.setdefault(term, {})[slot] = tf
+        self._terms[slot] = tuple(counts)
+        self._lengths[slot] = length
+        self._total_length += length
+        self._norms = None
+
+    def _unindex(self, slot):
+        for term in self._terms.pop(slot):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(slot, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._lengths.pop(slot)
+        del self._sequences[slot]
+        self._norms = None
+
+    # --- Queries ---
+    def _candidates(self, terms, phrases, mode):
+        required = [t for phrase in phrases for t in phrase]
+        if mode == "all":
+            required += terms
+        elif mode != "any":
+            raise ValueError("mode must be 'all' or 'any'")
+        if required:
+            # In "any" mode the plain terms only add to the score of phrase matches
+            postings = sorted((self._postings.get(t, {}) for t in set(required)), key=len)
+            candidates = set(postings[0])
+            for other in postings[1:]:
+                candidates &= other.keys()
+        else:
+            candidates = set()
+            for t in terms:
+                candidates.update(self._postings.get(t, ()))
+        if phrases and candidates:
+            packed = []
+            for phrase in phrases:
+                if any(t not in self._term_ids for t in phrase):
+                    return set()
+                packed.append(array("I", (self._term_ids[t] for t in phrase)).tobytes())
+            sequences = self._sequences
+            candidates = [p for p in candidates if all(_find_aligned(sequences[p], needle) for needle in packed)]
+        return candidates
+
+    def _length_norms(self):
+        if self._norms is None:
+            count = len(self._lengths)
+            avg_length = (self._total_length / count) if count and self._total_length else 1.0
+            k1, b = self.k1, self.b
+            self._norms = {slot: k1 * (1 - b + b * length / avg_length) for slot, length in self._lengths.items()}
+        return self._norms
+
+    def search(self, query, mode="all", limit=20):
+        """
+        [(score, record)] best first for a query such as: fishing "old farm house".
+        limit=None returns every match.
+        """
+        self._sync()
+        terms, phrases = parse_query(query)
+        if not terms and not phrases:
+            return []
+        candidates = self._candidates(terms, phrases, mode)
+        if not candidates:
+            return []
+
+        count = len(self._lengths)
+        weights = []
+        for term in set(terms) | {t for phrase in phrases for t in phrase}:
+            postings = self._postings.get(term)
+            if postings:
+                df = len(postings)
+                weights.append((postings, (self.k1 + 1) * math.log(1 + (count - df + 0.5) / (df + 0.5))))
+
+        norms = self._length_norms()
+        scored = []
+        for slot in candidates:
+            norm = norms[slot]
+            score = 0.0
+            for postings, idf in weights:
+                tf = postings.get(slot)
+                if tf:
+                    score += idf * tf / (tf + norm)
+            scored.append((score, -slot))
+        best = heapq.nlargest(limit, scored) if limit is not None else sorted(scored, reverse=True)
+        return [(score, self._by_slot[-neg]) for score, neg in best]
+
+    def snippet(self, record, query, width=160, mark=("[", "]")):
+        """
+        (field, text) excerpt of `record` around the densest cluster of query words,
+        with each matched word wrapped in `mark`. Falls back to the first field's start.
+        """
+        terms, phrases = parse_query(query)
+        wanted = set(terms) | {t for phrase in phrases for t in phrase}
+        best = None
+        for field in sorted(self.fields, key=lambda f: -self.fields[f]):
+            text = str(record.get(field) or "")
+            spans = [m.span() for m in TOKEN_RE.finditer(text) if m.group().lower() in wanted]
+            if not spans:
+                continue
+            # Widest group of matches that fits in `width` characters
+            lo = 0
+            for hi in range(len(spans)):
+                while lo < hi and spans[hi][1] - spans[lo][0] > width:
+                    lo += 1
+                if best is None or hi - lo + 1 > best[0]:
+                    best = (hi - lo + 1, field, text, spans, spans[lo][0], spans[hi][1])
+        if best is None:
+            field = next((f for f in self.fields if record.get(f)), next(iter(self.fields)))
+            text = str(record.get(field) or "")
+            return field, text[:width] + ("..." if len(text) > width else "")
+
+        _, field, text, spans, start, end = best
+        if end - start > width:
+            # A single matched word longer than the excerpt: cut it
+            end = start + width
+        else:
+            pad = (width - (end - start)) // 2
+            start = max(0, start - pad)
+            end = min(len(text), end + pad)
+            # Don't cut words in half at the edges
+            while start > 0 and text[start - 1].isalnum():
+                start -= 1
+            while end < len(text) and text[end].isalnum():
+                end += 1
+
+        pieces = []
+        cursor = start
+        for s, e in spans:
+            if s < start or s >= end:
+                continue
+            e = min(e, end)
+            pieces.append(text[cursor:s])
+            pieces.append(mark[0] + text[s:e] + mark[1])
+            cursor = e
+        pieces.append(text[cursor:end])
+        excerpt = "".join(pieces).strip()
+        return field, ("..." if start > 0 else "") + excerpt + ("..." if end < len(text) else "")
@@ -0,0 +1,74 @@
+from app.logic.record_index import RecordIndex
+
+NAME_FIELDS = ("name", "nickname", "aliases")
+
+
+def record_names(record, fields=NAME_FIELDS):
+    """
+    Lowercased names of a record, in the form the name searches compare against.
+    Missing scalar fields count as "" (like the original scan); list fields add one entry per item.
+    """
+    names = []
+    for field in fields:
+        value = record.get(field)
+        if isinstance(value, list):
+            names.extend((v or "").lower() for v in value)
+        elif field in ("name", "nickname") or value is not None:
+            names.append((value or "").lower())
+    return names
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex(RecordIndex):
+    """
+    Inverted trigram index over the name fields of a list of records.
+    Substring queries intersect the posting sets of the query's trigrams and then
+    verify the survivors, so results are identical to a linear scan (same order too).
+    """
+
+    def __init__(self, records, fields=NAME_FIELDS):
+        self.fields = fields
+        super().__init__(records)
+
+    def _reset(self):
+        self._names = {}      # slot -> lowercased names
+        self._postings = {}   # trigram -> set of slots
+        self._exact = {}      # lowercased name -> set of slots
+
+    def _index(self, slot, record):
+        names = record_names(record, self.fields)
+        self._names[slot] = names
+        for n in names:
+            self._exact.setdefault(n, set()).add(slot)
+            for gram in trigrams(n):
+                self._postings.setdefault(gram, set()).add(slot)
+
+    def _unindex(self, slot):
+        for n in self._names.pop(slot):
+            self._exact.get(n, set()).discard(slot)
+            for gram in trigrams(n):
+                self._postings.get(gram, set()).discard(slot)
+
+    def search(self, query, exact=False):
+        """Records whose name matches `query` (case-insensitive). Partial unless exact=True."""
+        q = query.lower().strip()
+        self._sync()
+        if exact:
+            return self._records_at(sorted(self._exact.get(q, ())))
+
+        grams = trigrams(q)
+        if not grams:
+            # Too short to index: verify every record (names are already lowercased)
+            candidates = sorted(self._names)
+        else:
+            postings = sorted((self._postings.get(g, set()) for g in grams), key=len)
+            candidates = set(postings[0])
+            for p in postings[1:]:
+                if not candidates:
+                    break
+                candidates &= p
+            candidates = sorted(candidates)
+        return self._records_at(slot for slot in candidates if any(q in n for n in self._names[slot]))
@@ -1,8 +1,18 @@
+import os
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, simpledialog
 
-from app.utils.json_manager import JSONStore
-from app.logic.search_manager import SearchManager
+from app.logic.quiz_engine import QuizEngine
+from app.utils.query_client import RemoteRepository, ServerPoller
+from app.utils.repository import open_repository
+from app.utils.watcher import DataWatcher
+from app.ui.virtual_list import PersonSelector
+from app.ui.perf_panel import PerfPanel
+from app.utils import perf
+
+SAVE_ERROR_POLL_MS = 500
+QUIZ_FILL_MS = 1000       # how often to top up the screensaver quiz queue once it's full
+QUIZ_FILL_BUSY_MS = 50    # delay between fill steps while it has room
 
 # --- Base Application Window ---
 class FamilyTreeKioskApp(tk.Tk):
@@ -11,30 +21,112 @@ class FamilyTreeKioskApp(tk.Tk):
         self.title("Family Tree Kiosk")
         self.geometry("1200x800")
 
+        # Shared data for every tab; stores load on first use. With KIOSK_SERVER_URL set,
+        # this screen reads from a shared query server instead (read-only: no admin tab)
+        self.repository = open_repository()
+        self.remote = isinstance(self.repository, RemoteRepository)
+
         # Set up tab control
         self.notebook = ttk.Notebook(self)
         self.notebook.pack(expand=True, fill="both")
 
         # Add Main App and Admin tabs
-        self.main_tab = MainAppTab(self.notebook)
-        self.admin_tab = AdminControlsTab(self.notebook)
+        self.main_tab = MainAppTab(self.notebook, self.repository)
+        self.notebook.add(self.main_tab, text="Main App")
+        if not self.remote:
+            self.admin_tab = AdminControlsTab(self.notebook, self.repository)
+            self.notebook.add(self.admin_tab, text="Admin Controls")
 
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
-        self.notebook.add(self.main_tab, text="Main App")
-        self.notebook.add(self.admin_tab, text="Admin Controls")
+        if self.remote:
+            # The server watches the data files; just notice when its data changes
+            self.watcher = ServerPoller(self.repository, self)
+        else:
+            # Pick up edits made to data/*.json while the kiosk is running
+            self.watcher = DataWatcher(self.repository, self)
+        self.watcher.start()
+
+        # Hidden performance overlay + event-loop latency sampling (records only while enabled)
+        self.perf_panel = None
+        self.bind_all("<Control-Shift-P>", self.toggle_perf_panel)
+        self.event_loop_monitor = perf.EventLoopMonitor(self)
+        self.event_loop_monitor.start()
+        self.after(SAVE_ERROR_POLL_MS, self.check_save_errors)
+
+        # Screensaver trivia is prepared in idle time so showing it costs nothing
+        self.quiz_engine = None
+        self.after(QUIZ_FILL_MS, self.schedule_quiz_fill)
+
+    def schedule_quiz_fill(self):
+        self.after_idle(self.fill_quiz_queue)
+
+    @perf.timed("ui.quiz.fill")
+    def fill_quiz_queue(self):
+        if self.quiz_engine is None:
+            self.quiz_engine = QuizEngine(self.repository.search_manager)
+            self.repository.subscribe(self.on_quiz_data_changed)
+        more = self.quiz_engine.fill()
+        self.after(QUIZ_FILL_BUSY_MS if more else QUIZ_FILL_MS, self.schedule_quiz_fill)
+
+    def on_quiz_data_changed(self, collection, op, item):
+        if collection in ("people", "pets", "quizzes"):
+            self.quiz_engine.invalidate()
+
+    def toggle_perf_panel(self, event=None):
+        if self.perf_panel is not None and self.perf_panel.winfo_exists():
+            self.perf_panel.destroy()
+            self.perf_panel = None
+        else:
+            self.perf_panel = PerfPanel(self)
 
+    def check_save_errors(self):
+        """Surface failures from the background save thread."""
+        for collection, error in self.repository.save_errors():
+            messagebox.showerror("Save Failed", f"Could not save {collection}: {error}")
+        self.after(SAVE_ERROR_POLL_MS, self.check_save_errors)
 
-# --- Placeholder for main app tab ---
+    def on_close(self):
+        # Make sure queued edits are on disk before exiting
+        self.watcher.stop()
+        self.repository.close()
+        for collection, error in self.repository.save_errors():
+            messagebox.showerror("Save Failed", f"Could not save {collection}: {error}")
+        self.destroy()
+
+
+# --- Main app tab: person selector ---
 class MainAppTab(ttk.Frame):
-    def __init__(self, parent):
+    def __init__(self, parent, repository):
         super().__init__(parent)
-        label = ttk.Label(self, text="Main Application (to be implemented)")
-        label.pack(padx=10, pady=10)
+        self.repository = repository
+        self.selector = None
+
+        self.selected_label = ttk.Label(self, text="Loading...", font=("Segoe UI", 14))
+        self.selected_label.pack(side="left", anchor="n", padx=10, pady=10)
+
+        repository.subscribe(self.on_data_changed)
+
+        # Let the window draw first; stores and search indexes load once the loop is idle
+        self.after_idle(self.load_data)
+
+    @perf.timed("ui.main.load_data")
+    def load_data(self):
+        self.selector = PersonSelector(self, self.repository.search_manager, on_select=self.on_person_selected)
+        self.selector.pack(side="left", fill="both", expand=True, before=self.selected_label)
+        self.selected_label.configure(text="Select yourself to begin")
+
+    def on_person_selected(self, person):
+        self.selected_label.configure(text=self.repository.search_manager.get_person_summary(person))
+
+    def on_data_changed(self, collection, op, item):
+        if collection == "people" and self.selector is not None:
+            self.selector.invalidate()
 
 
 # --- Admin Controls Tab with Add/Modify and Categories ---
 class AdminControlsTab(ttk.Frame):
-    def __init__(self, parent):
+    def __init__(self, parent, repository):
         super().__init__(parent)
 
         # Add Add/Modify radio buttons at the top
@@ -52,45 +144,44 @@ class AdminControlsTab(ttk.Frame):
 
         self.category_frames = {}
         for category in ["Person", "Photo", "Pet", "Story", "Quiz"]:
-            frame = AdminCategoryFrame(self.category_notebook, category, self.action_var)
+            frame = AdminCategoryFrame(self.category_notebook, category, self.action_var, repository)
             self.category_notebook.add(frame, text=category)
             self.category_frames[category] = frame
 
     def update_category_panel(self):
-        # Notify each category frame to update its view (add/modify)
+        # Notify each category frame to update its view (add/modify); unbuilt ones pick
+        # up the action when first shown
         for frame in self.category_frames.values():
-            frame.update_view()
+            if frame.rendered:
+                frame.update_view()
 
 
 class AdminCategoryFrame(ttk.Frame):
-    def __init__(self, parent, category, action_var):
+    def __init__(self, parent, category, action_var, repository):
         super().__init__(parent)
         self.category = category
         self.action_var = action_var
+        self.repository = repository
 
         self.form_frame = ttk.Frame(self)
         self.form_frame.pack(fill='both', expand=True, padx=12, pady=12)
 
-        # Storage Objects
-        self.store_people = JSONStore('people.json')
-        self.store_photo = JSONStore('photos.json')
-        self.store_pet = JSONStore('pets.json')
-        self.store_story = JSONStore('stories.json')
-        self.store_quiz = JSONStore('quizzes.json')
-
-        # Search Class
-        self.search_manager = SearchManager(
-            people=self.store_people.get_all(),
-            photos=self.store_photo.get_all(),
-            pets=self.store_pet.get_all(),
-            stories=self.store_story.get_all(),
-            quizzes=self.store_quiz.get_all()
-        )
+        # Forms are built the first time the tab is shown, not at startup
+        self.rendered = False
+        self.bind("<Map>", self.on_first_show)
 
+    def on_first_show(self, event=None):
+        if not self.rendered:
+            self.update_view()
 
-        self.update_view()
+    # Search Class (shared by every tab through the repository)
+    @property
+    def search_manager(self):
+        return self.repository.search_manager
 
+    @perf.timed("ui.admin.update_view")
     def update_view(self):
+        self.rendered = True
         # Clear previous form
         for widget in self.form_frame.winfo_children():
             widget.destroy()
@@ -101,6 +192,7 @@ class AdminCategoryFrame(ttk.Frame):
         else:
             self.render_modify_form()
 
+    @perf.timed("ui.admin.render_add_form")
     def render_add_form(self):
         if self.category == "Person":
             self.render_person_add_form()
@@ -147,23 +239,30 @@ class AdminCategoryFrame(ttk.Frame):
     def on_add_person(self):
         data = {k: e.get() for k, e in self.person_entries.items()}
         data['deceased'] = self.deceased_var.get()
-
-        self.store_people.add(data)
+        data['id'] = self.repository.new_id("people", data['name'])
 
         # Gather referenced people names from fields
         fields_with_people = ['parents', 'spouses', 'children', 'ex_spouses', 'nonbio_children']
-        unresolved_names = []
+        names = []
         for field in fields_with_people:
             # Split by comma, strip whitespace, skip empty
-            names = [n.strip() for n in data.get(field, '').split(',') if n.strip()]
-            for name in names:
-                matches = self.search_people.find_people_by_name(name)
-                if not matches:
+            names.extend(n.strip() for n in data.get(field, '').split(',') if n.strip())
+
+        # One batched pass over the name index (typos, nicknames, previous names) before adding,
+        # so the new person can't match their own fields
+        candidates = self.search_manager.resolve_names(names)
+        self.repository.add("people", data)
+
+        unresolved_names = []
+        for name in names:
+            matches = candidates[name]
+            if not matches:
+                unresolved_names.append(name)
+            elif len(matches) > 1 or matches[0]["kind"] != "exact":
+                # Ambiguous or only a near match: let the admin confirm ("did you mean")
+                chosen = self.prompt_resolve_multiple(name, [m["person"] for m in matches])
+                if not chosen:
                     unresolved_names.append(name)
-                elif len(matches) > 1:
-                    chosen = self.prompt_resolve_multiple(name, matches)
-                    if not chosen:
-                        unresolved_names.append(name)
         if unresolved_names:
             self.prompt_add_missing_people(unresolved_names)
 
@@ -220,7 +319,8 @@ class AdminCategoryFrame(ttk.Frame):
 
         def save_and_close():
             person_data = {k: e.get() for k, e in entries.items()}
-            self.store_people.add(person_data)
+            person_data['id'] = self.repository.new_id("people", person_data['name'])
+            self.repository.add("people", person_data)
             win.destroy()
 
         ttk.Button(win, text="Add", command=save_and_close).pack(pady=10)
@@ -259,8 +359,9 @@ class AdminCategoryFrame(ttk.Frame):
     def on_add_photo(self):
         data = {k: e.get() for k, e in self.photo_entries.items()}
         data['file'] = self.photo_file_var.get()
+        data['id'] = self.repository.new_id("photos", os.path.splitext(os.path.basename(data['file']))[0])
 
-        self.store_photo.add(data)
+        self.repository.add("photos", data)
 
     # ----- PET FORM -----
     def render_pet_add_form(self):
@@ -283,8 +384,9 @@ class AdminCategoryFrame(ttk.Frame):
 
     def on_add_pet(self):
         data = {k: e.get() for k, e in self.pet_entries.items()}
+        data['id'] = self.repository.new_id("pets", data['name'])
 
-        self.store_pet.add(data)
+        self.repository.add("pets", data)
 
     # ----- STORY FORM -----
     def render_story_add_form(self):
@@ -308,8 +410,9 @@ class AdminCategoryFrame(ttk.Frame):
     def on_add_story(self):
         data = {k: e.get() for k, e in self.story_entries.items()}
         data['text'] = self.story_text.get("1.0", "end-1c")
-        
-        self.store_story.add(data)
+        data['id'] = self.repository.new_id("stories", data['title'])
+
+        self.repository.add("stories", data)
 
     # ----- QUIZ FORM -----
     def render_quiz_add_form(self):
@@ -332,5 +435,6 @@ class AdminCategoryFrame(ttk.Frame):
 
     def on_add_quiz(self):
         data = {k: e.get() for k, e in self.quiz_entries.items()}
-        
-        self.store_quiz.add(data)
+        data['id'] = self.repository.new_id("quizzes", data['question'])
+
+        self.repository.add("quizzes", data)
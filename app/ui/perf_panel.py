@@ -0,0 +1,61 @@
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from app.utils import perf
+from app.utils.json_manager import DATA_DIR
+
+REFRESH_MS = 1000
+COLUMNS = ("count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")
+
+
+class PerfPanel(tk.Toplevel):
+    """Hidden admin window (Ctrl+Shift+P) listing latency percentiles for instrumented paths."""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.title("Performance")
+        self.geometry("760x420")
+
+        controls = ttk.Frame(self)
+        controls.pack(fill="x", padx=6, pady=6)
+        self.enabled_var = tk.BooleanVar(value=perf.enabled())
+        ttk.Checkbutton(controls, text="Recording", variable=self.enabled_var,
+                        command=lambda: perf.enable(self.enabled_var.get())).pack(side="left")
+        ttk.Button(controls, text="Reset", command=self.on_reset).pack(side="left", padx=4)
+        ttk.Button(controls, text="Dump to file", command=self.on_dump).pack(side="left", padx=4)
+
+        self.tree = ttk.Treeview(self, columns=COLUMNS)
+        self.tree.heading("#0", text="metric")
+        self.tree.column("#0", width=260)
+        for col in COLUMNS:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=80, anchor="e")
+        self.tree.pack(fill="both", expand=True, padx=6, pady=(0, 6))
+
+        self._after_id = None
+        self.refresh()
+
+    def refresh(self):
+        self.render()
+        self._after_id = self.after(REFRESH_MS, self.refresh)
+
+    def destroy(self):
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        super().destroy()
+
+    def render(self):
+        self.tree.delete(*self.tree.get_children())
+        for name, summary in perf.snapshot().items():
+            self.tree.insert("", "end", text=name, values=[summary[c] for c in COLUMNS])
+
+    def on_reset(self):
+        perf.reset()
+        self.render()
+
+    def on_dump(self):
+        path = DATA_DIR / f"perf_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        perf.dump(path)
+        messagebox.showinfo("Performance", f"Saved to {path}", parent=self)
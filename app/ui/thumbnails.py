@@ -0,0 +1,114 @@
+import queue
+import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from app.utils.thumbnail_cache import ThumbnailCache
+
+POLL_MS = 15
+MEMORY_BUDGET = 64 * 1024 * 1024  # bytes of decoded PhotoImages kept around
+
+
+class ThumbnailService:
+    """
+    Loads photo thumbnails without blocking the Tk event loop.
+    Decoding/downsampling runs in a worker pool into the on-disk ThumbnailCache;
+    finished files are turned into PhotoImages on the Tk thread (polled via after())
+    and kept in an LRU bounded by an approximate byte budget.
+    """
+
+    def __init__(self, root, cache=None, workers=4, memory_budget=MEMORY_BUDGET):
+        self.root = root
+        self.cache = cache or ThumbnailCache()
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbs")
+        self.memory_budget = memory_budget
+        self._images = OrderedDict()   # (path, size) -> PhotoImage
+        self._bytes = 0
+        self._pending = {}             # (path, size) -> [callbacks]
+        self._done = queue.Queue()     # (key, thumb file or exception) from workers
+        self._polling = False
+
+    # --- Public API ---
+    def request(self, path, size, callback, on_error=None):
+        """
+        Call `callback(photo_image)` on the Tk thread once the thumbnail is ready.
+        Returns the image immediately (and still calls back) if it's already in memory.
+        """
+        key = (str(path), self.cache.snap_size(size))
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            callback(image)
+            return image
+        waiters = self._pending.get(key)
+        if waiters is not None:
+            waiters.append((callback, on_error))
+            return None
+        self._pending[key] = [(callback, on_error)]
+        self.pool.submit(self._work, key)
+        self._start_polling()
+        return None
+
+    def prefetch(self, paths, size):
+        """Warm the disk cache for the next page of results (no PhotoImages are created)."""
+        for path in paths:
+            self.pool.submit(self._prefetch, str(path), size)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+    # --- Worker side ---
+    def _work(self, key):
+        path, size = key
+        try:
+            result = ("thumb", self.cache.make(path, size))
+        except Exception as e:
+            result = ("error", e)
+        self._done.put((key, result))
+
+    def _prefetch(self, path, size):
+        try:
+            self.cache.make(path, size)
+        except Exception:
+            pass  # a real request will report the failure
+
+    # --- Tk side ---
+    def _start_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(POLL_MS, self._poll)
+
+    def _poll(self):
+        try:
+            while True:
+                key, (kind, value) = self._done.get_nowait()
+                self._deliver(key, kind, value)
+        except queue.Empty:
+            pass
+        if self._pending:
+            self.root.after(POLL_MS, self._poll)
+        else:
+            self._polling = False
+
+    def _deliver(self, key, kind, value):
+        waiters = self._pending.pop(key, [])
+        if kind != "error":
+            try:
+                image = tk.PhotoImage(master=self.root, file=str(value))
+            except Exception as e:
+                kind, value = "error", e
+        if kind == "error":
+            for _, on_error in waiters:
+                if on_error is not None:
+                    on_error(value)
+            return
+        self._remember(key, image)
+        for callback, _ in waiters:
+            callback(image)
+
+    def _remember(self, key, image):
+        self._images[key] = image
+        self._bytes += image.width() * image.height() * 4
+        while self._bytes > self.memory_budget and len(self._images) > 1:
+            _, old = self._images.popitem(last=False)
+            self._bytes -= old.width() * old.height() * 4
@@ -0,0 +1,185 @@
+import tkinter as tk
+from tkinter import ttk
+
+from app.logic.trigram_index import record_names
+from app.utils import perf
+
+DEBOUNCE_MS = 150
+DRAG_THRESHOLD = 8  # pixels of movement before a press becomes a scroll instead of a tap
+
+
+class VirtualList(ttk.Frame):
+    """
+    Touch-friendly list that only creates row widgets for the visible window.
+    Rows are recycled while scrolling: scrolling just rebinds their text to
+    different items, so cost depends on the screen height, not the item count.
+    """
+
+    def __init__(self, parent, row_height=48, format_item=str, on_select=None, font=("Segoe UI", 13)):
+        super().__init__(parent)
+        self.row_height = row_height
+        self.format_item = format_item
+        self.on_select = on_select
+        self.font = font
+        self.items = []
+        self.top = 0                # index of the first visible item
+        self.selected = None
+        self._rows = []
+        self._drag_y = None
+        self._dragged = False
+
+        self.body = tk.Frame(self, background="white")
+        self.body.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.body.bind("<Configure>", lambda e: self._layout())
+        self.body.bind("<MouseWheel>", self._on_wheel)
+        self.body.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.body.bind("<Button-5>", lambda e: self.scroll(3))
+
+    # --- Data ---
+    def set_items(self, items):
+        self.items = items
+        self.top = 0
+        self._refresh()
+
+    def visible_count(self):
+        return max(1, self.body.winfo_height() // self.row_height)
+
+    # --- Scrolling ---
+    def scroll(self, rows):
+        self.scroll_to(self.top + rows)
+
+    def scroll_to(self, index):
+        max_top = max(0, len(self.items) - self.visible_count())
+        index = max(0, min(int(index), max_top))
+        if index != self.top:
+            self.top = index
+            self._refresh()
+
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * len(self.items))
+        elif args[0] == "scroll":
+            step = self.visible_count() if args[2] == "pages" else 1
+            self.scroll(int(args[1]) * step)
+
+    def _on_wheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+
+    # --- Rows ---
+    def _layout(self):
+        """Grow or shrink the row pool to fit the current height."""
+        needed = self.body.winfo_height() // self.row_height + 1
+        while len(self._rows) < needed:
+            row = tk.Label(self.body, anchor="w", padx=12, font=self.font, background="white")
+            slot = len(self._rows)
+            row.bind("<ButtonPress-1>", self._on_press)
+            row.bind("<B1-Motion>", self._on_drag)
+            row.bind("<ButtonRelease-1>", lambda e, slot=slot: self._on_release(slot))
+            row.bind("<MouseWheel>", self._on_wheel)
+            row.bind("<Button-4>", lambda e: self.scroll(-3))
+            row.bind("<Button-5>", lambda e: self.scroll(3))
+            self._rows.append(row)
+        while len(self._rows) > needed:
+            self._rows.pop().destroy()
+        for slot, row in enumerate(self._rows):
+            row.place(x=0, y=slot * self.row_height, relwidth=1, height=self.row_height)
+        self.scroll_to(self.top)
+        self._refresh()
+
+    @perf.timed("ui.virtual_list.refresh")
+    def _refresh(self):
+        for slot, row in enumerate(self._rows):
+            index = self.top + slot
+            if index < len(self.items):
+                item = self.items[index]
+                selected = item is self.selected
+                row.configure(text=self.format_item(item),
+                              background="#cde3f7" if selected else "white")
+            else:
+                row.configure(text="", background="white")
+        total = len(self.items)
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.visible_count()) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    # --- Touch: tap selects, drag scrolls ---
+    def _on_press(self, event):
+        self._drag_y = event.y_root
+        self._dragged = False
+
+    def _on_drag(self, event):
+        if self._drag_y is None:
+            return
+        delta = self._drag_y - event.y_root
+        if abs(delta) >= DRAG_THRESHOLD:
+            self._dragged = True
+        rows = int(delta / self.row_height)
+        if rows:
+            self.scroll(rows)
+            self._drag_y -= rows * self.row_height
+
+    def _on_release(self, slot):
+        self._drag_y = None
+        if self._dragged:
+            return
+        index = self.top + slot
+        if index < len(self.items):
+            self.selected = self.items[index]
+            self._refresh()
+            if self.on_select:
+                self.on_select(self.selected)
+
+
+class PersonSelector(ttk.Frame):
+    """
+    Search box + VirtualList of people. Keystrokes are debounced; when the new query
+    extends the previous one, the previous matches are narrowed instead of searching everyone.
+    """
+
+    def __init__(self, parent, search_manager, on_select=None):
+        super().__init__(parent)
+        self.search_manager = search_manager
+        self._after_id = None
+        self._last_query = None
+        self._last_results = None
+
+        self.query_var = tk.StringVar()
+        entry = ttk.Entry(self, textvariable=self.query_var, font=("Segoe UI", 16))
+        entry.pack(fill="x", padx=8, pady=8)
+        self.query_var.trace_add("write", lambda *args: self._schedule())
+
+        self.list = VirtualList(self, format_item=search_manager.get_person_summary, on_select=on_select)
+        self.list.pack(fill="both", expand=True, padx=8, pady=(0, 8))
+        self.after_idle(self.apply_filter)
+
+    def _schedule(self):
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+        self._after_id = self.after(DEBOUNCE_MS, self.apply_filter)
+
+    @perf.timed("ui.person_selector.filter")
+    def apply_filter(self):
+        self._after_id = None
+        query = self.query_var.get().lower().strip()
+        if query == self._last_query:
+            return
+        if self._last_results is not None and self._last_query and query.startswith(self._last_query):
+            # Narrowing: every match of the longer query also matched the shorter one
+            results = [p for p in self._last_results if any(query in n for n in record_names(p))]
+        elif query:
+            results = self.search_manager.find_people_by_name(query)
+        else:
+            results = self.search_manager.people
+        self._last_query = query
+        self._last_results = results
+        self.list.set_items(results)
+
+    def invalidate(self):
+        """Forget cached results (e.g. after people were added) and re-run the filter."""
+        self._last_query = None
+        self._last_results = None
+        self.apply_filter()
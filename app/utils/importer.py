@@ -0,0 +1,446 @@
+"""
+Bulk importer for GEDCOM and large JSON / JSONL files.
+
+    python -m app.utils.importer family.ged
+    python -m app.utils.importer people.jsonl pets.json --batch-size 5000
+    python -m app.utils.importer export.jsonl --collection stories
+
+Input is streamed record by record and each store file is rewritten once,
+appending new records in bounded batches, so memory stays proportional to the
+id map rather than to the input. Run it while the kiosk is closed.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from app.utils.json_manager import JSONStore
+from app.utils.repository import STORES
+
+DEFAULT_BATCH_SIZE = 1000
+
+MONTHS = {m: i for i, m in enumerate(
+    ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"], 1)}
+
+GEDCOM_LINE = re.compile(r"^\s*(\d+)\s+(?:(@[^@]+@)\s+)?(\S+)(?:\s(.*))?$")
+
+
+# --- Output ---
+class BatchedStoreWriter:
+    """
+    Rewrites one store file as [existing records..., imported records...], flushing
+    imported records in batches of `batch_size`. The new file replaces the old one
+    atomically in close().
+    """
+
+    def __init__(self, collection, batch_size=DEFAULT_BATCH_SIZE):
+        filename, _ = STORES[collection]
+        self.collection = collection
+        self.batch_size = batch_size
+        existing = JSONStore(filename)  # also folds any leftover journal into the snapshot
+        self.file_path = existing.file_path
+        self.ids = {item.get("id") for item in existing.get_all() if item.get("id") is not None}
+        # GEDCOM xref -> (id, name) of people from earlier imports, so re-imports map onto them
+        self.gedcom_ids = {item["gedcomId"]: (item["id"], item.get("name")) for item in existing.get_all()
+                           if item.get("gedcomId") and item.get("id") is not None}
+        self.count = 0
+        self.skipped = 0
+        self._batch = []
+        self._first = True
+        self._tmp_path = self.file_path.with_name(self.file_path.name + ".import.tmp")
+        self._f = open(self._tmp_path, "w", encoding="utf-8")
+        self._f.write("[")
+        for item in existing.get_all():
+            self._write(item)
+
+    def _write(self, item):
+        # Same layout as JSONStore.save (json.dump(..., indent=2))
+        text = json.dumps(item, indent=2).replace("\n", "\n  ")
+        self._f.write(("\n  " if self._first else ",\n  ") + text)
+        self._first = False
+
+    def add(self, item):
+        item_id = item.get("id")
+        if item_id is not None and item_id in self.ids:
+            self.skipped += 1
+            return
+        if item_id is not None:
+            self.ids.add(item_id)
+        self._batch.append(item)
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        for item in self._batch:
+            self._write(item)
+        self.count += len(self._batch)
+        self._batch = []
+        self._f.flush()
+
+    def close(self):
+        self.flush()
+        self._f.write("\n]" if not self._first else "]")
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._f.close()
+        os.replace(self._tmp_path, self.file_path)
+
+    def abort(self):
+        self._f.close()
+        self._tmp_path.unlink()
+
+
+# --- JSON / JSONL input ---
+def iter_json_array(path, chunk_size=1 << 16):
+    """Yield the items of a (possibly huge) top-level JSON array without loading it whole."""
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf = f.read(chunk_size).lstrip()
+        if not buf:
+            return
+        if buf[0] != "[":
+            # A single object rather than an array
+            yield json.loads(buf + f.read())
+            return
+        buf = buf[1:]
+        eof = False
+        while True:
+            buf = buf.lstrip()
+            if buf.startswith(","):
+                buf = buf[1:].lstrip()
+            if buf.startswith("]"):
+                return
+            try:
+                item, end = decoder.raw_decode(buf)
+            except ValueError:
+                if eof:
+                    raise
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buf += chunk
+                continue
+            yield item
+            buf = buf[end:]
+            if len(buf) < chunk_size and not eof:
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buf += chunk
+
+
+def iter_jsonl(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def import_json(path, writers, collection=None):
+    """Stream a .json/.jsonl file into one store. Records whose id already exists are skipped."""
+    path = Path(path)
+    collection = collection or path.stem
+    if collection not in STORES:
+        raise ValueError(f"Can't tell which store '{path.name}' belongs to; pass --collection.")
+    records = iter_jsonl(path) if path.suffix == ".jsonl" else iter_json_array(path)
+    writer = writers.get(collection)
+    n = 0
+    for record in records:
+        writer.add(record)
+        n += 1
+    return n
+
+
+# --- GEDCOM input ---
+def iter_gedcom_records(path):
+    """Yield level-0 records as (xref, tag, value, [(level, tag, value), ...])."""
+    record = None
+    with open(path, "r", encoding="utf-8-sig", errors="replace") as f:
+        for line in f:
+            m = GEDCOM_LINE.match(line.rstrip("\r\n"))
+            if not m:
+                continue
+            level, xref, tag, value = int(m.group(1)), m.group(2), m.group(3).upper(), m.group(4) or ""
+            if level == 0:
+                if record is not None:
+                    yield record
+                record = (xref, tag, value, [])
+            elif record is not None:
+                record[3].append((level, tag, value))
+    if record is not None:
+        yield record
+
+
+def gedcom_date(value):
+    """'12 JUN 1995' -> ('1995-06-12', 1995); 'ABT 1995' -> (None, 1995)."""
+    parts = value.upper().split()
+    year = next((int(p) for p in reversed(parts) if p.isdigit() and len(p) >= 3), None)
+    if year is None:
+        return None, None
+    if len(parts) >= 3 and parts[-2] in MONTHS and parts[-3].isdigit():
+        return f"{year:04d}-{MONTHS[parts[-2]]:02d}-{int(parts[-3]):02d}", year
+    return None, year
+
+
+def gedcom_name(value):
+    """'John /Smith/' -> 'John Smith'."""
+    return " ".join(value.replace("/", " ").split())
+
+
+def _sub_value(lines, start, parent_level, tag):
+    """Value of the first `tag` directly under lines[start]."""
+    for level, t, value in lines[start + 1:]:
+        if level <= parent_level:
+            break
+        if level == parent_level + 1 and t == tag:
+            return value
+    return None
+
+
+def _text_with_continuations(lines, start, first_value):
+    text = first_value
+    for level, tag, value in lines[start + 1:]:
+        if level <= lines[start][0]:
+            break
+        if tag == "CONT":
+            text += "\n" + value
+        elif tag == "CONC":
+            text += value
+    return text
+
+
+def _slug(name):
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_") or "person"
+
+
+class GedcomImporter:
+    """
+    Streaming passes over a GEDCOM file. Pass one records only the id map
+    (INDI xref -> person id) and family links; pass two builds each person with
+    resolved `relations` and hands it to the people writer. Stories for shared NOTE
+    records are written by a third pass that reads the note text again, so no note
+    text is held in memory. People keep their xref as `gedcomId`, so importing the
+    same file again skips them instead of adding copies.
+    """
+
+    def __init__(self, path, writers):
+        self.path = path
+        self.writers = writers
+        self.ids = {}        # INDI xref -> person id
+        self.families = {}   # FAM xref -> {"spouses": [...], "children": [...], "divorced": bool}
+        self.pedigree = {}   # (INDI xref, FAM xref) -> "birth" / "adopted" / "step" ...
+        self.notes = {}      # NOTE xref -> has text
+        self.note_refs = {}  # NOTE xref -> [(story id, person id, person name)] waiting for the text
+
+    def run(self):
+        self._index_pass()
+        n = self._build_pass()
+        if self.note_refs:
+            self._notes_pass()
+        return n
+
+    def _index_pass(self):
+        people = self.writers.get("people")
+        taken = set(people.ids)
+        for xref, tag, value, lines in iter_gedcom_records(self.path):
+            if tag == "INDI":
+                name = next((gedcom_name(v) for _, t, v in lines if t == "NAME"), "") or xref.strip("@")
+                previous = people.gedcom_ids.get(xref.strip("@"))
+                full_name = next((gedcom_name(v) for level, t, v in lines if level == 1 and t == "NAME"), None)
+                if previous is not None and previous[1] == (full_name or previous[0]):
+                    # Imported before (xrefs are only unique per file, so the name must match too);
+                    # reuse the id so the writer skips the person and links resolve to the existing record
+                    pid = previous[0]
+                else:
+                    base = pid = _slug(name)
+                    n = 2
+                    while pid in taken:
+                        pid = f"{base}_{n}"
+                        n += 1
+                taken.add(pid)
+                self.ids[xref] = pid
+                for i, (level, t, v) in enumerate(lines):
+                    if level == 1 and t == "FAMC":
+                        pedi = (_sub_value(lines, i, 1, "PEDI") or "birth").lower()
+                        self.pedigree[(xref, v)] = pedi
+            elif tag == "FAM":
+                family = {"spouses": [], "children": [], "divorced": False}
+                for i, (level, t, v) in enumerate(lines):
+                    if level != 1:
+                        continue
+                    if t in ("HUSB", "WIFE"):
+                        family["spouses"].append(v)
+                    elif t == "CHIL":
+                        family["children"].append(v)
+                        # Some exporters put the child's link type under CHIL (_FREL/_MREL)
+                        rel = _sub_value(lines, i, 1, "_FREL") or _sub_value(lines, i, 1, "_MREL")
+                        if rel and (v, xref) not in self.pedigree:
+                            self.pedigree[(v, xref)] = rel.lower()
+                    elif t in ("DIV", "ANUL"):
+                        family["divorced"] = True
+                self.families[xref] = family
+            elif tag == "NOTE" and xref:
+                self.notes[xref] = bool(_text_with_continuations([(0, tag, value)] + lines, 0, value).strip())
+
+    def _link_kind(self, child_xref, fam_xref):
+        pedi = self.pedigree.get((child_xref, fam_xref), "birth")
+        if "adopt" in pedi:
+            return "adopted"
+        if "step" in pedi or "foster" in pedi:
+            return "step"
+        return "birth"
+
+    def _relations(self, xref, lines):
+        rel = {"parents": [], "stepParents": [], "children": [], "adoptedChildren": [], "spouse": None, "exSpouses": []}
+        spouses = []
+        for level, t, fam in lines:
+            if level != 1 or fam not in self.families:
+                continue
+            family = self.families[fam]
+            if t == "FAMC":
+                kind = self._link_kind(xref, fam)
+                parents = [self.ids[p] for p in family["spouses"] if p in self.ids]
+                if kind == "birth":
+                    rel["parents"].extend(parents)
+                elif kind == "step":
+                    rel["stepParents"].extend(parents)
+                # adoptive parents list the child under their adoptedChildren
+            elif t == "FAMS":
+                for child in family["children"]:
+                    if child not in self.ids:
+                        continue
+                    kind = self._link_kind(child, fam)
+                    if kind == "birth":
+                        rel["children"].append(self.ids[child])
+                    elif kind == "adopted":
+                        rel["adoptedChildren"].append(self.ids[child])
+                for s in family["spouses"]:
+                    if s != xref and s in self.ids:
+                        (rel["exSpouses"] if family["divorced"] else spouses).append(self.ids[s])
+        if spouses:
+            rel["spouse"] = spouses[0] if len(spouses) == 1 else spouses
+        return rel
+
+    def _build_pass(self):
+        people = self.writers.get("people")
+        stories = self.writers.get("stories")
+        n = 0
+        for xref, tag, value, lines in iter_gedcom_records(self.path):
+            if tag != "INDI" or xref not in self.ids:
+                continue
+            pid = self.ids[xref]
+            names = [gedcom_name(v) for level, t, v in lines if level == 1 and t == "NAME"]
+            person = {"id": pid, "name": names[0] if names else pid, "gedcomId": xref.strip("@")}
+            aliases = names[1:] + [v for level, t, v in lines if level == 1 and t in ("ALIA", "NICK") and "@" not in v]
+            if aliases:
+                person["aliases"] = aliases
+            notes = []  # inline text, or the xref of a shared NOTE record
+            for i, (level, t, v) in enumerate(lines):
+                if level != 1:
+                    continue
+                if t == "SEX":
+                    person["gender"] = {"M": "Male", "F": "Female"}.get(v.strip().upper(), v.strip())
+                elif t in ("BIRT", "DEAT"):
+                    iso, year = gedcom_date(_sub_value(lines, i, 1, "DATE") or "")
+                    prefix = "birth" if t == "BIRT" else "death"
+                    if year is not None:
+                        person[prefix + "Year"] = year
+                    if iso:
+                        person[prefix + "_date"] = iso
+                    if t == "DEAT":
+                        person["deceased"] = True
+                elif t == "NOTE":
+                    notes.append(v if v in self.notes else _text_with_continuations(lines, i, v))
+            person["relations"] = self._relations(xref, lines)
+            story_ids = []
+            for k, note in enumerate(notes, 1):
+                story_id = f"{pid}_note_{k}"
+                if note in self.notes:
+                    if self.notes[note]:
+                        self.note_refs.setdefault(note, []).append((story_id, pid, person["name"]))
+                        story_ids.append(story_id)
+                    continue
+                if not note.strip():
+                    continue
+                stories.add(_note_story(story_id, pid, person["name"], note))
+                story_ids.append(story_id)
+            if story_ids:
+                person["stories"] = story_ids
+            people.add(person)
+            n += 1
+        return n
+
+    def _notes_pass(self):
+        stories = self.writers.get("stories")
+        for xref, tag, value, lines in iter_gedcom_records(self.path):
+            if tag != "NOTE" or xref not in self.note_refs:
+                continue
+            text = _text_with_continuations([(0, tag, value)] + lines, 0, value)
+            for story_id, pid, name in self.note_refs.pop(xref):
+                stories.add(_note_story(story_id, pid, name, text))
+
+
+def _note_story(story_id, pid, name, text):
+    return {"id": story_id, "title": f"Notes on {name}", "text": text, "personId": pid, "source": "GEDCOM import"}
+
+
+# --- Driver ---
+class Writers:
+    """Opens a BatchedStoreWriter per collection on first use."""
+
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+        self.by_collection = {}
+
+    def get(self, collection):
+        writer = self.by_collection.get(collection)
+        if writer is None:
+            writer = self.by_collection[collection] = BatchedStoreWriter(collection, self.batch_size)
+        return writer
+
+    def close(self):
+        for writer in self.by_collection.values():
+            writer.close()
+
+    def abort(self):
+        for writer in self.by_collection.values():
+            writer.abort()
+
+
+def import_files(paths, collection=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Import every file; returns {collection: (written, skipped)} and the elapsed seconds."""
+    writers = Writers(batch_size)
+    start = time.perf_counter()
+    try:
+        for path in paths:
+            if Path(path).suffix.lower() == ".ged":
+                GedcomImporter(path, writers).run()
+            else:
+                import_json(path, writers, collection)
+    except Exception:
+        writers.abort()
+        raise
+    writers.close()
+    elapsed = time.perf_counter() - start
+    return {name: (w.count, w.skipped) for name, w in writers.by_collection.items()}, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import GEDCOM / JSON / JSONL into the kiosk data files.")
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--collection", choices=sorted(STORES), help="Store for JSON/JSONL files (default: file name)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    counts, elapsed = import_files(args.files, args.collection, args.batch_size)
+    total = sum(written for written, _ in counts.values())
+    for name, (written, skipped) in counts.items():
+        print(f"{name}: {written} imported, {skipped} skipped (already present)")
+    rate = total / elapsed if elapsed else 0
+    print(f"{total} records in {elapsed:.2f}s ({rate:,.0f} records/s)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
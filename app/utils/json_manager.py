@@ -1,48 +1,347 @@
 import json
+import os
+import threading
+from collections import deque
 from pathlib import Path
+from app.utils import perf
 import tkinter as tk
 from tkinter import simpledialog, messagebox
 
 DATA_DIR = Path("data")
 
+# Journal compaction thresholds (whichever is passed first)
+COMPACT_AFTER_ENTRIES = 500
+COMPACT_AFTER_BYTES = 1024 * 1024
+
 class JSONStore:
-    def __init__(self, filename):
-        self.file_path = DATA_DIR / filename
+    def __init__(self, filename, indexes=(), journal=False,
+                 compact_after_entries=COMPACT_AFTER_ENTRIES, compact_after_bytes=COMPACT_AFTER_BYTES,
+                 writer=None, data_dir=None, cache=None):
+        """
+        filename: JSON file inside DATA_DIR holding a list of records.
+        indexes: optional field names to keep secondary indexes on
+                 (e.g. ("ownerId",) for pets.json). List values are indexed per element.
+        journal: if True, mutations are appended to `<filename>.journal` instead of
+                 rewriting the whole file; the snapshot is compacted once the journal
+                 passes either threshold.
+        writer: optional SaveWorker; full saves are then queued to its background
+                thread (coalesced) instead of running on the caller's thread.
+        data_dir: directory to read/write instead of DATA_DIR.
+        cache: optional SnapshotCache; a warm start then unpickles the parsed records
+               instead of parsing the JSON.
+        """
+        self.file_path = Path(data_dir or DATA_DIR) / filename
+        self.journal_path = self.file_path.with_name(self.file_path.name + ".journal")
         self.data = []
+        self.index_fields = tuple(indexes)
+        self.journal = journal
+        self.compact_after_entries = compact_after_entries
+        self.compact_after_bytes = compact_after_bytes
+        self._journal_entries = 0
+        self.writer = writer
+        # Guards data/indexes against the writer thread serializing mid-mutation
+        self.lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._version = 0          # bumped on every mutation
+        self._written_version = 0  # version of the snapshot on disk
+        self._own_signatures = deque(maxlen=8)  # (mtime_ns, size) of snapshots this store wrote
+        self.cache = cache
         self._load()
 
+    @perf.timed("store.load")
     def _load(self):
-        if self.file_path.exists():
-            with open(self.file_path, "r", encoding="utf-8") as f:
-                self.data = json.load(f)
-        else:
-            self.data = []
+        # Stat before reading so an edit racing the read is still seen as a change later
+        self.loaded_signature = self.disk_signature()
+        data = None
+        if self.cache is not None:
+            data = self.cache.load(self.file_path.name, self.file_path)
+        if data is None:
+            data = self.read_disk()
+            if self.cache is not None and self.loaded_signature is not None:
+                self.cache.store(self.file_path.name, self.file_path, data)
+        self.data = data
+        self._rebuild_indexes()
+        self._replay_journal()
+
+    def read_disk(self):
+        """Parse the snapshot file as a list of records (doesn't touch the in-memory data)."""
+        if not self.file_path.exists():
+            return []
+        with open(self.file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            # A file holding a single record rather than a list of them
+            data = [data]
+        return data
+
+    def matches_disk(self):
+        """True if the in-memory data is exactly what the snapshot file holds."""
+        return self._journal_entries == 0 and self._written_version == self._version and not self.changed_on_disk()
+
+    def refresh_cache(self):
+        """Re-snapshot the records into the cache if the file changed since it was cached."""
+        if self.cache is None:
+            return
+        with self.lock:
+            if self.matches_disk() and not self.cache.is_fresh(self.file_path.name, self.file_path):
+                self.cache.store(self.file_path.name, self.file_path, self.data)
+
+    # --- External changes ---
+    def disk_signature(self):
+        """(mtime_ns, size) of the snapshot file, or None if it doesn't exist."""
+        try:
+            st = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def changed_on_disk(self):
+        """True if someone other than this store wrote the file since it was loaded/saved."""
+        signature = self.disk_signature()
+        return signature != self.loaded_signature and signature not in self._own_signatures
+
+    @staticmethod
+    def _diff_key(item):
+        item_id = item.get("id")
+        # Records without ids can only be matched by content
+        return ("id", item_id) if item_id is not None else ("content", json.dumps(item, sort_keys=True))
 
+    def diff(self, records):
+        """
+        Compare `records` (e.g. a fresh read_disk()) with the in-memory data by id.
+        Returns (added, changed, removed): new records, [(current item, new record)], current items.
+        """
+        with self.lock:
+            current = {}
+            for item in self.data:
+                current.setdefault(self._diff_key(item), item)
+        added, changed = [], []
+        seen = set()
+        for record in records:
+            key = self._diff_key(record)
+            if key in seen:
+                continue
+            seen.add(key)
+            item = current.get(key)
+            if item is None:
+                added.append(record)
+            elif item != record:
+                changed.append((item, record))
+        removed = [item for key, item in current.items() if key not in seen]
+        return added, changed, removed
+
+    def apply_diff(self, added, changed, removed, signature=None):
+        """Apply an external diff in memory without writing the file back. False if it was skipped."""
+        with self.lock:
+            if signature is not None and signature in self._own_signatures:
+                return False  # read back our own save; newer in-memory edits must not be reverted
+            if removed:
+                gone = {id(item) for item in removed}
+                for item in removed:
+                    self._unindex_item(item)
+                self.data[:] = [item for item in self.data if id(item) not in gone]
+            for item, record in changed:
+                # Replace the contents in place so references held elsewhere stay valid
+                self._unindex_item(item)
+                item.clear()
+                item.update(record)
+                self._index_item(item)
+            for record in added:
+                self._apply_add(record)
+            if signature is not None:
+                self.loaded_signature = signature
+            return True
+
+    @perf.timed("store.save")
     def save(self):
-        with open(self.file_path, "w", encoding="utf-8") as f:
-            json.dump(self.data, f, indent=2)
+        """Write the full snapshot atomically (temp file + rename) and clear the journal."""
+        # Copy each record (not just the list) so in-place updates can't race the
+        # serializing, which runs without the lock so edits on the Tk thread don't wait
+        with self.lock:
+            version = self._version
+            records = [dict(item) for item in self.data]
+        text = json.dumps(records, indent=2)
+        if not self.journal:
+            self._write_snapshot(text, version)
+            return
+        with self.lock:
+            if self._version != version:
+                # Entries journaled since the copy would be lost when the journal is
+                # cleared; this time serialize the current data under the lock
+                version = self._version
+                text = json.dumps(self.data, indent=2)
+            self._write_snapshot(text, version)
+
+    def _write_snapshot(self, text, version):
+        with self._write_lock:
+            if version < self._written_version:
+                return  # a newer snapshot already made it to disk
+            tmp_path = self.file_path.with_name(self.file_path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            # The rename keeps mtime and size, so the signature is known before the file
+            # appears; recording it first means a watcher poll racing this save can't
+            # mistake it for an external edit
+            st = os.stat(tmp_path)
+            signature = (st.st_mtime_ns, st.st_size)
+            self._own_signatures.append(signature)
+            os.replace(tmp_path, self.file_path)
+            self._written_version = version
+            self.loaded_signature = signature
+            if self.journal_path.exists():
+                self.journal_path.unlink()
+            self._journal_entries = 0
+
+    def _request_save(self):
+        if self.writer is not None:
+            self.writer.schedule(self)
+        else:
+            self.save()
+
+    # --- Journal ---
+    def _replay_journal(self):
+        if not self.journal_path.exists():
+            return
+        good_bytes = 0
+        with open(self.journal_path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # torn final line from a crash mid-append; later entries can't exist
+                self._apply(entry)
+                self._journal_entries += 1
+                good_bytes += len(line)
+        if good_bytes < self.journal_path.stat().st_size:
+            # Drop the torn tail so new appends aren't hidden behind it
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(good_bytes)
+        if not self.journal:
+            # Opened without journaling: fold the leftovers into the snapshot
+            self.save()
+
+    def _apply(self, entry):
+        op = entry["op"]
+        if op == "add":
+            self._apply_add(entry["item"])
+        elif op == "update":
+            item = self.get_by_id(entry["id"])
+            if item is not None:
+                self._apply_update(item, entry["updates"])
+        elif op == "delete":
+            self._apply_delete(entry["id"])
+
+    def _commit(self, entry):
+        """Persist one mutation: a journal append in journal mode, a full save otherwise."""
+        self._version += 1
+        if not self.journal:
+            self._request_save()
+            return
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+            size = f.tell()
+        self._journal_entries += 1
+        if self._journal_entries >= self.compact_after_entries or size >= self.compact_after_bytes:
+            self._request_save()
 
+    def compact(self):
+        """Fold the journal into the snapshot file."""
+        self.save()
+
+    # --- Indexes ---
+    def _rebuild_indexes(self):
+        self._by_id = {}
+        self._indexes = {field: {} for field in self.index_fields}
+        for item in self.data:
+            self._index_item(item)
+
+    @staticmethod
+    def _index_values(item, field):
+        value = item.get(field)
+        if value is None:
+            return ()
+        if isinstance(value, list):
+            return [v for v in value if v is not None]
+        return (value,)
+
+    def _index_item(self, item):
+        item_id = item.get("id")
+        if item_id is not None:
+            # Keep the first record for duplicate ids, like the old linear scan did
+            self._by_id.setdefault(item_id, item)
+        for field, index in self._indexes.items():
+            for value in self._index_values(item, field):
+                index.setdefault(value, {})[id(item)] = item
+
+    def _unindex_item(self, item):
+        item_id = item.get("id")
+        if item_id is not None and self._by_id.get(item_id) is item:
+            del self._by_id[item_id]
+        for field, index in self._indexes.items():
+            for value in self._index_values(item, field):
+                bucket = index.get(value)
+                if bucket is None:
+                    continue
+                bucket.pop(id(item), None)
+                if not bucket:
+                    del index[value]
+
+    @perf.timed("store.find_by")
+    def find_by(self, field, value):
+        """Return all records whose indexed `field` equals (or, for lists, contains) `value`."""
+        if field not in self._indexes:
+            raise KeyError(f"Field '{field}' is not indexed on {self.file_path.name}.")
+        return list(self._indexes[field].get(value, {}).values())
+
+    # --- Record access ---
     def get_all(self):
         return self.data
 
     def get_by_id(self, item_id):
-        return next((item for item in self.data if item.get("id") == item_id), None)
+        return self._by_id.get(item_id)
 
+    @perf.timed("store.add")
     def add(self, item):
-        if self.get_by_id(item["id"]):
-            raise ValueError(f"Item with ID {item['id']} already exists.")
-        self.data.append(item)
-        self.save()
+        with self.lock:
+            if self.get_by_id(item["id"]):
+                raise ValueError(f"Item with ID {item['id']} already exists.")
+            self._apply_add(item)
+            self._commit({"op": "add", "item": item})
 
+    @perf.timed("store.update")
     def update(self, item_id, updates):
-        item = self.get_by_id(item_id)
-        if not item:
-            raise ValueError(f"Item with ID {item_id} not found.")
-        item.update(updates)
-        self.save()
+        with self.lock:
+            item = self.get_by_id(item_id)
+            if not item:
+                raise ValueError(f"Item with ID {item_id} not found.")
+            self._apply_update(item, updates)
+            self._commit({"op": "update", "id": item_id, "updates": updates})
 
+    @perf.timed("store.delete")
     def delete(self, item_id):
-        self.data = [item for item in self.data if item.get("id") != item_id]
-        self.save()
+        with self.lock:
+            if item_id not in self._by_id:
+                return
+            self._apply_delete(item_id)
+            self._commit({"op": "delete", "id": item_id})
 
+    # --- In-memory mutations (shared by the public API and journal replay) ---
+    def _apply_add(self, item):
+        self.data.append(item)
+        self._index_item(item)
+
+    def _apply_update(self, item, updates):
+        self._unindex_item(item)
+        item.update(updates)
+        self._index_item(item)
 
+    def _apply_delete(self, item_id):
+        removed = [item for item in self.data if item.get("id") == item_id]
+        # In place, so lists shared with SearchManager stay current
+        self.data[:] = [item for item in self.data if item.get("id") != item_id]
+        for item in removed:
+            self._unindex_item(item)
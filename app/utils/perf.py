@@ -0,0 +1,164 @@
+"""
+Lightweight hot-path instrumentation.
+
+    from app.utils import perf
+
+    @perf.timed("search.find_people_by_name")
+    def find_people_by_name(...): ...
+
+    with perf.measure("ui.update_view"):
+        ...
+
+Recording is off unless KIOSK_PERF=1 or perf.enable() is called; while off, a
+timed call costs one flag check. Latencies go into log-scale histograms.
+"""
+import functools
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Histogram buckets: 4 per doubling, starting at 1 microsecond
+BUCKETS_PER_DOUBLING = 4
+MIN_SECONDS = 1e-6
+
+_enabled = os.environ.get("KIOSK_PERF") == "1"
+_metrics = {}
+_lock = threading.Lock()
+
+
+class Metric:
+    __slots__ = ("name", "count", "total", "max", "buckets")
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = {}
+
+    def record(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        b = 0 if seconds <= MIN_SECONDS else int(math.log2(seconds / MIN_SECONDS) * BUCKETS_PER_DOUBLING) + 1
+        self.buckets[b] = self.buckets.get(b, 0) + 1
+
+    def percentile(self, p):
+        """Approximate p-th percentile in seconds (upper edge of the bucket)."""
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * p / 100)
+        seen = 0
+        for b in sorted(self.buckets):
+            seen += self.buckets[b]
+            if seen >= rank:
+                return min(self.max, MIN_SECONDS * 2 ** (b / BUCKETS_PER_DOUBLING))
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 4) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 4),
+            "p95_ms": round(self.percentile(95) * 1000, 4),
+            "p99_ms": round(self.percentile(99) * 1000, 4),
+            "max_ms": round(self.max * 1000, 4),
+        }
+
+
+def enabled():
+    return _enabled
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = on
+
+
+def record(name, seconds):
+    with _lock:
+        metric = _metrics.get(name)
+        if metric is None:
+            metric = _metrics[name] = Metric(name)
+        metric.record(seconds)
+
+
+def timed(name):
+    """Decorator recording the latency of every call under `name` (when enabled)."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def measure(name):
+    """Context-manager form of timed()."""
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def snapshot():
+    """{metric name: summary dict}, sorted by name."""
+    with _lock:
+        return {name: _metrics[name].summary() for name in sorted(_metrics)}
+
+
+def reset():
+    with _lock:
+        _metrics.clear()
+
+
+def dump(path):
+    """Write the current summaries to `path` as JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "metrics": snapshot()}, f, indent=2)
+    return path
+
+
+class EventLoopMonitor:
+    """
+    Samples Tk event-loop latency: schedules a tick every `interval_ms` and records
+    how late it actually ran as "tk.event_loop_lag".
+    """
+
+    def __init__(self, root, interval_ms=100):
+        self.root = root
+        self.interval_ms = interval_ms
+        self._after_id = None
+        self._expected = None
+
+    def start(self):
+        if self._after_id is None:
+            self._expected = time.perf_counter() + self.interval_ms / 1000
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _tick(self):
+        now = time.perf_counter()
+        if _enabled:
+            record("tk.event_loop_lag", max(0.0, now - self._expected))
+        self._expected = now + self.interval_ms / 1000
+        self._after_id = self.root.after(self.interval_ms, self._tick)
@@ -0,0 +1,322 @@
+"""
+Client side of the query server (app/utils/query_server.py).
+
+RemoteRepository / RemoteSearchManager stand in for DataRepository / SearchManager
+when a kiosk screen reads from a shared data host instead of its own files. Requests
+go over a small pool of keep-alive connections; answers are cached by ETag, so
+repeated queries cost a bodyless 304 until the server's data changes.
+"""
+import gzip
+import http.client
+import json
+import queue
+import threading
+from collections import OrderedDict
+from urllib.parse import quote, urlencode, urlsplit
+
+from app.logic.search_manager import SearchManager
+from app.utils.watcher import APPLY_POLL_MS, POLL_SECONDS
+
+COLLECTIONS = ("people", "pets", "stories", "photos", "quizzes")
+
+
+class QueryClient:
+    """
+    GETs JSON from a query server over up to `pool_size` pooled connections.
+    Raises ValueError for a rejected query, LookupError for a missing record and
+    ConnectionError if the server can't be reached.
+    """
+
+    def __init__(self, base_url, pool_size=4, timeout=5.0, cache_entries=256):
+        parts = urlsplit(base_url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError(f"Expected an http:// server URL, got {base_url!r}")
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.cache_entries = cache_entries
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        self._cache = OrderedDict()   # url -> (etag, parsed body)
+        self._cache_lock = threading.Lock()
+        self.stats = {"requests": 0, "not_modified": 0}
+
+    def _connection(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, conn):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def get(self, path, **params):
+        """Parsed JSON for `path` (e.g. "/api/people/search") with query `params`."""
+        params = {k: v for k, v in params.items() if v is not None}
+        url = self.prefix + path + ("?" + urlencode(params, doseq=True) if params else "")
+        with self._cache_lock:
+            cached = self._cache.get(url)
+        headers = {"Accept-Encoding": "gzip"}
+        if cached is not None:
+            headers["If-None-Match"] = cached[0]
+
+        status, response_headers, body = self._request(url, headers)
+        self.stats["requests"] += 1
+        if status == 304 and cached is not None:
+            self.stats["not_modified"] += 1
+            return cached[1]
+        if response_headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        payload = json.loads(body) if body else None
+        if status == 404:
+            raise LookupError((payload or {}).get("error", url))
+        if status == 400:
+            raise ValueError((payload or {}).get("error", url))
+        if status != 200:
+            raise ConnectionError(f"Query server answered {status} for {url}")
+
+        etag = response_headers.get("ETag")
+        if etag:
+            with self._cache_lock:
+                self._cache[url] = (etag, payload)
+                self._cache.move_to_end(url)
+                while len(self._cache) > self.cache_entries:
+                    self._cache.popitem(last=False)
+        return payload
+
+    def _request(self, url, headers):
+        # A pooled connection may have been closed by the server; retry once on a fresh one
+        for attempt in range(2):
+            conn = self._connection() if attempt == 0 else http.client.HTTPConnection(
+                self.host, self.port, timeout=self.timeout)
+            try:
+                conn.request("GET", url, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError) as e:
+                conn.close()
+                if attempt:
+                    raise ConnectionError(f"Query server unreachable: {e}") from e
+                continue
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            return response.status, {k: v for k, v in response.getheaders()}, body
+
+
+class RemoteSearchManager:
+    """The read side of SearchManager, answered by a query server."""
+
+    # Pure formatting, no data access
+    get_person_summary = SearchManager.get_person_summary
+
+    def __init__(self, client):
+        self.client = client
+        self._collections = {}  # name -> records, kept until the server's data version moves
+
+    # Whole collections (people for the selector's empty query; pets/quizzes for the quiz engine)
+    def _collection(self, name):
+        records = self._collections.get(name)
+        if records is None:
+            records = self._collections[name] = self.client.get(f"/api/{name}")
+        return records
+
+    @property
+    def people(self):
+        return self._collection("people")
+
+    @property
+    def pets(self):
+        return self._collection("pets")
+
+    @property
+    def stories(self):
+        return self._collection("stories")
+
+    @property
+    def photos(self):
+        return self._collection("photos")
+
+    @property
+    def quizzes(self):
+        return self._collection("quizzes")
+
+    def download(self):
+        """Fetch fresh copies of the collections held so far (blocking; any thread). See install()."""
+        return {name: self.client.get(f"/api/{name}") for name in list(self._collections)}
+
+    def install(self, collections):
+        """Replace the held collections with download()'s result; others are fetched on next use."""
+        self._collections = dict(collections)
+
+    def find_people_by_name(self, name, exact=False):
+        return self.client.get("/api/people/search", q=name, exact=int(exact))
+
+    def person_exists(self, name):
+        return len(self.find_people_by_name(name)) > 0
+
+    def resolve_names(self, names, limit=5):
+        return self.client.get("/api/resolve", name=list(names), limit=limit)
+
+    def get_relations(self, person_id):
+        return self.client.get(f"/api/people/{quote(person_id, safe='')}/relations")
+
+    def get_relationship(self, person_a, person_b):
+        result = self.client.get("/api/relationship", a=person_a, b=person_b)
+        return result["label"], result["path"]
+
+    def find_pets_by_name(self, name, exact=False):
+        return self.client.get("/api/pets/search", q=name, exact=int(exact))
+
+    def pet_exists(self, name):
+        return len(self.find_pets_by_name(name)) > 0
+
+    def find_photos_with_people(self, ids, mode="all", start_date=None, end_date=None, location=None):
+        return self.client.get("/api/photos/search", tags=",".join(ids), mode=mode, start=start_date,
+                               end=end_date, location=location)
+
+    def find_quizzes_by_name(self, name, exact=False):
+        return self.client.get("/api/quizzes/search", q=name, exact=int(exact))
+
+    def find_quizzes_by_tag(self, tags, mode="any"):
+        if isinstance(tags, str):
+            tags = [tags]
+        return self.client.get("/api/quizzes/search", tags=",".join(tags), mode=mode)
+
+    def search_text(self, query, collections=("stories", "photos"), mode="all", limit=20):
+        return self.client.get("/api/text", q=query, collections=",".join(collections), mode=mode, limit=limit)
+
+    def search_stories(self, query, mode="all", limit=20):
+        return self.search_text(query, collections=("stories",), mode=mode, limit=limit)
+
+
+class RemoteRepository:
+    """
+    Read-only DataRepository stand-in backed by a query server.
+    There are no per-record events: when the server's data version moves, the held
+    collections are re-downloaded and (collection, "reload", None) is published for
+    every collection. ServerPoller does the network part off the Tk thread.
+    """
+
+    def __init__(self, base_url, pool_size=4, timeout=5.0):
+        self.base_url = base_url
+        self.client = QueryClient(base_url, pool_size=pool_size, timeout=timeout)
+        self.search_manager = RemoteSearchManager(self.client)
+        self.version = None
+        self._checked_version = None
+        self._subscribers = []
+
+    def open_stores(self):
+        return []
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def fetch_changes(self):
+        """
+        (version, collections) if the server's data moved since the last check, else None.
+        Blocking network calls only, no events; safe on a worker thread.
+        """
+        version = self.client.get("/api/version")["version"]
+        previous, self._checked_version = self._checked_version, version
+        if previous is None or version == previous:
+            return None
+        return version, self.search_manager.download()
+
+    def apply_changes(self, version, collections):
+        """Install fetch_changes()'s result and publish reload events (on the Tk thread)."""
+        self.version = version
+        self.search_manager.install(collections)
+        for collection in COLLECTIONS:
+            for callback in list(self._subscribers):
+                callback(collection, "reload", None)
+
+    def poll(self):
+        """fetch_changes() and apply_changes() in one blocking call; True if the data changed."""
+        changes = self.fetch_changes()
+        if changes is not None:
+            self.apply_changes(*changes)
+        return changes is not None
+
+    def add(self, collection, item):
+        raise PermissionError(f"{self.base_url} is a read-only query server")
+
+    def update(self, collection, item_id, updates):
+        raise PermissionError(f"{self.base_url} is a read-only query server")
+
+    def delete(self, collection, item_id):
+        raise PermissionError(f"{self.base_url} is a read-only query server")
+
+    def flush(self, timeout=None):
+        return True
+
+    def close(self):
+        self.client.close()
+
+    def save_errors(self):
+        return []
+
+
+class ServerPoller:
+    """
+    Watches a RemoteRepository's server for new data without blocking the Tk loop,
+    like DataWatcher does for local files: a background thread checks the data
+    version (and downloads changed collections); results are applied on the Tk
+    thread via after().
+    """
+
+    def __init__(self, repository, root, interval=POLL_SECONDS):
+        self.repository = repository
+        self.root = root
+        self.interval = interval
+        self._results = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+        self._after_id = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="server-poller", daemon=True)
+            self._thread.start()
+            self._after_id = self.root.after(APPLY_POLL_MS, self._apply_pending)
+
+    def stop(self):
+        self._stop.set()
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    # --- Background thread ---
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                changes = self.repository.fetch_changes()
+            except ConnectionError:
+                continue  # server restarting or unreachable; keep showing what we have
+            if changes is not None:
+                self._results.put(changes)
+
+    # --- Tk thread ---
+    def _apply_pending(self):
+        try:
+            while True:
+                self.repository.apply_changes(*self._results.get_nowait())
+        except queue.Empty:
+            pass
+        if not self._stop.is_set():
+            self._after_id = self.root.after(APPLY_POLL_MS, self._apply_pending)
@@ -0,0 +1,285 @@
+"""
+Read-only HTTP/JSON query server, so several kiosk screens can share one data host.
+
+    python -m app.utils.query_server --port 8765 [--host 0.0.0.0] [--data-dir DIR]
+
+One process loads the stores and builds the search indexes once; every screen then
+queries it (see app/utils/query_client.py, or set KIOSK_SERVER_URL for the app).
+Responses are cached per URL and carry an ETag tied to the repository's data version,
+so unchanged answers revalidate with a bodyless 304; larger bodies are gzipped.
+Edits made to the data files are picked up by a DataWatcher thread.
+"""
+import argparse
+import gzip
+import json
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from app.utils.repository import STORES, DataRepository
+from app.utils.watcher import DataWatcher, POLL_SECONDS
+
+DEFAULT_PORT = 8765
+CACHE_ENTRIES = 1024
+GZIP_MIN_BYTES = 1024
+
+
+class QueryServer:
+    """
+    Serves SearchManager queries from one warm DataRepository.
+    Queries and external-change updates are serialized by `lock` (the indexes are
+    not thread-safe); cached responses are served without taking it.
+    """
+
+    def __init__(self, repository, host="127.0.0.1", port=DEFAULT_PORT, watch=True, verbose=False):
+        self.repository = repository
+        self.verbose = verbose
+        self.lock = threading.RLock()
+        self.boot = format(int(time.time()), "x")  # keeps ETags from colliding across restarts
+        self._cache = OrderedDict()   # url -> (etag, body, gzipped body or None)
+        self._cache_lock = threading.Lock()
+        self._routes = [(re.compile(pattern + "$"), handler) for pattern, handler in self._route_table()]
+        self.watcher = DataWatcher(repository, root=None) if watch else None
+        self._stop = threading.Event()
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.query_server = self
+
+    @property
+    def address(self):
+        host, port = self.httpd.server_address[:2]
+        return host, port
+
+    # --- Lifecycle ---
+    def warm(self):
+        """Load every store and build the indexes before the first request."""
+        with self.lock:
+            sm = self.repository.search_manager
+            sm.get_name_resolver()
+            sm.get_tag_index()
+            sm.get_relationship_graph()
+            sm.get_quiz_tag_index()
+            for collection in ("stories", "photos"):
+                sm.get_text_index(collection)
+                sm.get_date_index(getattr(sm, collection))
+
+    def serve_forever(self):
+        if self.watcher is not None:
+            threading.Thread(target=self._watch, name="query-server-watcher", daemon=True).start()
+        self.httpd.serve_forever()
+
+    def start(self):
+        """serve_forever() on a background thread; returns the thread."""
+        thread = threading.Thread(target=self.serve_forever, name="query-server", daemon=True)
+        thread.start()
+        return thread
+
+    def shutdown(self):
+        self._stop.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _watch(self):
+        while not self._stop.wait(POLL_SECONDS):
+            self.watcher.check_once()
+            with self.lock:
+                self.watcher.apply_pending()
+
+    # --- Responses ---
+    def etag(self, url):
+        return f'"{self.boot}-{self.repository.version}-{zlib.crc32(url.encode()):08x}"'
+
+    def respond(self, url):
+        """(status, etag, body, gzipped body or None) for a GET of `url`."""
+        etag = self.etag(url)
+        with self._cache_lock:
+            hit = self._cache.get(url)
+            if hit is not None and hit[0] == etag:
+                self._cache.move_to_end(url)
+                return (200,) + hit
+        with self.lock:
+            # Tag with the version the answer is computed from (updates also take the lock)
+            etag = self.etag(url)
+            status, payload = self._dispatch(url)
+            # The payload holds live records and memoized results; encode before updates may touch them
+            body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        packed = gzip.compress(body, compresslevel=5) if len(body) >= GZIP_MIN_BYTES else None
+        if status != 200:
+            return status, None, body, packed
+        with self._cache_lock:
+            self._cache[url] = (etag, body, packed)
+            self._cache.move_to_end(url)
+            while len(self._cache) > CACHE_ENTRIES:
+                self._cache.popitem(last=False)
+        return status, etag, body, packed
+
+    def _dispatch(self, url):
+        parts = urlsplit(url)
+        params = {k: v if len(v) > 1 else v[0] for k, v in parse_qs(parts.query).items()}
+        for pattern, handler in self._routes:
+            match = pattern.match(parts.path)
+            if match:
+                try:
+                    # Ids in the path are percent-encoded (they may hold spaces, slashes, non-ASCII)
+                    return 200, handler(params, *(unquote(g) for g in match.groups()))
+                except LookupError as e:
+                    return 404, {"error": str(e)}
+                except (ValueError, TypeError) as e:
+                    return 400, {"error": str(e)}
+        return 404, {"error": f"no such endpoint: {parts.path}"}
+
+    # --- Endpoints ---
+    def _route_table(self):
+        collections = "|".join(STORES)
+        return [
+            (r"/api/version", self.get_version),
+            (rf"/api/({collections})", self.get_collection),
+            (r"/api/people/search", self.search_people),
+            (r"/api/people/([^/]+)/relations", self.get_relations),
+            (r"/api/pets/search", self.search_pets),
+            (r"/api/photos/search", self.search_photos),
+            (r"/api/quizzes/search", self.search_quizzes),
+            (r"/api/relationship", self.get_relationship),
+            (r"/api/resolve", self.resolve_names),
+            (r"/api/text", self.search_text),
+            (rf"/api/({collections})/([^/]+)", self.get_record),
+        ]
+
+    @property
+    def sm(self):
+        return self.repository.search_manager
+
+    def get_version(self, params):
+        return {"version": self.repository.version}
+
+    def get_collection(self, params, collection):
+        return getattr(self.sm, collection)
+
+    def get_record(self, params, collection, record_id):
+        record = self.repository.store(collection).get_by_id(record_id)
+        if record is None:
+            raise LookupError(f"no {collection} record {record_id!r}")
+        return record
+
+    def search_people(self, params):
+        return self.sm.find_people_by_name(_required(params, "q"), exact=_flag(params, "exact"))
+
+    def search_pets(self, params):
+        return self.sm.find_pets_by_name(_required(params, "q"), exact=_flag(params, "exact"))
+
+    def get_relations(self, params, person_id):
+        return self.sm.get_relations(person_id)
+
+    def get_relationship(self, params):
+        label, path = self.sm.get_relationship(_required(params, "a"), _required(params, "b"))
+        return {"label": label, "path": path}
+
+    def resolve_names(self, params):
+        names = _as_list(_required(params, "name"))
+        return self.sm.resolve_names(names, limit=int(params.get("limit", 5)))
+
+    def search_photos(self, params):
+        return self.sm.find_photos_with_people(
+            _as_list(_required(params, "tags"), split=True), mode=params.get("mode", "all"),
+            start_date=params.get("start"), end_date=params.get("end"), location=params.get("location"))
+
+    def search_quizzes(self, params):
+        if "tags" in params:
+            return self.sm.find_quizzes_by_tag(_as_list(params["tags"], split=True), mode=params.get("mode", "any"))
+        return self.sm.find_quizzes_by_name(_required(params, "q"), exact=_flag(params, "exact"))
+
+    def search_text(self, params):
+        collections = _as_list(params.get("collections", "stories,photos"), split=True)
+        if any(c not in ("stories", "photos") for c in collections):
+            raise ValueError("collections must be stories and/or photos")
+        return self.sm.search_text(_required(params, "q"), collections=collections,
+                                   mode=params.get("mode", "all"), limit=int(params.get("limit", 20)))
+
+
+def _required(params, name):
+    if name not in params:
+        raise ValueError(f"missing query parameter {name!r}")
+    return params[name]
+
+
+def _flag(params, name):
+    return str(params.get(name, "")).lower() in ("1", "true", "yes")
+
+
+def _as_list(value, split=False):
+    values = value if isinstance(value, list) else [value]
+    if split:
+        values = [v.strip() for item in values for v in item.split(",") if v.strip()]
+    return values
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so clients can pool connections
+    server_version = "FamilyTreeKiosk"
+    # Send headers and body as one write without Nagle delays (otherwise every
+    # keep-alive response waits out the client's delayed ACK, ~40 ms)
+    disable_nagle_algorithm = True
+    wbufsize = 64 * 1024
+
+    def do_GET(self):
+        server = self.server.query_server
+        etag = server.etag(self.path)
+        if etag in self.headers.get("If-None-Match", ""):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        status, etag, body, packed = server.respond(self.path)
+        if packed is not None and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = packed
+            encoding = "gzip"
+        else:
+            encoding = None
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.query_server.verbose:
+            super().log_message(format, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve kiosk search queries over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--data-dir", type=Path, default=None)
+    parser.add_argument("--no-watch", action="store_true", help="don't pick up edits to the data files")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    repository = DataRepository(data_dir=args.data_dir, async_saves=False)
+    server = QueryServer(repository, host=args.host, port=args.port, watch=not args.no_watch, verbose=args.verbose)
+    server.warm()
+    host, port = server.address
+    print(f"Serving on http://{host}:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        repository.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import os
+import re
+
+from app.logic.search_manager import SearchManager
+from app.utils.save_worker import SaveWorker
+from app.utils.snapshot_cache import SnapshotCache
+from app.utils.storage import open_store
+
+# Base URL of a shared query server (app/utils/query_server.py); unset = local stores
+SERVER_URL = os.environ.get("KIOSK_SERVER_URL")
+
+# Indexes snapshotted on close() and reloaded on the next start
+CACHED_INDEXES = ("people_names", "pets_names", "people_resolver", "photos_tags", "photos_dates", "stories_dates",
+                  "stories_text", "photos_text")
+
+# collection name -> (file in DATA_DIR, secondary index fields)
+STORES = {
+    "people": ("people.json", ()),
+    "photos": ("photos.json", ("tags",)),
+    "pets": ("pets.json", ("ownerId",)),
+    "stories": ("stories.json", ("personId",)),
+    "quizzes": ("quizzes.json", ()),
+}
+
+# collection name -> id base for records added with an empty label
+ID_DEFAULTS = {"people": "person", "photos": "photo", "pets": "pet", "stories": "story", "quizzes": "quiz"}
+
+
+def open_repository(server_url=None, **kwargs):
+    """A RemoteRepository for `server_url` (or KIOSK_SERVER_URL) if set, else a local DataRepository."""
+    server_url = server_url or SERVER_URL
+    if server_url:
+        from app.utils.query_client import RemoteRepository
+        return RemoteRepository(server_url)
+    return DataRepository(**kwargs)
+
+
+class DataRepository:
+    """
+    One shared home for the kiosk's stores. Each store is opened on first use and
+    every tab reads and writes through the same objects, so data is parsed once and
+    an edit in one tab is visible in all of them. Mutations publish change events
+    (collection, op, item) to subscribers; the shared SearchManager is one of them.
+    With async_saves, writes go through one background SaveWorker; call flush() on shutdown.
+    With snapshot_cache, parsed records and search indexes are pickled so warm starts
+    skip JSON parsing and index building.
+    """
+
+    def __init__(self, backend=None, stores=STORES, async_saves=True, data_dir=None, snapshot_cache=True):
+        self.backend = backend
+        self.data_dir = data_dir
+        self.cache = SnapshotCache(data_dir=data_dir) if snapshot_cache else None
+        self.store_config = dict(stores)
+        self.writer = SaveWorker() if async_saves else None
+        self._stores = {}
+        self._search_manager = None
+        self._subscribers = []
+        self.version = 0  # bumped on every published change (ETags for the query server)
+
+    def store(self, collection):
+        """The store for `collection`, opened on first access."""
+        store = self._stores.get(collection)
+        if store is None:
+            filename, indexes = self.store_config[collection]
+            store = self._stores[collection] = open_store(filename, backend=self.backend, indexes=indexes,
+                                                          writer=self.writer, data_dir=self.data_dir,
+                                                          cache=self.cache)
+        return store
+
+    def open_stores(self):
+        """(collection, store) pairs for the stores opened so far."""
+        return list(self._stores.items())
+
+    @property
+    def search_manager(self):
+        """Shared SearchManager over all stores, built on first use."""
+        if self._search_manager is None:
+            # Collections load on first use; on SQLite, name/date/owner lookups never load them
+            self._search_manager = SearchManager(
+                stores={collection: self.store(collection) for collection in self.store_config})
+            self._load_cached_indexes()
+            self._search_manager.enable_name_index()
+            self.subscribe(self._search_manager.record_changed)
+        return self._search_manager
+
+    # --- Persistence ---
+    def flush(self, timeout=None):
+        """Wait for queued background saves to reach disk."""
+        if self.writer is not None:
+            return self.writer.flush(timeout)
+        return True
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.save_snapshots()
+
+    # --- Snapshot cache ---
+    def _cacheable(self, collection):
+        store = self._stores.get(collection)
+        return self.cache is not None and hasattr(store, "matches_disk") and store.matches_disk()
+
+    def _load_cached_indexes(self):
+        for name in CACHED_INDEXES:
+            collection = name.split("_")[0]
+            if not self._cacheable(collection):
+                continue
+            records = self.store(collection).get_all()
+            index = self.cache.load(f"index_{name}", self.store(collection).file_path, shared=records,
+                                    count=len(records))
+            if index is not None:
+                self._search_manager.import_index(name, index)
+
+    def save_snapshots(self):
+        """Refresh the snapshot cache for unmodified-since-save stores and their indexes."""
+        if self.cache is None:
+            return
+        for collection, store in self._stores.items():
+            if hasattr(store, "refresh_cache"):
+                store.refresh_cache()
+        if self._search_manager is None:
+            return
+        for name, (collection, index) in self._search_manager.export_indexes().items():
+            if not self._cacheable(collection):
+                continue
+            store = self._stores[collection]
+            if self.cache.is_fresh(f"index_{name}", store.file_path):
+                continue
+            records = store.get_all()
+            self.cache.store(f"index_{name}", store.file_path, index, shared=records, count=len(records))
+
+    def save_errors(self):
+        """Drain (collection, exception) pairs for saves that failed in the background."""
+        errors = []
+        if self.writer is None:
+            return errors
+        names = {id(store): name for name, store in self._stores.items()}
+        while not self.writer.errors.empty():
+            store, error = self.writer.errors.get_nowait()
+            errors.append((names.get(id(store), str(store)), error))
+        return errors
+
+    # --- Change events ---
+    def subscribe(self, callback):
+        """Call `callback(collection, op, item)` after every mutation."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _publish(self, collection, op, item):
+        self.version += 1
+        for callback in list(self._subscribers):
+            callback(collection, op, item)
+
+    # --- Mutations ---
+    def new_id(self, collection, label):
+        """
+        Readable unused id for a record added to `collection`, from its name/title/etc.:
+        'John Smith' -> 'john_smith' (or 'john_smith_2'). Long labels keep their first words.
+        """
+        base = "_".join(re.findall(r"\w+", str(label or "").lower())[:6]) or ID_DEFAULTS[collection]
+        store = self.store(collection)
+        item_id, n = base, 2
+        while store.get_by_id(item_id):
+            item_id, n = f"{base}_{n}", n + 1
+        return item_id
+
+    def add(self, collection, item):
+        self.store(collection).add(item)
+        self._publish(collection, "add", item)
+
+    def update(self, collection, item_id, updates):
+        store = self.store(collection)
+        store.update(item_id, updates)
+        self._publish(collection, "update", store.get_by_id(item_id))
+
+    def apply_external(self, collection, diff, signature=None):
+        """
+        Apply a diff of records edited outside the kiosk (see DataWatcher) and publish
+        the same per-record delete/update/add events an edit in the kiosk would, so
+        indexes touch only those records. A diff that rewrites most of the file (e.g.
+        a restored backup) publishes one (collection, "reload", None) instead.
+        Nothing is written back to disk.
+        """
+        added, changed, removed = diff
+        if not (added or changed or removed):
+            return
+        store = self.store(collection)
+        if not store.apply_diff(added, changed, removed, signature):
+            return
+        if len(added) + len(changed) + len(removed) > len(store.get_all()) // 2 + 64:
+            self._publish(collection, "reload", None)
+            return
+        # Deletes first: the indexes count removed records before re-syncing with the list
+        for item in removed:
+            self._publish(collection, "delete", item)
+        for item, _ in changed:
+            self._publish(collection, "update", item)
+        for item in added:
+            self._publish(collection, "add", item)
+
+    def delete(self, collection, item_id):
+        store = self.store(collection)
+        item = store.get_by_id(item_id)
+        store.delete(item_id)
+        if item is not None:
+            self._publish(collection, "delete", item)
@@ -0,0 +1,78 @@
+import queue
+import threading
+import time
+
+COALESCE_SECONDS = 0.25
+
+
+class SaveWorker:
+    """
+    Single background thread that writes stores to disk.
+    Mutations apply in memory immediately and call schedule(store); a burst of edits
+    to the same store within the coalescing window becomes one atomic write.
+    Failures are queued on `errors` as (store, exception) for the UI to report.
+    """
+
+    def __init__(self, coalesce_seconds=COALESCE_SECONDS):
+        self.coalesce_seconds = coalesce_seconds
+        self.errors = queue.Queue()
+        self._dirty = {}      # id(store) -> store, in scheduling order
+        self._busy = False
+        self._stopping = False
+        self._urgent = False  # set by flush() to skip the coalescing window
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="save-worker", daemon=True)
+        self._thread.start()
+
+    def schedule(self, store):
+        """Mark `store` as needing a save."""
+        with self._cond:
+            self._dirty[id(store)] = store
+            self._cond.notify_all()
+
+    def pending(self):
+        with self._cond:
+            return bool(self._dirty) or self._busy
+
+    def flush(self, timeout=None):
+        """Block until every scheduled save has been written. Returns False on timeout."""
+        with self._cond:
+            if self._dirty:
+                # Only when saves are queued: the worker consumes the flag with them, so it
+                # can't linger and cut the coalescing window of the next edit short
+                self._urgent = True
+                self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self._dirty and not self._busy, timeout)
+
+    def close(self, timeout=None):
+        """Flush outstanding saves and stop the thread (call on shutdown)."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._dirty or self._stopping)
+                if not self._dirty and self._stopping:
+                    return
+                # Let a burst of edits pile up, unless someone is waiting on flush()/close()
+                deadline = time.monotonic() + self.coalesce_seconds
+                while not (self._stopping or self._urgent):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                self._urgent = False
+                batch = list(self._dirty.values())
+                self._dirty.clear()
+                self._busy = True
+            for store in batch:
+                try:
+                    store.save()
+                except Exception as e:
+                    self.errors.put((store, e))
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
@@ -0,0 +1,121 @@
+import hashlib
+import os
+import pickle
+
+from app.utils.json_manager import DATA_DIR
+
+CACHE_DIR = ".cache"
+CACHE_VERSION = 2
+
+
+def file_sha1(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_signature(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class _SharedPickler(pickle.Pickler):
+    """Pickles references to a shared record list (and its records) by position."""
+
+    def __init__(self, f, shared):
+        super().__init__(f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.shared = shared
+        self.positions = {id(r): i for i, r in enumerate(shared)} if shared is not None else {}
+
+    def persistent_id(self, obj):
+        if self.shared is None:
+            return None
+        if obj is self.shared:
+            return ("list",)
+        if type(obj) is dict:
+            pos = self.positions.get(id(obj))
+            if pos is not None:
+                return ("record", pos)
+        return None
+
+
+class _SharedUnpickler(pickle.Unpickler):
+    def __init__(self, f, shared):
+        super().__init__(f)
+        self.shared = shared
+
+    def persistent_load(self, pid):
+        if pid[0] == "list":
+            return self.shared
+        return self.shared[pid[1]]
+
+
+class SnapshotCache:
+    """
+    Binary (pickle) snapshots of parsed data and prebuilt indexes, so a warm start
+    skips JSON parsing and index building.
+
+    Each entry is keyed by its source JSON file: it's valid while the file's
+    (mtime, size) match, or, if those changed, while its SHA-1 still matches (e.g.
+    after a sync tool touched it). Objects that point into a store's record list
+    (indexes) are saved with `shared=` that list, so they reattach to the live
+    records on load instead of carrying a copy of them.
+    """
+
+    def __init__(self, cache_dir=None, data_dir=None):
+        self.cache_dir = cache_dir or (data_dir or DATA_DIR) / CACHE_DIR
+
+    def _path(self, name):
+        return self.cache_dir / f"{name}.pickle"
+
+    def load(self, name, source_path, shared=None, count=None):
+        """Cached object for `name`, or None if missing/stale. `count` must match if given."""
+        path = self._path(name)
+        try:
+            with open(path, "rb") as f:
+                header = pickle.load(f)
+                if not self._valid(header, source_path, count):
+                    return None
+                return _SharedUnpickler(f, shared).load()
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, IndexError):
+            return None
+
+    def _valid(self, header, source_path, count):
+        if header.get("version") != CACHE_VERSION:
+            return False
+        if count is not None and header.get("count") != count:
+            return False
+        signature = file_signature(source_path)
+        if signature is None:
+            return False
+        if header.get("signature") == signature:
+            return True
+        return header.get("sha1") == file_sha1(source_path)
+
+    def store(self, name, source_path, obj, shared=None, count=None):
+        """Save `obj` as the snapshot of `source_path`'s current contents."""
+        signature = file_signature(source_path)
+        if signature is None:
+            return
+        header = {"version": CACHE_VERSION, "signature": signature, "sha1": file_sha1(source_path), "count": count}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(name)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            _SharedPickler(f, shared).dump(obj)
+        os.replace(tmp, path)
+
+    def is_fresh(self, name, source_path):
+        """True if a snapshot for `name` matches the file's current signature (cheap check)."""
+        try:
+            with open(self._path(name), "rb") as f:
+                header = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return False
+        return header.get("version") == CACHE_VERSION and header.get("signature") == file_signature(source_path)
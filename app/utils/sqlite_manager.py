@@ -0,0 +1,242 @@
+import json
+import sqlite3
+import sys
+import threading
+from datetime import date
+from pathlib import Path
+
+from app.logic.date_index import parse_ordinal
+from app.utils.json_manager import DATA_DIR
+
+DB_FILENAME = "kiosk.db"
+
+# Columns pulled out of each record so they can be indexed and filtered in SQL.
+# Everything else only lives in the `doc` JSON blob.
+INDEXED_COLUMNS = ["id", "name", "nickname", "birth_date", "birthYear", "date", "ownerId", "personId"]
+
+# Stored zero-padded ('1995-7-4' -> '1995-07-04') so ranges compare as strings; the doc keeps the original
+DATE_COLUMNS = ("birth_date", "date")
+
+ISO_DATE_GLOB = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]"
+
+DEFAULT_FILES = ["people.json", "pets.json", "photos.json", "stories.json", "quizzes.json"]
+
+
+class SQLiteStore:
+    """
+    Same surface as JSONStore (get_all / get_by_id / add / update / delete / find_by),
+    backed by one table per store in DATA_DIR/kiosk.db. Records are only parsed
+    when something asks for them, so opening a large archive is cheap.
+    """
+
+    def __init__(self, filename, indexes=(), db_path=None, data_dir=None):
+        # `indexes` is accepted for JSONStore compatibility; the SQL columns are always indexed
+        self.filename = filename
+        self.table = filename.rsplit(".", 1)[0]
+        self.db_path = db_path or Path(data_dir or DATA_DIR) / DB_FILENAME
+        # Shared with the query server's request threads; `lock` serializes use of the connection
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.lock = threading.RLock()
+        # Python's lower(), as the in-memory name search uses (SQLite's only folds ASCII)
+        self.conn.create_function("pylower", 1, _lower, deterministic=True)
+        self._cache = None
+        self._by_rowid = {}  # rowid -> cached record (records need not have an id)
+        self._by_id = {}
+        self._create_schema()
+
+    def _create_schema(self):
+        cols = ", ".join(f'"{c}"' for c in INDEXED_COLUMNS)
+        self.conn.execute(f'CREATE TABLE IF NOT EXISTS "{self.table}" (rowid INTEGER PRIMARY KEY, {cols}, doc TEXT NOT NULL)')
+        self.conn.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS "{self.table}_id" ON "{self.table}" ("id")')
+        for col in INDEXED_COLUMNS[1:]:
+            self.conn.execute(f'CREATE INDEX IF NOT EXISTS "{self.table}_{col}" ON "{self.table}" ("{col}")')
+        self.conn.execute(f'CREATE TABLE IF NOT EXISTS "{self.table}_tags" (record INTEGER NOT NULL, tag TEXT NOT NULL)')
+        self.conn.execute(f'CREATE INDEX IF NOT EXISTS "{self.table}_tags_tag" ON "{self.table}_tags" (tag)')
+        self.conn.execute(f'CREATE INDEX IF NOT EXISTS "{self.table}_tags_record" ON "{self.table}_tags" (record)')
+        self.conn.commit()
+
+    # --- Row helpers ---
+    @staticmethod
+    def _column_values(item):
+        values = []
+        for col in INDEXED_COLUMNS:
+            v = item.get(col)
+            if col in DATE_COLUMNS:
+                v = normalize_date(v)
+            values.append(v if isinstance(v, (str, int, float)) or v is None else json.dumps(v))
+        return values
+
+    def _insert(self, item):
+        placeholders = ", ".join("?" for _ in INDEXED_COLUMNS)
+        cols = ", ".join(f'"{c}"' for c in INDEXED_COLUMNS)
+        cur = self.conn.execute(
+            f'INSERT INTO "{self.table}" ({cols}, doc) VALUES ({placeholders}, ?)',
+            self._column_values(item) + [json.dumps(item)],
+        )
+        self._write_tags(cur.lastrowid, item)
+        return cur.lastrowid
+
+    def _write_tags(self, rowid, item):
+        tags = item.get("tags") or []
+        if isinstance(tags, str):
+            tags = [tags]
+        self.conn.executemany(
+            f'INSERT INTO "{self.table}_tags" (record, tag) VALUES (?, ?)',
+            [(rowid, str(t)) for t in tags],
+        )
+
+    def _query_docs(self, where="", params=()):
+        with self.lock:
+            if self._cache is not None:
+                # Same objects as get_all(), like get_by_id
+                rows = self.conn.execute(f'SELECT rowid FROM "{self.table}" {where} ORDER BY rowid', params)
+                return [self._by_rowid[rowid] for (rowid,) in rows]
+            rows = self.conn.execute(f'SELECT doc FROM "{self.table}" {where} ORDER BY rowid', params)
+            return [json.loads(doc) for (doc,) in rows]
+
+    # --- JSONStore API ---
+    @property
+    def data(self):
+        return self.get_all()
+
+    def save(self):
+        with self.lock:
+            self.conn.commit()
+
+    def get_all(self):
+        with self.lock:
+            if self._cache is None:
+                rows = self.conn.execute(f'SELECT rowid, doc FROM "{self.table}" ORDER BY rowid')
+                self._by_rowid = {rowid: json.loads(doc) for rowid, doc in rows}
+                self._by_id = {item["id"]: item for item in self._by_rowid.values() if item.get("id") is not None}
+                self._cache = list(self._by_rowid.values())
+            return self._cache
+
+    def get_by_id(self, item_id):
+        # Once loaded, hand out the same objects as get_all() so in-place edits and
+        # identity-keyed index updates see one record
+        with self.lock:
+            if self._cache is not None:
+                return self._by_id.get(item_id)
+            row = self.conn.execute(f'SELECT doc FROM "{self.table}" WHERE "id" = ?', (item_id,)).fetchone()
+            return json.loads(row[0]) if row else None
+
+    def add(self, item):
+        with self.lock:
+            if self.get_by_id(item["id"]):
+                raise ValueError(f"Item with ID {item['id']} already exists.")
+            rowid = self._insert(item)
+            self.conn.commit()
+            if self._cache is not None:
+                self._cache.append(item)
+                self._by_rowid[rowid] = item
+                self._by_id[item["id"]] = item
+
+    def update(self, item_id, updates):
+        with self.lock:
+            row = self.conn.execute(f'SELECT rowid, doc FROM "{self.table}" WHERE "id" = ?', (item_id,)).fetchone()
+            if not row:
+                raise ValueError(f"Item with ID {item_id} not found.")
+            rowid, doc = row
+            item = json.loads(doc)
+            item.update(updates)
+            assignments = ", ".join(f'"{c}" = ?' for c in INDEXED_COLUMNS)
+            self.conn.execute(
+                f'UPDATE "{self.table}" SET {assignments}, doc = ? WHERE rowid = ?',
+                self._column_values(item) + [json.dumps(item), rowid],
+            )
+            self.conn.execute(f'DELETE FROM "{self.table}_tags" WHERE record = ?', (rowid,))
+            self._write_tags(rowid, item)
+            self.conn.commit()
+            cached = self._by_id.get(item_id)
+            if cached is not None:
+                cached.update(updates)
+
+    def delete(self, item_id):
+        with self.lock:
+            rowids = [rowid for (rowid,) in self.conn.execute(
+                f'SELECT rowid FROM "{self.table}" WHERE "id" = ?', (item_id,))]
+            if not rowids:
+                return
+            self.conn.execute(f'DELETE FROM "{self.table}_tags" WHERE record = ?', (rowids[0],))
+            self.conn.execute(f'DELETE FROM "{self.table}" WHERE rowid = ?', (rowids[0],))
+            self.conn.commit()
+            removed = self._by_rowid.pop(rowids[0], None)
+            if removed is not None:
+                self._by_id.pop(item_id, None)
+                # In place, so lists shared with SearchManager stay current
+                self._cache[:] = [i for i in self._cache if i is not removed]
+
+    # --- Filters pushed down to SQL ---
+    def find_by(self, field, value):
+        """Return all records whose `field` equals (or, for tags, contains) `value`."""
+        if field == "tags":
+            return self._query_docs(
+                f'WHERE rowid IN (SELECT record FROM "{self.table}_tags" WHERE tag = ?)', (value,)
+            )
+        if field in INDEXED_COLUMNS:
+            if field in DATE_COLUMNS:
+                value = normalize_date(value)
+            return self._query_docs(f'WHERE "{field}" = ?', (value,))
+        return self._query_docs("WHERE json_extract(doc, ?) = ?", (f"$.{field}", value))
+
+    def find_by_name(self, name, exact=False):
+        """
+        Case-insensitive name/nickname/alias match; substring unless exact=True.
+        Same matches as SearchManager's in-memory name search.
+        """
+        name_lc = name.lower().strip()
+        test = "{} = ?" if exact else "instr({}, ?) > 0"
+        where = " OR ".join([
+            test.format('pylower(coalesce("name", \'\'))'),
+            test.format('pylower(coalesce("nickname", \'\'))'),
+            "EXISTS (SELECT 1 FROM json_each(doc, '$.aliases') WHERE " + test.format("pylower(coalesce(value, ''))") + ")",
+        ])
+        return self._query_docs("WHERE " + where, (name_lc,) * 3)
+
+    def find_by_date_range(self, start_date, end_date, date_key="date"):
+        """Records whose 'YYYY-MM-DD' date (zero padding optional) lies within [start_date, end_date]."""
+        if date_key not in DATE_COLUMNS:
+            raise KeyError(f"Field '{date_key}' is not an indexed date column.")
+        return self._query_docs(
+            f'WHERE "{date_key}" BETWEEN ? AND ? AND "{date_key}" GLOB ?',
+            (normalize_date(start_date), normalize_date(end_date), ISO_DATE_GLOB),
+        )
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def _lower(value):
+    return value.lower() if isinstance(value, str) else value
+
+
+def normalize_date(value):
+    """'1995-7-4' -> '1995-07-04' (what DateIndex accepts); anything else is returned unchanged."""
+    ordinal = parse_ordinal(value) if isinstance(value, str) else None
+    return date.fromordinal(ordinal).isoformat() if ordinal is not None else value
+
+
+def migrate_json_to_sqlite(filenames=DEFAULT_FILES, db_path=None, data_dir=None):
+    """One-shot import of data/*.json into the SQLite database. Existing tables are replaced."""
+    from app.utils.json_manager import JSONStore
+
+    counts = {}
+    for filename in filenames:
+        records = JSONStore(filename, data_dir=data_dir).get_all()
+        store = SQLiteStore(filename, db_path=db_path, data_dir=data_dir)
+        store.conn.execute(f'DELETE FROM "{store.table}_tags"')
+        store.conn.execute(f'DELETE FROM "{store.table}"')
+        for item in records:
+            store._insert(item)
+        store.conn.commit()
+        store.close()
+        counts[filename] = len(records)
+    return counts
+
+
+if __name__ == "__main__":
+    # python -m app.utils.sqlite_manager [file.json ...]
+    for name, count in migrate_json_to_sqlite(sys.argv[1:] or DEFAULT_FILES).items():
+        print(f"{name}: {count} records")
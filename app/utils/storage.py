@@ -0,0 +1,21 @@
+import os
+
+from app.utils.json_manager import JSONStore
+
+# "json" (default) or "sqlite"; can be overridden per call
+STORAGE_BACKEND = os.environ.get("KIOSK_STORAGE_BACKEND", "json")
+
+
+def open_store(filename, backend=None, **kwargs):
+    """Open a store for `filename` on the chosen backend. Both expose the JSONStore API."""
+    backend = backend or STORAGE_BACKEND
+    if backend == "json":
+        return JSONStore(filename, **kwargs)
+    if backend == "sqlite":
+        from app.utils.sqlite_manager import SQLiteStore
+        # SQLite commits are already incremental
+        kwargs.pop("journal", None)
+        kwargs.pop("writer", None)
+        kwargs.pop("cache", None)
+        return SQLiteStore(filename, **kwargs)
+    raise ValueError(f"Unknown storage backend '{backend}'. Use 'json' or 'sqlite'.")
@@ -0,0 +1,75 @@
+import hashlib
+import os
+import threading
+
+from app.utils.json_manager import DATA_DIR
+
+try:
+    from PIL import Image
+except ImportError:  # listed in requirements.txt; make() reports it missing
+    Image = None
+
+THUMBNAIL_SIZES = (64, 128, 256)
+THUMBNAIL_DIR = "thumbnails"
+
+
+class ThumbnailCache:
+    """
+    On-disk thumbnail cache keyed by a hash of the source file's content, so renamed
+    or copied photos share thumbnails and edited photos get new ones.
+    Thread-safe; decoding runs wherever make() is called (normally a worker thread).
+    """
+
+    def __init__(self, cache_dir=None, sizes=THUMBNAIL_SIZES):
+        self.cache_dir = cache_dir or DATA_DIR / THUMBNAIL_DIR
+        self.sizes = sizes
+        self._hashes = {}  # (path, mtime, size) -> content hash
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def content_hash(self, path):
+        st = os.stat(path)
+        key = (str(path), st.st_mtime_ns, st.st_size)
+        with self._lock:
+            digest = self._hashes.get(key)
+        if digest is None:
+            h = hashlib.sha1()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+            digest = h.hexdigest()
+            with self._lock:
+                self._hashes[key] = digest
+        return digest
+
+    def thumb_path(self, digest, size):
+        return self.cache_dir / f"{digest}_{size}.png"
+
+    def snap_size(self, size):
+        """Smallest cached size that is at least `size` (or the largest one)."""
+        return next((s for s in self.sizes if s >= size), self.sizes[-1])
+
+    def lookup(self, path, size):
+        """Cached thumbnail file for `path` at `size`, or None if not built yet."""
+        thumb = self.thumb_path(self.content_hash(path), self.snap_size(size))
+        return thumb if thumb.exists() else None
+
+    def make(self, path, size):
+        """Return the thumbnail file for `path`, decoding and downsampling it if needed."""
+        size = self.snap_size(size)
+        digest = self.content_hash(path)
+        thumb = self.thumb_path(digest, size)
+        if thumb.exists():
+            return thumb
+        if Image is None:
+            raise RuntimeError("Pillow is required for thumbnails (pip install -r requirements.txt).")
+        with Image.open(path) as img:
+            # draft() lets the JPEG decoder skip straight to a reduced scale
+            img.draft("RGB", (size, size))
+            img.thumbnail((size, size))
+            if img.mode not in ("RGB", "RGBA"):
+                img = img.convert("RGBA")
+            tmp = thumb.with_name(thumb.name + f".{threading.get_ident()}.tmp")
+            img.save(tmp, "PNG")
+        os.replace(tmp, thumb)
+        return thumb
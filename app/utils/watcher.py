@@ -0,0 +1,72 @@
+import queue
+import threading
+
+POLL_SECONDS = 2.0
+APPLY_POLL_MS = 250
+
+
+class DataWatcher:
+    """
+    Notices edits made to data/*.json outside the kiosk (by hand or by a sync tool)
+    and applies them without a restart.
+
+    A background thread polls each open JSON store's file signature (mtime, size);
+    when one changed, it re-parses only that file and diffs it by record id. The diff
+    is applied on the Tk thread (via after()) through DataRepository.apply_external,
+    which updates the store and publishes an event per added, changed or removed
+    record. There is no stdlib inotify binding, so this polls.
+    """
+
+    def __init__(self, repository, root, interval=POLL_SECONDS):
+        self.repository = repository
+        self.root = root
+        self.interval = interval
+        self._results = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+        self._after_id = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="data-watcher", daemon=True)
+            self._thread.start()
+            self._after_id = self.root.after(APPLY_POLL_MS, self._apply_pending)
+
+    def stop(self):
+        self._stop.set()
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    # --- Background thread ---
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check_once()
+
+    def check_once(self):
+        """Look for changed files once and queue their diffs (callable from any thread)."""
+        for collection, store in self.repository.open_stores():
+            if not hasattr(store, "changed_on_disk") or not store.changed_on_disk():
+                continue
+            signature = store.disk_signature()
+            try:
+                records = store.read_disk()
+            except ValueError:
+                continue  # caught mid-write (or broken by hand); try again next round
+            diff = store.diff(records)
+            self._results.put((collection, diff, signature))
+
+    def apply_pending(self):
+        """Apply queued diffs through the repository (on the thread that owns the data)."""
+        try:
+            while True:
+                collection, diff, signature = self._results.get_nowait()
+                self.repository.apply_external(collection, diff, signature)
+        except queue.Empty:
+            pass
+
+    # --- Tk thread ---
+    def _apply_pending(self):
+        self.apply_pending()
+        if not self._stop.is_set():
+            self._after_id = self.root.after(APPLY_POLL_MS, self._apply_pending)
@@ -0,0 +1,88 @@
+"""
+Startup benchmark: time to a searchable kiosk, cold (no snapshot cache) vs. warm.
+
+    python -m benchmarks.bench_startup --people 20000 --repeat 5
+
+Each run is a fresh interpreter (so imports count too) that opens a DataRepository,
+loads every store, builds the search manager with its name/tag/date indexes and
+runs one name search. Headless; prints JSON.
+"""
+import argparse
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.generate_family import write_dataset
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = r"""
+import json, sys, time
+start = time.perf_counter()
+from app.utils.repository import DataRepository
+from pathlib import Path
+repo = DataRepository(data_dir=Path(sys.argv[1]), async_saves=False, snapshot_cache=sys.argv[2] == "1")
+sm = repo.search_manager
+sm.get_name_resolver()
+sm.get_tag_index()
+sm.get_date_index(sm.photos)
+sm.get_date_index(sm.stories)
+sm.find_people_by_name("an")
+ready = time.perf_counter() - start
+repo.close()
+print(json.dumps({"ready_s": ready, "close_s": time.perf_counter() - start - ready}))
+"""
+
+
+def run_child(data_dir, use_cache):
+    out = subprocess.run([sys.executable, "-c", CHILD, str(data_dir), "1" if use_cache else "0"],
+                         cwd=ROOT, check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def summarize(runs):
+    ready = [r["ready_s"] for r in runs]
+    return {"runs": len(runs), "median_s": round(statistics.median(ready), 4),
+            "min_s": round(min(ready), 4), "max_s": round(max(ready), 4)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold vs. warm startup time.")
+    parser.add_argument("--people", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data_dir = Path(tempfile.mkdtemp(prefix="kiosk_startup_"))
+    try:
+        write_dataset(data_dir, args.people, args.seed)
+        cache_dir = data_dir / ".cache"
+
+        no_cache, cold, warm = [], [], []
+        for _ in range(args.repeat):
+            no_cache.append(run_child(data_dir, use_cache=False))
+        for _ in range(args.repeat):
+            shutil.rmtree(cache_dir, ignore_errors=True)
+            cold.append(run_child(data_dir, use_cache=True))  # parses, then writes the cache
+        for _ in range(args.repeat):
+            warm.append(run_child(data_dir, use_cache=True))
+
+        result = {
+            "people": args.people,
+            "no_cache": summarize(no_cache),
+            "cold": summarize(cold),
+            "warm": summarize(warm),
+            "cache_bytes": sum(p.stat().st_size for p in cache_dir.iterdir()),
+        }
+        result["speedup"] = round(result["no_cache"]["median_s"] / result["warm"]["median_s"], 2)
+        print(json.dumps(result, indent=2))
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
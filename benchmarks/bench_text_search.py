@@ -0,0 +1,115 @@
+"""
+Full-text story search benchmark: BM25 word index vs. a substring scan of every story.
+
+    python -m benchmarks.bench_text_search --stories 50000
+
+Generates a seeded archive with the requested number of stories, builds the
+TextIndex through SearchManager, and times term, multi-term, phrase and "any"
+queries, incremental add/edit, and the linear scan the index replaces. Checks
+that indexed "all" queries return the same stories as a token scan. Prints JSON.
+"""
+import argparse
+import json
+import random
+import time
+
+from app.logic.search_manager import TEXT_FIELDS, SearchManager
+from app.logic.text_index import parse_query, tokenize
+from benchmarks.generate_family import WORDS, FamilyGenerator
+from benchmarks.run_benchmarks import summarize
+
+
+def scan(stories, query):
+    """What a search would cost without the index: lowercase substring checks per field."""
+    terms, phrases = parse_query(query)
+    needles = terms + [" ".join(p) for p in phrases]
+    return [s for s in stories
+            if all(any(n in str(s.get(f) or "").lower() for f in TEXT_FIELDS["stories"]) for n in needles)]
+
+
+def contains_phrase(tokens, phrase):
+    n = len(phrase)
+    return any(tokens[i:i + n] == phrase for i in range(len(tokens) - n + 1))
+
+
+def token_scan(stories, query):
+    terms, phrases = parse_query(query)
+    found = []
+    for s in stories:
+        tokens = [tokenize(s.get(f)) for f in TEXT_FIELDS["stories"]]
+        words = {t for field in tokens for t in field}
+        if all(t in words for t in terms) and all(any(contains_phrase(f, p) for f in tokens) for p in phrases):
+            found.append(s["id"])
+    return found
+
+
+def time_queries(fn, queries):
+    samples = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full-text story search.")
+    parser.add_argument("--stories", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    people = max(100, args.stories // 5)
+    data = FamilyGenerator(people=people, seed=args.seed, stories_per_person=args.stories / people).generate()
+    sm = SearchManager(**data)
+    stories = sm.stories
+    rng = random.Random(args.seed)
+
+    start = time.perf_counter()
+    index = sm.get_text_index("stories")
+    build_s = time.perf_counter() - start
+
+    def phrase():
+        text = tokenize(rng.choice(stories)["text"])
+        i = rng.randrange(max(1, len(text) - 2))
+        return '"' + " ".join(text[i:i + 3]) + '"'
+
+    queries = {
+        "one_term": [rng.choice(WORDS) for _ in range(args.queries)],
+        "two_terms": [f"{rng.choice(WORDS)} {rng.choice(WORDS)}" for _ in range(args.queries)],
+        "phrase": [phrase() for _ in range(args.queries)],
+        "phrase_and_term": [f"{phrase()} {rng.choice(WORDS)}" for _ in range(args.queries)],
+    }
+
+    for q in queries["two_terms"][:5] + queries["phrase"][:5]:
+        indexed = sorted(r["id"] for _, r in index.search(q, limit=None))
+        assert indexed == sorted(token_scan(stories, q)), f"index and scan disagree on {q!r}"
+
+    results = {"stories": len(stories), "build_s": round(build_s, 3), "queries": {}}
+    for name, qs in queries.items():
+        results["queries"][name] = {
+            "indexed": time_queries(lambda q: sm.search_stories(q), qs),
+            "any_mode": time_queries(lambda q: sm.search_stories(q, mode="any"), qs),
+            "linear_scan": time_queries(lambda q: scan(stories, q), qs[:10]),
+        }
+
+    # Incremental maintenance
+    add_samples, edit_samples = [], []
+    for i in range(20):
+        stories.append({"id": f"bench_story_{i}", "title": "Bench", "text": "zebra quux " * 20})
+        start = time.perf_counter()
+        index.search("zebra")
+        add_samples.append(time.perf_counter() - start)
+        story = stories[rng.randrange(len(stories))]
+        story["text"] = story["text"] + " xylophone"
+        start = time.perf_counter()
+        sm.record_changed("stories", "update", story)
+        edit_samples.append(time.perf_counter() - start)
+    assert len(index.search("xylophone", limit=None)) >= 1
+    results["incremental"] = {"append_then_query": summarize(add_samples), "edit": summarize(edit_samples)}
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
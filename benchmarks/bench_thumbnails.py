@@ -0,0 +1,83 @@
+"""
+Thumbnail pipeline benchmark: time-to-first-thumbnail and throughput over a folder of images.
+
+    python -m benchmarks.bench_thumbnails path/to/photos
+    python -m benchmarks.bench_thumbnails --generate 2000
+
+Runs headless (no Tk); it exercises the worker pool + on-disk cache that ThumbnailService uses.
+Requires Pillow.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from app.utils.thumbnail_cache import Image, ThumbnailCache
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+
+
+def generate_images(folder, count, width=2400, height=1600, seed=0):
+    """Write `count` synthetic full-resolution JPEGs to `folder`."""
+    rng = random.Random(seed)
+    os.makedirs(folder, exist_ok=True)
+    for i in range(count):
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+        img = Image.new("RGB", (width, height), color)
+        img.putpixel((rng.randrange(width), rng.randrange(height)), (0, 0, 0))
+        img.save(Path(folder) / f"img_{i:05d}.jpg", quality=85)
+
+
+def run_pass(paths, cache, size, workers):
+    start = time.perf_counter()
+    first = None
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(cache.make, p, size) for p in paths]
+        for future in as_completed(futures):
+            future.result()
+            if first is None:
+                first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    return {
+        "images": len(paths),
+        "first_thumbnail_s": round(first or 0.0, 4),
+        "total_s": round(total, 4),
+        "per_second": round(len(paths) / total, 1) if total else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("folder", nargs="?", help="Folder of jpg/png images")
+    parser.add_argument("--generate", type=int, default=0, help="Generate N synthetic images instead")
+    parser.add_argument("--size", type=int, default=128)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    args = parser.parse_args()
+
+    if Image is None:
+        parser.error("Pillow is required for this benchmark (pip install Pillow).")
+    folder = args.folder
+    if args.generate:
+        folder = folder or tempfile.mkdtemp(prefix="kiosk_images_")
+        generate_images(folder, args.generate)
+    if not folder:
+        parser.error("Give a folder of images or --generate N.")
+
+    paths = sorted(p for p in Path(folder).iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+    cache = ThumbnailCache(cache_dir=Path(tempfile.mkdtemp(prefix="kiosk_thumbs_")))
+    results = {
+        "benchmark": "thumbnails",
+        "size": args.size,
+        "workers": args.workers,
+        "cold": run_pass(paths, cache, args.size, args.workers),
+        "warm": run_pass(paths, cache, args.size, args.workers),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Seeded synthetic family archive generator.
+
+    python -m benchmarks.generate_family --people 100000 --out /tmp/family_100k
+
+Writes people/photos/pets/stories/quizzes.json in the kiosk's schema: multiple
+generations of couples with children, marriages into the family, divorces and
+remarriages (step-parents), adoptions, plus photos tagged with family clusters,
+pets with owners, stories and quiz questions.
+"""
+import argparse
+import json
+import os
+import random
+from pathlib import Path
+
+FIRST_NAMES = {
+    "Male": ["John", "James", "Robert", "Michael", "William", "David", "Joseph", "Thomas", "Charles", "Daniel",
+             "Matthew", "Anthony", "Mark", "Paul", "Steven", "Andrew", "Joshua", "Kevin", "Brian", "George",
+             "Edward", "Ronald", "Nathan", "Samuel", "Henry", "Walter", "Arthur", "Albert", "Harold", "Frank"],
+    "Female": ["Mary", "Patricia", "Jennifer", "Linda", "Elizabeth", "Barbara", "Susan", "Jessica", "Sarah",
+               "Karen", "Nancy", "Lisa", "Betty", "Margaret", "Sandra", "Ashley", "Dorothy", "Emily", "Anna",
+               "Helen", "Ruth", "Sophie", "Megan", "Elise", "Grace", "Alice", "Rose", "Clara", "Irene", "Edith"],
+}
+SURNAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Miller", "Davis", "Garcia", "Wilson", "Anderson",
+            "Taylor", "Thomas", "Moore", "Martin", "Jackson", "Thompson", "White", "Harris", "Clark", "Lewis",
+            "Lietha", "Chen", "Morgan", "Walker", "Young", "Allen", "King", "Wright", "Scott", "Green", "Baker",
+            "Adams", "Nelson", "Hill", "Campbell", "Mitchell", "Roberts", "Carter", "Phillips", "Evans"]
+NICKNAMES = {"William": "Bill", "Robert": "Bob", "James": "Jim", "Michael": "Mike", "Elizabeth": "Liz",
+             "Margaret": "Peggy", "Joseph": "Joe", "Thomas": "Tom", "Nathan": "Nate", "Jennifer": "Jen",
+             "Patricia": "Pat", "Edward": "Ed", "Samuel": "Sam", "Dorothy": "Dot", "Susan": "Sue"}
+SPECIES = {"Dog": ["Labrador", "Beagle", "Collie", "Poodle", None], "Cat": ["Tabby", "Siamese", None],
+           "Rabbit": [None], "Parrot": [None], "Horse": ["Quarter Horse", None]}
+PET_NAMES = ["Buster", "Max", "Bella", "Lucy", "Charlie", "Daisy", "Rocky", "Molly", "Bailey", "Sadie",
+             "Whiskers", "Shadow", "Tiger", "Oreo", "Pepper", "Ginger", "Smokey", "Duke", "Rusty", "Lady"]
+LOCATIONS = ["Backyard", "Lake Erie", "Grandma's House", "Church", "Beach", "Christmas Dinner", "School",
+             "Camping Trip", "Farm", "City Park", "Wedding Hall", "Kitchen"]
+WORDS = ("the family went to lake on a summer day and everyone laughed when grandpa fell in water "
+         "after that we always told story at dinner about fishing trip car broke down old farm house "
+         "snow winter holiday birthday cake dog ran away came back two days later proud wedding dance "
+         "moved west new job first house war letters home garden tomatoes recipe secret").split()
+
+
+def _date(rng, year):
+    return f"{year:04d}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+
+def _sentence(rng, lo=6, hi=18):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(lo, hi))]
+    return " ".join(words).capitalize() + "."
+
+
+class FamilyGenerator:
+    def __init__(self, people=1000, seed=0, photos_per_person=2.0, pets_per_person=0.3,
+                 stories_per_person=0.5, quizzes_per_person=0.01):
+        self.rng = random.Random(seed)
+        self.target = people
+        self.photos_per_person = photos_per_person
+        self.pets_per_person = pets_per_person
+        self.stories_per_person = stories_per_person
+        self.quizzes_per_person = quizzes_per_person
+        self.people = []
+        self.by_id = {}
+        self.couples = []   # (a, b) person dicts that had children together
+        self._ids = {}
+
+    # --- People ---
+    def _new_id(self, name):
+        base = name.lower().replace(" ", "_")
+        n = self._ids.get(base, 0) + 1
+        self._ids[base] = n
+        return base if n == 1 else f"{base}_{n}"
+
+    def _person(self, surname, birth_year, gender=None):
+        rng = self.rng
+        gender = gender or rng.choice(["Male", "Female"])
+        first = rng.choice(FIRST_NAMES[gender])
+        name = f"{first} {surname}"
+        person = {
+            "id": self._new_id(name),
+            "name": name,
+            "gender": gender,
+            "birthYear": birth_year,
+            "birth_date": _date(rng, birth_year),
+            "relations": {"parents": [], "stepParents": [], "children": [], "adoptedChildren": [],
+                          "spouse": None, "exSpouses": []},
+        }
+        if first in NICKNAMES and rng.random() < 0.5:
+            person["nickname"] = NICKNAMES[first]
+        if rng.random() < 0.1:
+            person["aliases"] = [f"{first[0]}. {surname}"]
+        death_year = birth_year + rng.randint(55, 100)
+        if death_year < 2024:
+            person["deathYear"] = death_year
+            person["death_date"] = _date(rng, death_year)
+            person["deceased"] = True
+        else:
+            person["deathYear"] = None
+        self.people.append(person)
+        self.by_id[person["id"]] = person
+        return person
+
+    def _marry(self, person):
+        """Marry `person` to a newcomer; the spouse of the opposite gender takes the couple's surname."""
+        rng = self.rng
+        gender = "Female" if person["gender"] == "Male" else "Male"
+        maiden = rng.choice(SURNAMES)
+        surname = person["name"].split()[-1]
+        spouse = self._person(surname, person["birthYear"] + rng.randint(-4, 4), gender)
+        if maiden != surname:
+            spouse["prev_names"] = [spouse["name"].split()[0] + " " + maiden]
+        person["relations"]["spouse"] = spouse["id"]
+        spouse["relations"]["spouse"] = person["id"]
+        return spouse
+
+    def _divorce(self, a, b):
+        a["relations"]["spouse"] = None
+        b["relations"]["spouse"] = None
+        a["relations"]["exSpouses"].append(b["id"])
+        b["relations"]["exSpouses"].append(a["id"])
+
+    def _children(self, a, b):
+        rng = self.rng
+        surname = a["name"].split()[-1]
+        born = []
+        start = max(a["birthYear"], b["birthYear"]) + rng.randint(20, 30)
+        for k in range(rng.choice([0, 1, 2, 2, 3, 3, 4, 5])):
+            if len(self.people) >= self.target:
+                break
+            child = self._person(surname, start + k * rng.randint(1, 4))
+            adopted = rng.random() < 0.03
+            for parent in (a, b):
+                if adopted:
+                    parent["relations"]["adoptedChildren"].append(child["id"])
+                else:
+                    parent["relations"]["children"].append(child["id"])
+                    child["relations"]["parents"].append(parent["id"])
+            born.append(child)
+        if born:
+            self.couples.append((a, b))
+        return born
+
+    def generate_people(self):
+        rng = self.rng
+        generation = []
+        while len(self.people) < self.target:
+            if not generation:
+                # New founding couples (also used whenever a line dies out)
+                for _ in range(max(1, self.target // 50)):
+                    if len(self.people) >= self.target:
+                        break
+                    founder = self._person(rng.choice(SURNAMES), rng.randint(1860, 1900))
+                    generation.append(founder)
+            next_generation = []
+            for person in generation:
+                if len(self.people) >= self.target:
+                    break
+                if person["birthYear"] > 2000 or rng.random() < 0.2:
+                    continue  # too young, or never married
+                spouse = self._marry(person)
+                kids = self._children(person, spouse)
+                next_generation.extend(kids)
+                if kids and rng.random() < 0.1 and len(self.people) < self.target:
+                    # Divorce and remarriage: the new partner is a step-parent to the children
+                    self._divorce(person, spouse)
+                    new_spouse = self._marry(person)
+                    for kid in kids:
+                        kid["relations"]["stepParents"].append(new_spouse["id"])
+            generation = next_generation
+        return self.people
+
+    # --- Media ---
+    def _cluster(self):
+        """A couple plus their children: the usual subjects of a family photo."""
+        if not self.couples:
+            return [self.rng.choice(self.people)]
+        a, b = self.rng.choice(self.couples)
+        kids = [self.by_id[c] for c in a["relations"]["children"] if c in self.by_id]
+        return [a, b] + kids
+
+    def generate_photos(self):
+        rng = self.rng
+        photos = []
+        for i in range(int(len(self.people) * self.photos_per_person)):
+            cluster = self._cluster()
+            subjects = rng.sample(cluster, rng.randint(1, min(len(cluster), 8)))
+            year = min(2024, max(p["birthYear"] for p in subjects) + rng.randint(0, 30))
+            photos.append({
+                "id": f"photo_{i}",
+                "filename": f"photos/{year}_{i}.jpg",
+                "date": _date(rng, year),
+                "location": rng.choice(LOCATIONS),
+                "tags": [p["id"] for p in subjects],
+                "description": _sentence(rng, 4, 10),
+            })
+        return photos
+
+    def generate_pets(self):
+        rng = self.rng
+        pets = []
+        for i in range(int(len(self.people) * self.pets_per_person)):
+            owner = rng.choice(self.people)
+            species = rng.choice(list(SPECIES))
+            pet = {
+                "id": f"pet_{i}",
+                "name": rng.choice(PET_NAMES),
+                "species": species,
+                "birthYear": min(2024, owner["birthYear"] + rng.randint(5, 60)),
+                "photo": f"pets/pet_{i}.jpg",
+                "ownerId": owner["id"],
+            }
+            breed = rng.choice(SPECIES[species])
+            if breed:
+                pet["breed"] = breed
+            owner.setdefault("pets", []).append(pet["id"])
+            pets.append(pet)
+        return pets
+
+    def generate_stories(self):
+        rng = self.rng
+        stories = []
+        for i in range(int(len(self.people) * self.stories_per_person)):
+            person = rng.choice(self.people)
+            year = min(2024, person["birthYear"] + rng.randint(5, 60))
+            story = {
+                "id": f"story_{i}",
+                "title": _sentence(rng, 2, 5)[:-1].title(),
+                "text": " ".join(_sentence(rng) for _ in range(rng.randint(2, 12))),
+                "personId": person["id"],
+                "date": _date(rng, year),
+                "source": rng.choice(self.people)["name"].split()[0],
+            }
+            person.setdefault("stories", []).append(story["id"])
+            stories.append(story)
+        return stories
+
+    def generate_quizzes(self):
+        rng = self.rng
+        quizzes = []
+        for i in range(max(10, int(len(self.people) * self.quizzes_per_person))):
+            choices = [p["name"].split()[0] for p in rng.sample(self.people, min(4, len(self.people)))]
+            quizzes.append({
+                "id": f"quiz_{i}",
+                "question": f"Who {_sentence(rng, 4, 9)[:-1].lower()}?",
+                "choices": choices,
+                "correct": rng.choice(choices),
+                "tags": rng.sample(["funny", "food", "holidays", "pets", "travel", "childhood"], 2),
+            })
+        return quizzes
+
+    def generate(self):
+        people = self.generate_people()
+        return {
+            "people": people,
+            "photos": self.generate_photos(),
+            "pets": self.generate_pets(),
+            "stories": self.generate_stories(),
+            "quizzes": self.generate_quizzes(),
+        }
+
+
+def write_dataset(out_dir, people=1000, seed=0, **kwargs):
+    """Generate a dataset and write the five store files into `out_dir`. Returns record counts."""
+    data = FamilyGenerator(people=people, seed=seed, **kwargs).generate()
+    os.makedirs(out_dir, exist_ok=True)
+    for name, records in data.items():
+        with open(Path(out_dir) / f"{name}.json", "w", encoding="utf-8") as f:
+            json.dump(records, f, indent=2)
+    return {name: len(records) for name, records in data.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic family archive.")
+    parser.add_argument("--people", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="Output directory")
+    args = parser.parse_args()
+    print(json.dumps(write_dataset(args.out, args.people, args.seed)))
+
+
+if __name__ == "__main__":
+    main()
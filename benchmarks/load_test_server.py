@@ -0,0 +1,153 @@
+"""
+Load test for the query server against a localhost instance.
+
+    python -m benchmarks.load_test_server --people 20000 --clients 8 --duration 10
+    python -m benchmarks.load_test_server --url http://127.0.0.1:8765   # already running server
+
+Without --url, generates a seeded dataset, starts `python -m app.utils.query_server`
+on a free port and stops it afterwards. Each client thread has its own pooled
+QueryClient (so ETag revalidation is per screen, like real kiosks) and issues a mix
+of name, fuzzy-resolve, relationship, photo and full-text queries. Prints JSON with
+throughput, latency percentiles per query kind, 304 ratio and errors.
+"""
+import argparse
+import json
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from app.utils.query_client import QueryClient, RemoteSearchManager
+from benchmarks.generate_family import WORDS, write_dataset
+from benchmarks.run_benchmarks import summarize
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def start_server(data_dir):
+    proc = subprocess.Popen([sys.executable, "-m", "app.utils.query_server", "--port", "0", "--no-watch",
+                             "--data-dir", str(data_dir)], cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    match = re.search(r"http://\S+", line)
+    if not match:
+        proc.kill()
+        raise RuntimeError(f"Query server did not start: {line!r}")
+    return proc, match.group(0)
+
+
+def make_queries(sm, rng, count):
+    people = sm.people
+    photos = sm.photos
+    sample = rng.sample(people, min(200, len(people)))
+    queries = []
+    for _ in range(count):
+        person = rng.choice(sample)
+        name = person["name"].lower()
+        kind = rng.choice(["name", "name", "resolve", "relations", "relationship", "photos", "text"])
+        if kind == "name":
+            start = rng.randrange(max(1, len(name) - 3))
+            queries.append((kind, "find_people_by_name", (name[start:start + rng.randint(2, 5)],)))
+        elif kind == "resolve":
+            typo = name[:-2] + name[-1] + name[-2] if len(name) > 3 else name
+            queries.append((kind, "resolve_names", ([typo],)))
+        elif kind == "relations":
+            queries.append((kind, "get_relations", (person["id"],)))
+        elif kind == "relationship":
+            queries.append((kind, "get_relationship", (person["id"], rng.choice(sample)["id"])))
+        elif kind == "photos":
+            tags = rng.choice(photos).get("tags") or [person["id"]]
+            queries.append((kind, "find_photos_with_people", (tags[:1],)))
+        else:
+            queries.append((kind, "search_text", (f"{rng.choice(WORDS)} {rng.choice(WORDS)}",)))
+    return queries
+
+
+def client_loop(url, queries, deadline, samples, errors, stats):
+    client = QueryClient(url, pool_size=2)
+    sm = RemoteSearchManager(client)
+    while time.perf_counter() < deadline:
+        for kind, method, args in queries:
+            fn = getattr(sm, method)
+            start = time.perf_counter()
+            try:
+                fn(*args)
+            except (ConnectionError, ValueError, LookupError) as e:
+                errors.append(f"{kind}: {e}")
+                continue
+            samples.setdefault(kind, []).append(time.perf_counter() - start)
+            if time.perf_counter() >= deadline:
+                break
+    client.close()
+    stats.append(client.stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test a localhost query server.")
+    parser.add_argument("--url", default=None, help="use a running server instead of starting one")
+    parser.add_argument("--people", type=int, default=10000)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--queries", type=int, default=300, help="distinct queries per client")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    data_dir = proc = None
+    url = args.url
+    try:
+        if url is None:
+            data_dir = Path(tempfile.mkdtemp(prefix="kiosk_load_"))
+            write_dataset(data_dir, args.people, args.seed)
+            started = time.perf_counter()
+            proc, url = start_server(data_dir)
+            startup_s = time.perf_counter() - started
+        else:
+            startup_s = None
+
+        setup = QueryClient(url)
+        rng = random.Random(args.seed)
+        plans = [make_queries(RemoteSearchManager(setup), random.Random(rng.random()), args.queries)
+                 for _ in range(args.clients)]
+        setup.close()
+
+        samples, errors, stats = {}, [], []
+        deadline = time.perf_counter() + args.duration
+        threads = [threading.Thread(target=client_loop, args=(url, plan, deadline, samples, errors, stats))
+                   for plan in plans]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        total = sum(len(s) for s in samples.values())
+        requests = sum(s["requests"] for s in stats)
+        result = {
+            "url": url,
+            "people": args.people if args.url is None else None,
+            "server_startup_s": round(startup_s, 3) if startup_s is not None else None,
+            "clients": args.clients,
+            "duration_s": args.duration,
+            "queries": total,
+            "queries_per_s": round(total / args.duration, 1),
+            "not_modified_ratio": round(sum(s["not_modified"] for s in stats) / requests, 3) if requests else None,
+            "errors": len(errors),
+            "first_errors": errors[:5],
+            "latency": {"all": summarize([x for s in samples.values() for x in s])} if total else {},
+        }
+        for kind, values in sorted(samples.items()):
+            result["latency"][kind] = summarize(values)
+        print(json.dumps(result, indent=2))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+        if data_dir is not None:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Headless benchmark suite for the storage and search layers.
+
+    python -m benchmarks.run_benchmarks --people 10000 --output bench.json
+    python -m benchmarks.run_benchmarks --data-dir /tmp/family_100k
+
+Generates a seeded dataset (or uses --data-dir), then times store load/save,
+name/tag/date searches and the admin add paths. Results are printed (and
+optionally written) as JSON so runs can be diffed across commits.
+"""
+import argparse
+import json
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from app.logic.search_manager import SearchManager
+from app.utils.json_manager import JSONStore
+from app.utils.repository import STORES, DataRepository
+from benchmarks.generate_family import write_dataset
+
+BENCHMARKS = []
+
+
+def benchmark(fn):
+    """Register a benchmark: fn(ctx) -> list of per-call seconds (or a dict with extra fields)."""
+    BENCHMARKS.append(fn)
+    return fn
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    fn(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    ms = [s * 1000 for s in samples]
+    return {
+        "n": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 4),
+        "p50_ms": round(ms[len(ms) // 2], 4),
+        "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 4),
+        "max_ms": round(ms[-1], 4),
+    }
+
+
+class Context:
+    def __init__(self, data_dir, repeat, seed):
+        self.data_dir = Path(data_dir)
+        self.repeat = repeat
+        self.rng = random.Random(seed)
+        self.stores = {name: JSONStore(filename, data_dir=self.data_dir) for name, (filename, _) in STORES.items()}
+        lists = {name: store.get_all() for name, store in self.stores.items()}
+        self.linear = SearchManager(**lists)
+        self.indexed = SearchManager(**lists, name_index=True)
+        people = lists["people"]
+        self.name_queries = [self._fragment(p["name"]) for p in self.rng.sample(people, min(200, len(people)))]
+        tagged = [t for photo in lists["photos"][:5000] for t in photo.get("tags", [])]
+        self.tag_queries = self.rng.sample(tagged, min(100, len(tagged)))
+        self.date_queries = []
+        for _ in range(100):
+            start = self.rng.randint(1880, 2020)
+            self.date_queries.append((f"{start}-01-01", f"{start + self.rng.randint(0, 10)}-12-31"))
+
+    def _fragment(self, name):
+        name = name.lower()
+        length = self.rng.randint(2, min(8, len(name)))
+        start = self.rng.randint(0, len(name) - length)
+        return name[start:start + length]
+
+
+# --- Stores ---
+@benchmark
+def store_load(ctx):
+    results = {}
+    for name, (filename, indexes) in STORES.items():
+        results[name] = summarize([timed(JSONStore, filename, indexes=indexes, data_dir=ctx.data_dir)
+                                   for _ in range(ctx.repeat)])
+    return results
+
+
+@benchmark
+def store_save(ctx):
+    return {name: summarize([timed(store.save) for _ in range(ctx.repeat)]) for name, store in ctx.stores.items()}
+
+
+# --- Search ---
+@benchmark
+def find_people_by_name(ctx):
+    return {
+        "linear": summarize([timed(ctx.linear.find_people_by_name, q) for q in ctx.name_queries]),
+        "trigram_index": summarize([timed(ctx.indexed.find_people_by_name, q) for q in ctx.name_queries]),
+    }
+
+
+@benchmark
+def get_photo_by_tag(ctx):
+    return {
+        "substring": summarize([timed(ctx.linear.get_photo_by_tag, t) for t in ctx.tag_queries]),
+        "exact_index": summarize([timed(ctx.linear.get_photo_by_tag, t, exact=True) for t in ctx.tag_queries]),
+        "people_all": summarize([timed(ctx.linear.find_photos_with_people, ctx.rng.sample(ctx.tag_queries, 5))
+                                 for _ in ctx.tag_queries]),
+        "people_any": summarize([timed(ctx.linear.find_photos_with_people, ctx.rng.sample(ctx.tag_queries, 5),
+                                       mode="any") for _ in ctx.tag_queries]),
+    }
+
+
+@benchmark
+def get_items_by_date_range(ctx):
+    sm = SearchManager(photos=ctx.stores["photos"].get_all())
+    first = timed(sm.get_photos_by_date_range, *ctx.date_queries[0])
+    return {
+        "first_query_with_index_build": summarize([first]),
+        "photos": summarize([timed(sm.get_photos_by_date_range, a, b) for a, b in ctx.date_queries]),
+    }
+
+
+# --- Admin add paths ---
+def _admin_record(collection, i):
+    """A record shaped like the admin form for `collection` submits (ids are added like on_add_* does)."""
+    if collection == "people":
+        return {"name": f"Bench Person {i}", "nickname": "", "birth_date": "", "parents": "", "deceased": False}
+    if collection == "photos":
+        return {"file": f"/photos/bench_{i}.jpg", "date": "1999-09-09", "tags": "", "desc": f"Bench photo {i}"}
+    if collection == "pets":
+        return {"name": f"Bench Pet {i}", "species": "Dog", "breed": "", "owners": "", "birth_date": "", "notes": ""}
+    if collection == "stories":
+        return {"title": f"Bench story {i}", "about": "", "text": "Once upon a time."}
+    return {"question": f"Who ran benchmark {i}?", "answer": "Nobody", "alt_answer": "", "about": ""}
+
+
+def _add_records(repo, count):
+    """{collection: per-add seconds} for the admin add paths, including the id lookup."""
+    samples = {}
+    for collection, label_key in (("people", "name"), ("photos", "file"), ("pets", "name"),
+                                  ("stories", "title"), ("quizzes", "question")):
+        samples[collection] = []
+        for i in range(count):
+            record = _admin_record(collection, i)
+            start = time.perf_counter()
+            label = record[label_key]
+            if collection == "photos":
+                label = Path(label).stem
+            record["id"] = repo.new_id(collection, label)
+            repo.add(collection, record)
+            samples[collection].append(time.perf_counter() - start)
+            if collection == "people":
+                repo.search_manager.find_people_by_name(record["name"])  # the relation lookups on_add_person does
+    return samples
+
+
+@benchmark
+def admin_add(ctx):
+    results = {}
+    for mode, async_saves in (("sync_save", False), ("background_save", True)):
+        scratch = Path(tempfile.mkdtemp(prefix="kiosk_bench_"))
+        try:
+            for filename, _ in STORES.values():
+                if (ctx.data_dir / filename).exists():
+                    shutil.copy(ctx.data_dir / filename, scratch / filename)
+            repo = DataRepository(async_saves=async_saves, data_dir=scratch)
+            repo.search_manager  # load outside the timed region
+            samples = _add_records(repo, max(5, ctx.repeat * 4))
+            start = time.perf_counter()
+            repo.close()
+            results[mode] = {collection: summarize(s) for collection, s in samples.items()}
+            results[mode]["flush_ms"] = round((time.perf_counter() - start) * 1000, 4)
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def run(data_dir, repeat=5, seed=0, only=None):
+    # Work on a copy: store_save and admin_add write to the files
+    scratch = Path(tempfile.mkdtemp(prefix="kiosk_bench_"))
+    try:
+        for filename, _ in STORES.values():
+            if (Path(data_dir) / filename).exists():
+                shutil.copy(Path(data_dir) / filename, scratch / filename)
+        ctx = Context(scratch, repeat, seed)
+        results = {}
+        for fn in BENCHMARKS:
+            if only and fn.__name__ not in only:
+                continue
+            results[fn.__name__] = fn(ctx)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "records": {name: len(store.get_all()) for name, store in ctx.stores.items()},
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the kiosk storage/search benchmarks.")
+    parser.add_argument("--people", type=int, default=10000, help="Size of the generated dataset")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", help="Use an existing dataset instead of generating one")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", help="Benchmark names to run")
+    parser.add_argument("--output", help="Write the JSON results to this file")
+    args = parser.parse_args()
+
+    tmp = None
+    data_dir = args.data_dir
+    if not data_dir:
+        tmp = data_dir = tempfile.mkdtemp(prefix="kiosk_data_")
+        write_dataset(data_dir, people=args.people, seed=args.seed)
+    try:
+        report = run(data_dir, repeat=args.repeat, seed=args.seed, only=args.only)
+    finally:
+        if tmp:
+            shutil.rmtree(tmp, ignore_errors=True)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
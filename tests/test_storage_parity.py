@@ -0,0 +1,288 @@
+"""
+Parity tests for the storage backends: every test runs the same operations against
+JSONStore and SQLiteStore (migrated from the same JSON files) and expects the same results.
+
+    python -m pytest tests
+"""
+import json
+
+import pytest
+
+from app.utils.repository import STORES, DataRepository
+from app.utils.sqlite_manager import migrate_json_to_sqlite
+from app.utils.storage import open_store
+from app.utils.watcher import DataWatcher
+
+BACKENDS = ("json", "sqlite")
+
+PEOPLE = [
+    {"id": "nathan_lietha", "name": "Nathan Lietha", "nickname": "Nate", "aliases": ["N.J."],
+     "birth_date": "1980-04-02", "relations": {"parents": ["ruth_lietha"]}},
+    {"id": "ruth_lietha", "name": "Ruth Lietha", "birth_date": "1952-11-30", "birthYear": 1952,
+     "relations": {"children": ["nathan_lietha"]}},
+    {"id": "anna_berg", "name": "Anna Berg", "nickname": "Annie", "aliases": ["Anna Lietha"]},
+    {"id": "jonas_berg", "name": "Jonas Berg", "birth_date": "unknown"},
+    {"id": "elise_chen", "name": "Élise Chen", "nickname": "Lise", "aliases": ["ÉLI"]},
+]
+PETS = [
+    {"id": "pet_rex", "name": "Rex", "species": "Dog", "ownerId": "nathan_lietha"},
+    {"id": "pet_tom", "name": "Tom", "species": "Cat", "ownerId": "anna_berg"},
+]
+PHOTOS = [
+    {"id": "ph1", "file": "lake.jpg", "date": "1995-07-14", "tags": ["nathan_lietha", "ruth_lietha"],
+     "description": "Fishing at the lake"},
+    {"id": "ph2", "file": "farm.jpg", "date": "1987-03-01", "tags": ["ruth_lietha"]},
+    {"id": "ph3", "file": "porch.jpg", "date": "1995-07", "tags": ["anna_berg"]},
+    {"id": "ph4", "file": "wedding.jpg", "date": "1990-06-09", "tags": ["anna_berg", "nathan_lietha"]},
+    # Like the shipped data/photos.json: no ids
+    {"file": "a.jpg", "date": "1992-02-02", "tags": ["ruth_lietha"]},
+    {"file": "b.jpg", "date": "1992-03-03", "tags": ["ruth_lietha", "anna_berg"]},
+    {"file": "c.jpg", "date": "1995-7-4", "tags": []},  # not zero-padded
+]
+STORIES = [
+    {"id": "st1", "title": "The flood", "text": "Water everywhere.", "personId": "ruth_lietha",
+     "date": "1993-05-20"},
+    {"id": "st2", "title": "First car", "text": "A red pickup.", "personId": "nathan_lietha",
+     "date": "1998-08-01"},
+]
+QUIZZES = [
+    {"id": "q1", "question": "Who had a dog named Rex?", "correct": "Nathan", "tags": ["pets"]},
+    {"question": "Who dressed as a pirate for 3 Halloweens in a row?", "choices": ["Nathan", "Anna", "John"],
+     "correct": "John", "tags": ["halloween"]},
+    {"question": "Who baked the wedding cake?", "correct": "Ruth", "tags": ["halloween", "food"]},
+]
+DATA = {"people": PEOPLE, "pets": PETS, "photos": PHOTOS, "stories": STORIES, "quizzes": QUIZZES}
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for collection, records in DATA.items():
+        (tmp_path / STORES[collection][0]).write_text(json.dumps(records), encoding="utf-8")
+    migrate_json_to_sqlite([filename for filename, _ in STORES.values()], data_dir=tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def stores(data_dir):
+    """{backend: {collection: store}} over the same records."""
+    opened = {backend: {collection: open_store(filename, backend=backend, indexes=indexes, data_dir=data_dir)
+                        for collection, (filename, indexes) in STORES.items()}
+              for backend in BACKENDS}
+    yield opened
+    for store in opened["sqlite"].values():
+        store.close()
+
+
+@pytest.fixture
+def repositories(data_dir):
+    """{backend: DataRepository} over the same records."""
+    opened = {backend: DataRepository(backend=backend, data_dir=data_dir, async_saves=False, snapshot_cache=False)
+              for backend in BACKENDS}
+    yield opened
+    for repository in opened.values():
+        repository.close()
+
+
+def ids(records):
+    """Identifying key of each record (photos and quizzes may have no id)."""
+    return [r.get("id") or r.get("file") or r.get("question") for r in records]
+
+
+def outcome(fn, *args):
+    """Result of fn(*args), or the type of exception it raised."""
+    try:
+        return fn(*args)
+    except Exception as e:
+        return type(e)
+
+
+def same(stores, collection, method, *args):
+    """Call `method` on both backends' stores and return the (equal) result."""
+    results = [outcome(getattr(stores[backend][collection], method), *args) for backend in BACKENDS]
+    assert results[0] == results[1]
+    return results[0]
+
+
+# --- Store API ---
+@pytest.mark.parametrize("collection", list(STORES))
+def test_get_all_matches_json_files(stores, collection):
+    assert same(stores, collection, "get_all") == DATA[collection]
+
+
+def test_get_by_id(stores):
+    assert same(stores, "people", "get_by_id", "anna_berg") == PEOPLE[2]
+    assert same(stores, "people", "get_by_id", "nobody") is None
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_get_by_id_returns_the_listed_record(stores, backend):
+    store = stores[backend]["people"]
+    records = store.get_all()
+    store.update("ruth_lietha", {"nickname": "Grandma"})
+    record = store.get_by_id("ruth_lietha")
+    assert any(record is r for r in records)
+    assert record["nickname"] == "Grandma"
+
+
+def test_add(stores):
+    item = {"id": "pet_bo", "name": "Bo", "species": "Horse", "ownerId": "ruth_lietha"}
+    for backend in BACKENDS:
+        stores[backend]["pets"].add(dict(item))
+    assert same(stores, "pets", "get_by_id", "pet_bo") == item
+    assert ids(same(stores, "pets", "get_all")) == ["pet_rex", "pet_tom", "pet_bo"]
+    assert same(stores, "pets", "add", dict(item)) is ValueError
+
+
+def test_update(stores):
+    for backend in BACKENDS:
+        stores[backend]["photos"].update("ph2", {"tags": ["ruth_lietha", "anna_berg"], "date": "1988-01-01"})
+    assert same(stores, "photos", "get_by_id", "ph2")["tags"] == ["ruth_lietha", "anna_berg"]
+    same(stores, "photos", "get_all")
+    assert same(stores, "photos", "update", "nope", {"date": "2000-01-01"}) is ValueError
+
+
+def test_delete(stores):
+    assert same(stores, "people", "delete", "jonas_berg") is None
+    assert same(stores, "people", "get_by_id", "jonas_berg") is None
+    assert ids(same(stores, "people", "get_all")) == ["nathan_lietha", "ruth_lietha", "anna_berg", "elise_chen"]
+    assert same(stores, "people", "delete", "jonas_berg") is None
+
+
+@pytest.mark.parametrize("collection, field, value", [
+    ("photos", "tags", "nathan_lietha"),
+    ("photos", "tags", "nobody"),
+    ("photos", "tags", "ruth_lietha"),
+    ("pets", "ownerId", "anna_berg"),
+    ("stories", "personId", "ruth_lietha"),
+])
+def test_find_by(stores, collection, field, value):
+    for backend in BACKENDS:
+        stores[backend][collection].get_all()  # answer from the loaded records too
+    results = {backend: sorted(ids(stores[backend][collection].find_by(field, value))) for backend in BACKENDS}
+    assert results["json"] == results["sqlite"]
+
+
+def test_find_by_after_update(stores):
+    for backend in BACKENDS:
+        stores[backend]["pets"].update("pet_rex", {"ownerId": "ruth_lietha"})
+    for owner in ("nathan_lietha", "ruth_lietha"):
+        results = {backend: ids(stores[backend]["pets"].find_by("ownerId", owner)) for backend in BACKENDS}
+        assert results["json"] == results["sqlite"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_new_id(repositories, backend):
+    repo = repositories[backend]
+    assert repo.new_id("people", "Anna Berg") == "anna_berg_2"
+    assert repo.new_id("pets", "Bo") == "bo"
+    assert repo.new_id("quizzes", "Who baked the wedding cake in 1990?") == "who_baked_the_wedding_cake_in"
+    assert repo.new_id("photos", "") == "photo"
+    repo.add("stories", {"id": repo.new_id("stories", "The flood"), "title": "The flood"})
+    assert repo.new_id("stories", "The flood") == "the_flood_2"
+
+
+def test_changes_persist(data_dir, stores):
+    for backend in BACKENDS:
+        people = stores[backend]["people"]
+        people.add({"id": "eva_berg", "name": "Eva Berg"})
+        people.update("anna_berg", {"nickname": "Nan"})
+        people.delete("jonas_berg")
+        people.save()
+    reopened = {backend: open_store("people.json", backend=backend, data_dir=data_dir) for backend in BACKENDS}
+    assert reopened["json"].get_all() == reopened["sqlite"].get_all()
+    assert ids(reopened["json"].get_all()) == ["nathan_lietha", "ruth_lietha", "anna_berg", "elise_chen", "eva_berg"]
+    reopened["sqlite"].close()
+
+
+# --- Searches through the repository ---
+@pytest.mark.parametrize("query, exact", [
+    ("lietha", False), ("nate", False), ("n.j.", True), ("NATHAN LIETHA", True), ("an", False), ("ann", True),
+    ("", False), ("zz", False), ("élise", False), ("ÉLISE CHEN", True), ("éli", True),
+])
+def test_people_name_search(repositories, query, exact):
+    results = {backend: ids(repo.search_manager.find_people_by_name(query, exact=exact))
+               for backend, repo in repositories.items()}
+    assert results["json"] == results["sqlite"]
+
+
+@pytest.mark.parametrize("query, exact", [("rex", True), ("o", False), ("cat", False)])
+def test_pet_name_search(repositories, query, exact):
+    results = {backend: ids(repo.search_manager.find_pets_by_name(query, exact=exact))
+               for backend, repo in repositories.items()}
+    assert results["json"] == results["sqlite"]
+
+
+@pytest.mark.parametrize("query, exact, expected", [
+    ("pirate", False, ["Who dressed as a pirate for 3 Halloweens in a row?"]),
+    ("who baked the wedding cake?", True, ["Who baked the wedding cake?"]),
+    ("nathan", False, ["q1"]),
+    ("rex", True, []),
+])
+def test_quiz_name_search(repositories, query, exact, expected):
+    for repo in repositories.values():
+        assert ids(repo.search_manager.find_quizzes_by_name(query, exact=exact)) == expected
+
+
+@pytest.mark.parametrize("start, end", [
+    ("1900-01-01", "2030-12-31"), ("1990-01-01", "1995-07-14"), ("1995-07-15", "1999-01-01"), ("1990-6-9", "1990-6-9"),
+    ("1995-07-04", "1995-07-04"),
+])
+def test_date_range_search(repositories, start, end):
+    for method in ("get_photos_by_date_range", "get_stories_by_date_range"):
+        results = {backend: ids(getattr(repo.search_manager, method)(start, end))
+                   for backend, repo in repositories.items()}
+        assert results["json"] == results["sqlite"]
+
+
+def test_searches_follow_edits(repositories):
+    for repo in repositories.values():
+        sm = repo.search_manager
+        sm.find_people_by_name("nathan")
+        sm.get_photos_by_date_range("1900-01-01", "2030-12-31")
+        repo.update("people", "nathan_lietha", {"name": "Zelda Q"})
+        repo.add("photos", {"id": "ph5", "file": "new.jpg", "date": "1991-01-01", "tags": []})
+        repo.delete("photos", "ph1")
+
+        assert sm.find_people_by_name("nathan") == []
+        assert ids(sm.find_people_by_name("zelda")) == ["nathan_lietha"]
+        assert ids(sm.get_photos_by_date_range("1990-01-01", "1999-12-31")) == ["ph4", "a.jpg", "b.jpg", "c.jpg", "ph5"]
+
+
+@pytest.mark.parametrize("method, arg", [
+    ("get_pets_by_owner", "anna_berg"), ("get_stories_by_person", "ruth_lietha"), ("get_pets_by_owner", "nobody"),
+])
+def test_owner_lookups(repositories, method, arg):
+    results = {backend: ids(getattr(repo.search_manager, method)(arg)) for backend, repo in repositories.items()}
+    assert results["json"] == results["sqlite"]
+
+
+def test_external_edits_publish_record_events(data_dir, repositories):
+    repo = repositories["json"]
+    sm = repo.search_manager
+    sm.get_photos_by_date_range("1900-01-01", "2030-12-31")
+    index = sm.get_date_index(sm.photos)
+    events = []
+    repo.subscribe(lambda collection, op, item: events.append((op, ids([item])[0])))
+    edited = [dict(p) for p in PHOTOS if p.get("id") != "ph2"]
+    edited[0]["date"] = "1991-01-01"
+    edited.append({"id": "ph9", "file": "new.jpg", "date": "1992-02-03", "tags": []})
+    (data_dir / "photos.json").write_text(json.dumps(edited), encoding="utf-8")
+
+    watcher = DataWatcher(repo, root=None)
+    watcher.check_once()
+    watcher.apply_pending()
+    assert events == [("delete", "ph2"), ("update", "ph1"), ("add", "ph9")]
+    assert sm.get_date_index(sm.photos) is index and not index._stale
+    assert ids(sm.get_photos_by_date_range("1991-01-01", "1992-12-31")) == ["ph1", "a.jpg", "b.jpg", "ph9"]
+
+
+def test_sqlite_lookups_do_not_load_collections(repositories):
+    repo = repositories["sqlite"]
+    sm = repo.search_manager
+    assert ids(sm.find_people_by_name("lietha")) == ["nathan_lietha", "ruth_lietha", "anna_berg"]
+    assert ids(sm.get_photos_by_date_range("1995-01-01", "1995-12-31")) == ["ph1", "c.jpg"]
+    assert ids(sm.get_pets_by_owner("nathan_lietha")) == ["pet_rex"]
+    assert sm.get_person("anna_berg")["name"] == "Anna Berg"
+    repo.update("people", "anna_berg", {"nickname": "Nan"})
+    assert ids(sm.find_people_by_name("nan", exact=True)) == ["anna_berg"]
+    assert all(store._cache is None for _, store in repo.open_stores())